@@ -0,0 +1,396 @@
+# Capture → render benchmark for the Linux PTZController.
+#
+# Drives PTZApp's real decoder and update_video() loop with paced, looping
+# video sources in place of live RTSP, and reports frames/sec, CPU per
+# camera, peak RSS and capture-to-display tail latency for a matrix of
+# stream counts and resolutions. Runs offline; every case runs in a fresh
+# subprocess so peak RSS is per case.
+#
+#   python benchmarks/bench_pipeline.py                       # default matrix
+#   python benchmarks/bench_pipeline.py --streams 8 --resolutions 1920x1080
+#   python benchmarks/bench_pipeline.py --source clip.mp4 --json today.json
+#   python benchmarks/bench_pipeline.py --baseline last-release.json
+#
+# With a display (or under xvfb-run) frames go through the real Tk tiles;
+# without one the Tk paste is stubbed out and everything else is measured.
+
+import argparse
+import functools
+import heapq
+import json
+import os
+import queue
+import subprocess
+import sys
+import time
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(HERE, '..', 'linux'))
+
+import cv2
+import numpy as np
+import PTZController as ptz
+
+CLK_TCK = os.sysconf('SC_CLK_TCK')
+
+
+# ── Sources ───────────────────────────────────────────────────────────────
+# Frames are held JPEG-encoded and decoded on grab, so every stream pays a
+# real decode. Sources are paced to their frame rate like a live camera and
+# loop forever, so a run never hits end-of-stream.
+
+@functools.lru_cache(maxsize=None)
+def load_packets(source, width, height):
+    if source == 'synthetic':
+        frames = []
+        for i in range(60):
+            frame = np.empty((height, width, 3), np.uint8)
+            frame[..., 0] = np.linspace(0, 255, width, dtype=np.uint8)
+            frame[..., 1] = np.linspace(0, 255, height, dtype=np.uint8)[:, None]
+            frame[..., 2] = (i * 4) % 256
+            x = (i * width // 60) % max(1, width - height // 4)
+            cv2.rectangle(frame, (x, height // 3), (x + height // 4, height // 3 + height // 4),
+                          (255, 255, 255), -1)
+            cv2.putText(frame, f'{i:02d}', (20, height - 20), cv2.FONT_HERSHEY_SIMPLEX,
+                        height / 360, (0, 0, 0), 2)
+            frames.append(frame)
+    else:
+        cap    = cv2.VideoCapture(source)
+        frames = []
+        while len(frames) < 300:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.resize(frame, (width, height)))
+        cap.release()
+        if not frames:
+            raise SystemExit(f'Could not read any frames from {source}')
+    return tuple(cv2.imencode('.jpg', f, [cv2.IMWRITE_JPEG_QUALITY, 85])[1].tobytes()
+                 for f in frames)
+
+
+class ReplayCapture:
+    def __init__(self, packets, fps):
+        self.packets  = packets
+        self.fps      = fps
+        self.interval = 1.0 / fps
+        self.due      = time.monotonic()
+        self.index    = 0
+        self.frame    = None
+
+    def isOpened(self):
+        return True
+
+    def get(self, prop):
+        return self.fps if prop == cv2.CAP_PROP_FPS else 0.0
+
+    def set(self, prop, value):
+        return True
+
+    # Waits for the next frame time, then decodes (FFmpeg also decodes in grab)
+    def grab(self):
+        delay = self.due - time.monotonic()
+        if delay > 0:
+            time.sleep(delay)
+        # A consumer that fell behind gets frames back-to-back, like a
+        # camera's buffered stream, but never more than one interval's worth.
+        self.due = max(self.due, time.monotonic() - self.interval) + self.interval
+        packet     = self.packets[self.index % len(self.packets)]
+        self.frame = cv2.imdecode(np.frombuffer(packet, np.uint8), cv2.IMREAD_COLOR)
+        self.index += 1
+        return True
+
+    def retrieve(self):
+        return self.frame is not None, self.frame
+
+    def read(self):
+        self.grab()
+        return self.retrieve()
+
+    def release(self):
+        pass
+
+
+# Stream URLs are 'bench:<source>|<width>x<height>@<fps>'. The per-camera
+# decoder options have no equivalent in the replay and are ignored.
+def bench_open_capture(url, low_latency=False, timeout_ms=ptz.CONNECT_TIMEOUT_MS,
+                       **decoder_options):
+    source, mode  = url[len('bench:'):].rsplit('|', 1)
+    size, fps     = mode.split('@')
+    width, height = (int(v) for v in size.split('x'))
+    return ReplayCapture(load_packets(source, width, height), float(fps))
+
+
+# Pool processes import PTZController afresh, so the replay source is
+# installed again on their side before the real entry point runs.
+def bench_decode_process_main(*args):
+    ptz.open_capture = bench_open_capture
+    decode_process_main(*args)
+
+
+decode_process_main = ptz.decode_process_main
+
+
+# ── Headless rendering ────────────────────────────────────────────────────
+# PTZApp minus its widgets: the same update_video() / stats_snapshot() code
+# runs against tiles whose Tk paste is a no-op and a root whose after()
+# is a plain timer queue.
+
+class NullPhoto:
+    def paste(self, image):
+        pass
+
+
+class HeadlessSurface(ptz.TileSurface):
+    def __init__(self, width, height):
+        self.width  = width
+        self.height = height
+        self.buffer = np.zeros((height, width, 4), np.uint8)
+        self.buffer[..., 3] = 255
+        self.image  = ptz.Image.frombuffer('RGBA', (width, height), self.buffer,
+                                           'raw', 'RGBA', 0, 1)
+        self.photo  = NullPhoto()
+        self.content_size = None
+        self.shown  = True
+
+
+class HeadlessRoot:
+    def __init__(self):
+        self.jobs    = []
+        self.counter = 0
+
+    def after(self, ms, callback, *args):
+        self.counter += 1
+        heapq.heappush(self.jobs, (time.monotonic() + ms / 1000, self.counter, callback, args))
+        return self.counter
+
+    def after_cancel(self, job):
+        self.jobs = [j for j in self.jobs if j[1] != job]
+        heapq.heapify(self.jobs)
+
+    def run(self, seconds):
+        deadline = time.monotonic() + seconds
+        while self.jobs and self.jobs[0][0] < deadline:
+            due, _, callback, args = heapq.heappop(self.jobs)
+            delay = due - time.monotonic()
+            if delay > 0:
+                time.sleep(delay)
+            callback(*args)
+        time.sleep(max(0.0, deadline - time.monotonic()))
+
+
+class HeadlessApp(ptz.PTZApp):
+    def __init__(self, decode_mode):
+        self.root                = HeadlessRoot()
+        self.decode_mode         = decode_mode
+        self.decoder             = None
+        self.dispatchers         = {}
+        self.active_ptz          = None
+        self.connect_results     = queue.Queue()
+        self.connect_generation  = 0
+        self.stream_states       = {}
+        self.rendered_seqs       = {}
+        self.latency_totals      = {}
+        self.tile_surfaces       = {}
+        self.visible_keys        = []
+        self.blit_ms             = {}
+        self.display_ms          = {}
+        self.render_gaps         = {}
+        self.render_drawn        = 0
+        self.render_skipped      = 0
+        self.render_budget       = ptz.RenderBudget()
+        self.startup             = ptz.StartupReport()
+        self.budget_caps         = {}
+        self.video_job           = None
+        self.gamepad             = None
+
+    def show_stream_state(self, key, state):
+        pass
+
+    def update_render_stats(self):
+        pass
+
+
+# ── One case ──────────────────────────────────────────────────────────────
+
+def proc_cpu_seconds(pid):
+    with open(f'/proc/{pid}/stat') as f:
+        fields = f.read().rsplit(')', 1)[1].split()
+    return (int(fields[11]) + int(fields[12])) / CLK_TCK
+
+
+def proc_peak_rss_kb(pid):
+    with open(f'/proc/{pid}/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1])
+    return 0
+
+
+def run_case(case):
+    ptz.open_capture = bench_open_capture
+    ptz.decode_process_main = bench_decode_process_main
+
+    headed = case['display']
+    size   = (ptz.TILE_WIDTH, ptz.TILE_HEIGHT)
+    if headed:
+        root = ptz.tk.Tk()
+        # No saved configuration: the benchmark sets up its own streams and must
+        # not connect to the operator's cameras
+        app  = ptz.PTZApp(root, case['decode_mode'], case['workers'], case['low_latency'],
+                          config_path=None, auto_connect=False)
+    else:
+        app  = HeadlessApp(case['decode_mode'])
+
+    url     = f"bench:{case['source']}|{case['resolution']}@{case['fps']}"
+    streams = {}
+    for i in range(case['streams']):
+        key = f'F{i + 1}'
+        streams[key] = {'url': url, 'size': size, 'low_latency': case['low_latency']}
+        if not headed:
+            app.tile_surfaces[key] = HeadlessSurface(*size)
+            app.visible_keys.append(key)
+    # Build the packets before the clock starts (pool processes build their own)
+    load_packets(case['source'], *(int(v) for v in case['resolution'].split('x')))
+
+    if case['decode_mode'] == 'process':
+        app.decoder = ptz.ProcessDecoder(case['workers'], size)
+    else:
+        app.decoder = ptz.ThreadDecoder()
+    app.decoder.start(streams)
+
+    def pids():
+        children = [p.pid for p, _ in getattr(app.decoder, 'processes', [])]
+        return [os.getpid()] + children
+
+    def run_for(seconds):
+        if headed:
+            root.after(int(seconds * 1000), root.quit)
+            root.mainloop()
+        else:
+            app.root.run(seconds)
+
+    app.update_video()
+    run_for(case['warmup'])
+    cpu_start = sum(proc_cpu_seconds(pid) for pid in pids())
+    started   = time.monotonic()
+    run_for(case['duration'])
+    elapsed   = time.monotonic() - started
+    cpu       = sum(proc_cpu_seconds(pid) for pid in pids()) - cpu_start
+    peak_rss  = sum(proc_peak_rss_kb(pid) for pid in pids())
+    # Histograms cover the last 10 s, i.e. the measured window
+    snapshot  = app.stats_snapshot()
+    app.decoder.stop()
+
+    cameras   = snapshot['cameras'].values()
+    latencies = [c['display_latency_ms'] for c in cameras if c['display_latency_ms']['count']]
+    blits     = [c['blit_ms'] for c in cameras if c['blit_ms']['count']]
+    return dict(case,
+                decode_fps=round(sum(c.get('decode_fps', 0) for c in cameras), 1),
+                render_fps=round(sum(c['render_fps'] for c in cameras), 1),
+                render_dropped=sum(c['render_dropped'] for c in cameras),
+                cpu_pct=round(100 * cpu / elapsed, 1),
+                cpu_pct_per_camera=round(100 * cpu / elapsed / case['streams'], 1),
+                peak_rss_mb=round(peak_rss / 1024, 1),
+                latency_p50_ms=round(float(np.median([l['p50'] for l in latencies])), 1)
+                if latencies else None,
+                latency_p95_ms=max((l['p95'] for l in latencies), default=None),
+                latency_p99_ms=max((l['p99'] for l in latencies), default=None),
+                blit_p99_ms=max((b['p99'] for b in blits), default=None))
+
+
+# ── Matrix ────────────────────────────────────────────────────────────────
+
+COLUMNS = (('streams', 'streams', '{}'), ('resolution', 'resolution', '{}'),
+           ('decode_fps', 'decode fps', '{:.1f}'), ('render_fps', 'render fps', '{:.1f}'),
+           ('cpu_pct', 'cpu %', '{:.0f}'), ('cpu_pct_per_camera', 'cpu %/cam', '{:.1f}'),
+           ('peak_rss_mb', 'peak MB', '{:.0f}'), ('latency_p50_ms', 'p50 ms', '{:.1f}'),
+           ('latency_p95_ms', 'p95 ms', '{:.1f}'), ('latency_p99_ms', 'p99 ms', '{:.1f}'))
+
+
+def format_row(result, baseline):
+    cells = []
+    for field, _, fmt in COLUMNS:
+        value = result.get(field)
+        cell  = fmt.format(value) if value is not None else '—'
+        old   = baseline.get(field) if baseline else None
+        if isinstance(value, float) and isinstance(old, (int, float)) and old:
+            cell += f' ({100 * (value - old) / old:+.0f}%)'
+        cells.append(cell)
+    return cells
+
+
+def print_table(results, baselines):
+    header = [title for _, title, _ in COLUMNS]
+    rows   = [format_row(r, baselines.get((r['streams'], r['resolution']))) for r in results]
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    for row in [header, ['-' * w for w in widths]] + rows:
+        print('  '.join(cell.rjust(w) for cell, w in zip(row, widths)))
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PTZController capture → render benchmark')
+    parser.add_argument('--streams', default='1,4,8,16',
+                        help='comma-separated stream counts (default 1,4,8,16)')
+    parser.add_argument('--resolutions', default='640x360,1280x720,1920x1080',
+                        help='comma-separated source resolutions')
+    parser.add_argument('--fps', type=float, default=30, help='source frame rate (default 30)')
+    parser.add_argument('--source', default='synthetic',
+                        help="'synthetic' or a video file to replay (looped, paced)")
+    parser.add_argument('--decode-mode', choices=('thread', 'process'), default='thread')
+    parser.add_argument('--decode-workers', type=int,
+                        default=max(1, min(4, (os.cpu_count() or 2) // 2)))
+    parser.add_argument('--low-latency', action='store_true')
+    parser.add_argument('--duration', type=float, default=10, help='measured seconds per case')
+    parser.add_argument('--warmup', type=float, default=2, help='unmeasured seconds per case')
+    parser.add_argument('--display', choices=('auto', 'on', 'off'), default='auto',
+                        help='render through Tk (needs $DISPLAY, e.g. xvfb-run) or '
+                             'stub the Tk paste out; auto uses Tk when a display exists')
+    parser.add_argument('--json', metavar='PATH', help='save results for later comparison')
+    parser.add_argument('--baseline', metavar='PATH',
+                        help='show changes against results saved with --json')
+    parser.add_argument('--run-case', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.run_case:
+        print(json.dumps(run_case(json.loads(args.run_case))))
+        return
+
+    display = args.display == 'on' or (args.display == 'auto' and bool(os.environ.get('DISPLAY')))
+    results = []
+    for resolution in args.resolutions.split(','):
+        for streams in (int(n) for n in args.streams.split(',')):
+            # The window has 8 tiles; larger counts only run headless
+            if display and streams > 8:
+                print(f'skipping {streams} × {resolution}: more streams than tiles', file=sys.stderr)
+                continue
+            case = {'streams': streams, 'resolution': resolution, 'fps': args.fps,
+                    'source': args.source, 'decode_mode': args.decode_mode,
+                    'workers': args.decode_workers, 'low_latency': args.low_latency,
+                    'duration': args.duration, 'warmup': args.warmup, 'display': display}
+            print(f'running {streams} × {resolution} ...', file=sys.stderr)
+            proc = subprocess.run([sys.executable, os.path.abspath(__file__),
+                                   '--run-case', json.dumps(case)],
+                                  capture_output=True, text=True)
+            lines = proc.stdout.strip().splitlines()
+            if proc.returncode != 0 or not lines:
+                print(proc.stderr, file=sys.stderr)
+                continue
+            results.append(json.loads(lines[-1]))
+
+    baselines = {}
+    if args.baseline:
+        with open(args.baseline) as f:
+            baselines = {(r['streams'], r['resolution']): r for r in json.load(f)['results']}
+
+    print(f"\n{args.decode_mode} decode, {args.fps:g} fps source '{args.source}', "
+          f"{'Tk' if display else 'headless'} rendering, {args.duration:g} s per case\n")
+    print_table(results, baselines)
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump({'time': time.time(), 'results': results}, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
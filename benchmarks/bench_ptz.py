@@ -0,0 +1,391 @@
+# PTZ control-path benchmark against simulated cameras.
+#
+# Starts one VISCA simulator per camera (see visca_simulator.py), connects
+# the Linux app's CommandDispatcher / MovementController to them and plays
+# scripted key presses through PTZApp._on_key_press / _on_key_release, with
+# X11-style auto-repeat while a key is held. Reports:
+#
+#   key → wire     key event to the matching command arriving at the camera,
+#                  separately for starts (press) and stops (release; includes
+#                  the X11 auto-repeat grace period). A ramped start matches
+#                  its first step, when the camera starts to move.
+#   command → ack  visca_over_ip call until the camera's ACK (dispatcher RTT)
+#   scene → wire   with --scenes N, Alt+digit to each camera's preset recall
+#                  arriving, and the spread between the first and last camera
+#   group skew     with --group N, the spread between the first and last of the
+#                  N grouped cameras receiving the same command
+#
+# Pan/tilt ramps (the app's --ramp-ms) are off by default; with them the
+# commands per move show what the ramp costs on the wire.
+#
+# With --stick-sweeps N it then swings a simulated gamepad stick full left
+# and right N times, with axis events at a gamepad's report rate, and counts
+# how many of them became speed changes and commands (stick starts and stops
+# are included in press/release → wire, timed from the sample).
+#
+#   python benchmarks/bench_ptz.py
+#   python benchmarks/bench_ptz.py --cameras 4 --delay-ms 20 --jitter-ms 10 --loss 0.02
+#   python benchmarks/bench_ptz.py --command-rate 20 --json ptz.json
+#   python benchmarks/bench_ptz.py --cameras 8 --scenes 20 --delay-ms 30
+#   python benchmarks/bench_ptz.py --position-poll 0.5   # with position inquiries
+#   python benchmarks/bench_ptz.py --cameras 8 --group 8 --delay-ms 20
+#   python benchmarks/bench_ptz.py --presses 0 --stick-sweeps 5
+#   python benchmarks/bench_ptz.py --ramp-ms 250 --stop-ramp-ms 150
+
+import argparse
+import json
+import math
+import os
+import sys
+import time
+import types
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, HERE)
+
+from bench_pipeline import HeadlessRoot, ptz
+from visca_simulator import start_simulators
+
+INFINITE = float('inf')
+
+# Keys cycled through by the script, with the command each press should send
+SCRIPT_KEYS = ('Right', 'Up', 'Left', 'Down', 'plus', 'minus')
+
+STICK_EVENT_HZ = 250    # a typical gamepad's report rate
+
+
+# PTZApp's keyboard and movement handling without its widgets. Records the
+# time of every key event and each change of the commanded vector it causes.
+class HeadlessControlApp(ptz.PTZApp):
+    def __init__(self, command_rate, cameras, ramp=0.0, stop_ramp=0.0):
+        self.root           = HeadlessRoot()
+        self.camera_configs = [self.new_camera_config() for _ in range(cameras)]
+        self.layout         = ptz.GridLayout(4, 2)
+        self.page           = 0
+        self.cameras        = {}
+        self.dispatchers    = {}
+        self.active_cam     = None
+        self.active_ptz     = None
+        self.active_name    = ''
+        self.group          = []
+        self.pressed_keys   = set()
+        self.release_jobs   = {}
+        self.move_speed     = 6
+        self.movement       = ptz.MovementController(command_rate, ramp, stop_ramp)
+        self.key_event_at   = None
+        self.intent         = {}
+        self.transitions    = []
+        self.scenes         = []
+        self.tile_info_labels = {}
+        self.gamepad        = None
+        self.gamepad_name   = None
+        self.gamepad_vector = ptz.MovementController.IDLE
+        self.gamepad_deadzone = ptz.GAMEPAD_DEADZONE
+        self.gamepad_curve  = ptz.GAMEPAD_CURVE
+        self.stick_changes  = 0
+
+    def update_active_camera_display(self):
+        pass
+
+    def update_connection_status(self):
+        pass
+
+    def update_gamepad_status(self):
+        pass
+
+    def _on_key_press(self, event):
+        self.key_event_at = time.monotonic()
+        super()._on_key_press(event)
+
+    def _on_key_release(self, event):
+        self.key_event_at = time.monotonic()
+        super()._on_key_release(event)
+
+    def poll_gamepad(self):
+        self.key_event_at = time.monotonic()
+        vector = self.gamepad_vector
+        super().poll_gamepad()
+        self.stick_changes += vector != self.gamepad_vector
+
+    def preset(self, number, save=False, scene=False):
+        if scene and not save:
+            self.scenes.append((self.key_event_at, number))
+        super().preset(number, save, scene)
+
+    def update_movement(self):
+        super().update_movement()
+        if self.movement.target is None:
+            return
+        dispatchers, vector = self.movement.target
+        for dispatcher in dispatchers:
+            old = self.intent.get(dispatcher.key, ptz.MovementController.IDLE)
+            if vector != old:
+                self.intent[dispatcher.key] = vector
+                self.transitions.append((self.key_event_at, dispatcher.key, old, vector))
+
+
+def key_event(keysym, state=0):
+    return types.SimpleNamespace(keysym=keysym, state=state, widget=None)
+
+
+# Stands in for GamepadReader: the axes only change when told to
+class SimulatedStick:
+    def __init__(self):
+        self.axes   = {axis: 0.0 for axis in ptz.GAMEPAD_AXES}
+        self.name   = 'Simulated stick'
+        self.events = 0
+
+    def move(self, axis, value):
+        self.axes[axis] = value
+        self.events    += 1
+
+
+# Schedules the whole key script on the app's timer queue; returns its length (s)
+def schedule_script(app, presses, hold_ms, gap_ms, repeat_ms, switch_every, cameras):
+    at = 0.0
+    for i in range(presses):
+        if switch_every and i and i % switch_every == 0:
+            f_key = f'F{(i // switch_every) % cameras + 1}'
+            app.root.after(int(at), app._on_key_press, key_event(f_key))
+            app.root.after(int(at) + 1, app._on_key_release, key_event(f_key))
+            at += gap_ms
+        keysym = SCRIPT_KEYS[i % len(SCRIPT_KEYS)]
+        app.root.after(int(at), app._on_key_press, key_event(keysym))
+        # X11 auto-repeat: a release immediately followed by a press
+        t = at + repeat_ms
+        while repeat_ms and t < at + hold_ms:
+            app.root.after(int(t), app._on_key_release, key_event(keysym))
+            app.root.after(int(t), app._on_key_press, key_event(keysym))
+            t += repeat_ms
+        app.root.after(int(at + hold_ms), app._on_key_release, key_event(keysym))
+        at += hold_ms + gap_ms
+    return at / 1000
+
+
+# Schedules Alt+digit scene recalls from start_s, one per gap; returns the end (s)
+def schedule_scenes(app, scenes, gap_ms, start_s):
+    at = start_s * 1000
+    for i in range(scenes):
+        keysym = str(i % 10)
+        app.root.after(int(at), app._on_key_press, key_event(keysym, app.ALT_MASK))
+        app.root.after(int(at) + 50, app._on_key_release, key_event(keysym, app.ALT_MASK))
+        at += gap_ms
+    return at / 1000
+
+
+# Schedules stick sweeps (pan 0 → right → 0 → left → 0, one sine period each)
+# from start_s and the app's sampling of the stick; returns the end (s)
+def schedule_stick(app, sweeps, sweep_ms, start_s):
+    at     = start_s * 1000
+    events = int(sweep_ms * STICK_EVENT_HZ / 1000)
+    app.root.after(int(at), app.poll_gamepad)
+    for _ in range(sweeps):
+        for i in range(events + 1):
+            value = math.sin(2 * math.pi * i / events)
+            app.root.after(int(at + i * 1000 / STICK_EVENT_HZ), app.gamepad.move, 'pan',
+                           round(value, 6))
+        at += sweep_ms
+    return at / 1000
+
+
+# For each scene, the time from the key event to each camera's recall_preset
+# arriving and the spread between the first and last arrival.
+# Returns ([ms], [ms], missing).
+def match_scenes(scenes, arrivals):
+    latencies, spreads, missing = [], [], 0
+    for i, (event_at, number) in enumerate(scenes):
+        deadline = scenes[i + 1][0] if i + 1 < len(scenes) else INFINITE
+        arrived  = []
+        for log in arrivals.values():
+            t = next((t for t, name, args in log if event_at <= t < deadline
+                      and (name, args) == ('recall_preset', (number,))), None)
+            if t is None:
+                missing += 1
+            else:
+                arrived.append(t)
+        latencies.extend((t - event_at) * 1000 for t in arrived)
+        if len(arrived) > 1:
+            spreads.append((max(arrived) - min(arrived)) * 1000)
+    return latencies, spreads, missing
+
+
+# Pairs each intended change with the first matching command the camera
+# received after the key event and before the next change on that camera.
+# A pan/tilt command matches if it heads the same way on both axes, which
+# is the first step of a ramp.
+# A key event that changed several cameras (a group) also gives the spread
+# of their arrivals per command. Returns ({'start': [ms], 'stop': [ms]},
+# [ms], missing).
+def matches(received, command):
+    if received[0] != command[0] or received[0] != 'pantilt':
+        return received == command
+    return all((a > 0) - (a < 0) == (c > 0) - (c < 0)
+               for a, c in zip(received[1], command[1]))
+
+
+def match_transitions(transitions, arrivals):
+    latencies, missing = {'start': [], 'stop': []}, 0
+    together = {}
+    for i, (event_at, key, old, new) in enumerate(transitions):
+        deadline = next((t for t, k, _, _ in transitions[i + 1:] if k == key), INFINITE)
+        kind     = 'stop' if any(o and not n for o, n in zip(old, new)) else 'start'
+        expected = []
+        if new[:2] != old[:2]:
+            expected.append(('pantilt', (new[0], new[1])))
+        if new[2] != old[2]:
+            expected.append(('zoom', (new[2],)))
+        for command in expected:
+            arrived = next((t for t, name, args in arrivals[key]
+                            if event_at <= t < deadline and matches((name, args), command)),
+                           None)
+            if arrived is None:
+                missing += 1
+            else:
+                latencies[kind].append((arrived - event_at) * 1000)
+                together.setdefault((event_at, command), []).append(arrived)
+    skews = [(max(times) - min(times)) * 1000 for times in together.values() if len(times) > 1]
+    return latencies, skews, missing
+
+
+def summary(values):
+    histogram = ptz.RollingHistogram(window_s=INFINITE, max_samples=len(values) + 1)
+    for value in values:
+        histogram.add(value)
+    return histogram.snapshot()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='PTZ control-path latency benchmark')
+    parser.add_argument('--cameras', type=int, default=2)
+    parser.add_argument('--presses', type=int, default=60)
+    parser.add_argument('--hold-ms', type=float, default=300, help='how long each key is held')
+    parser.add_argument('--gap-ms', type=float, default=150, help='pause between presses')
+    parser.add_argument('--repeat-ms', type=float, default=33,
+                        help='auto-repeat interval while held, 0 for none (default 33)')
+    parser.add_argument('--switch-every', type=int, default=6,
+                        help='switch camera with an F-key every N presses, 0 never')
+    parser.add_argument('--group', type=int, default=0, metavar='N',
+                        help='group the first N cameras (Ctrl+F-keys) and drive them '
+                             'together; no camera switches')
+    parser.add_argument('--stick-sweeps', type=int, default=0, metavar='N',
+                        help='after the script, swing a simulated gamepad stick N times')
+    parser.add_argument('--sweep-ms', type=float, default=2000,
+                        help='length of one stick sweep (default 2000)')
+    parser.add_argument('--scenes', type=int, default=0,
+                        help='after the script, recall N scenes (Alt+digit) on all cameras')
+    parser.add_argument('--scene-gap-ms', type=float, default=250, help='pause between scenes')
+    parser.add_argument('--position-poll', type=float, default=0, metavar='SECONDS',
+                        help='poll camera positions like the app\'s --position-poll (default: off)')
+    parser.add_argument('--command-rate', type=int, default=10,
+                        help='MovementController rate limit (the app\'s --command-rate)')
+    parser.add_argument('--ramp-ms', type=float, default=0,
+                        help='the app\'s --ramp-ms (default 0: step to full speed)')
+    parser.add_argument('--stop-ramp-ms', type=float, default=0,
+                        help='the app\'s --stop-ramp-ms (default 0)')
+    parser.add_argument('--delay-ms', type=float, default=5, help='simulated ACK delay')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='± random ACK delay')
+    parser.add_argument('--loss', type=float, default=0, help='packet loss probability, 0–1')
+    parser.add_argument('--seed', type=int, default=1)
+    parser.add_argument('--json', metavar='PATH', help='also write the results as JSON')
+    args = parser.parse_args()
+
+    arrivals = {}
+    sims     = start_simulators(args.cameras, delay_ms=args.delay_ms,
+                                jitter_ms=args.jitter_ms, loss=args.loss, seed=args.seed)
+    app = HeadlessControlApp(args.command_rate, args.cameras,
+                             max(0, args.ramp_ms) / 1000, max(0, args.stop_ramp_ms) / 1000)
+    for i, sim in enumerate(sims):
+        key = f'F{i + 1}'
+        arrivals[key]  = []
+        sim.on_command = lambda t, name, params, log=arrivals[key]: log.append((t, name, params))
+        app.cameras[key]     = ptz.open_camera(sim.host)
+        app.dispatchers[key] = ptz.CommandDispatcher(key, app.cameras[key], args.position_poll)
+        app.dispatchers[key].rtt_ms = ptz.RollingHistogram(window_s=INFINITE, max_samples=100000)
+    app.select_camera('F1')
+    for i in range(1, min(args.group, args.cameras)):
+        app._on_key_press(key_event(f'F{i + 1}', app.CONTROL_MASK))
+
+    length = schedule_script(app, args.presses, args.hold_ms, args.gap_ms, args.repeat_ms,
+                             0 if args.group > 1 else args.switch_every, args.cameras)
+    stick_start = length + 0.3
+    if args.stick_sweeps:
+        app.gamepad = SimulatedStick()
+        length = schedule_stick(app, args.stick_sweeps, args.sweep_ms, stick_start)
+    length = schedule_scenes(app, args.scenes, args.scene_gap_ms, length + 0.3)
+    started = time.monotonic()
+    app.root.run(length + 0.5)
+
+    latencies, skews, missing = match_transitions(app.transitions, arrivals)
+    scene_latencies, spreads, scenes_missing = match_scenes(app.scenes, arrivals)
+    rtts = [v for d in app.dispatchers.values() for _, v in list(d.rtt_ms.samples)]
+    results = {
+        'config':         vars(args),
+        'key_to_wire_start_ms': summary(latencies['start']),
+        'key_to_wire_stop_ms':  summary(latencies['stop']),
+        'command_to_ack_ms':    summary(rtts),
+        'group_skew_ms':        summary(skews),
+        'scene_to_wire_ms':     summary(scene_latencies),
+        'scene_spread_ms':      summary(spreads),
+        'scene_recalls_missing': scenes_missing,
+        'intended':       len(latencies['start']) + len(latencies['stop']) + missing,
+        'missing':        missing,
+        'sent':           sum(d.sent for d in app.dispatchers.values()),
+        'coalesced':      sum(d.coalesced for d in app.dispatchers.values()),
+        'failed':         sum(d.failed for d in app.dispatchers.values()),
+        'inquiries':      sum(d.inquiries for d in app.dispatchers.values()),
+        'repeats_suppressed': app.movement.suppressed,
+        'moves':          sum(1 for _, _, old, new in app.transitions if not any(old)),
+        'move_commands':  sum(1 for log in arrivals.values() for _, name, _ in log
+                              if name in ('pantilt', 'zoom')),
+        'packets_dropped': sum(s.dropped for s in sims),
+        'stick_events':   app.gamepad.events if app.gamepad else 0,
+        'stick_changes':  app.stick_changes,
+        'stick_commands': sum(1 for log in arrivals.values() for t, name, _ in log
+                              if name in ('pantilt', 'zoom') and
+                              started + stick_start <= t < started + length),
+    }
+    app.movement.stop()
+    for dispatcher in app.dispatchers.values():
+        dispatcher.stop()
+    for sim in sims:
+        sim.stop()
+
+    print(f'\n{args.cameras} camera(s), {args.presses} presses, command rate {args.command_rate}/s, '
+          f'ramp {args.ramp_ms:g}/{args.stop_ramp_ms:g} ms, '
+          f'ACK delay {args.delay_ms:g}±{args.jitter_ms:g} ms, loss {args.loss:.0%}\n')
+    print(f"{'':22}{'count':>7}{'p50':>8}{'p95':>8}{'p99':>8}{'max':>8}")
+    for title, field in (('press → wire (ms)', 'key_to_wire_start_ms'),
+                         ('release → wire (ms)', 'key_to_wire_stop_ms'),
+                         ('command → ack (ms)', 'command_to_ack_ms'),
+                         ('group skew (ms)', 'group_skew_ms'),
+                         ('scene → wire (ms)', 'scene_to_wire_ms'),
+                         ('scene spread (ms)', 'scene_spread_ms')):
+        s = results[field]
+        if (field.startswith('scene') and not args.scenes
+                or field.startswith('group') and args.group < 2):
+            continue
+        if s['count']:
+            print(f"{title:22}{s['count']:>7}{s['p50']:>8.1f}{s['p95']:>8.1f}"
+                  f"{s['p99']:>8.1f}{s['max']:>8.1f}")
+        else:
+            print(f'{title:22}{0:>7}')
+    print(f"\n{results['sent']} commands sent, {results['coalesced']} coalesced, "
+          f"{results['repeats_suppressed']} repeats suppressed, {results['failed']} failed, "
+          f"{results['inquiries']} position inquiries")
+    print(f"{results['missing']} of {results['intended']} intended commands never reached "
+          f"a camera (superseded or lost); {results['packets_dropped']} packets dropped")
+    if results['moves']:
+        print(f"{results['move_commands'] / results['moves']:.1f} pan/tilt/zoom commands "
+              f"per move from stop ({results['moves']} moves)")
+    if args.stick_sweeps:
+        print(f"{results['stick_events']} stick events sampled every {ptz.GAMEPAD_POLL_MS} ms "
+              f"into {results['stick_changes']} speed changes and "
+              f"{results['stick_commands']} commands")
+
+    if args.json:
+        with open(args.json, 'w') as f:
+            json.dump(results, f, indent=1)
+
+
+if __name__ == '__main__':
+    main()
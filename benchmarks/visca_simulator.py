@@ -0,0 +1,270 @@
+# VISCA-over-IP camera simulator.
+#
+# Answers the commands PTZController sends through visca_over_ip.Camera
+# (pan/tilt drive and absolute moves, zoom, presets, position inquiries) the
+# way a camera does: an ACK after a configurable delay, then a completion.
+# Incoming and outgoing packets can be dropped at random, and pan / tilt /
+# zoom positions are integrated from the commanded speeds.
+#
+# Each simulated camera listens on its own loopback address at the standard
+# VISCA port, so the app can be pointed at it unchanged:
+#
+#   python benchmarks/visca_simulator.py --cameras 4 --delay-ms 8 --loss 0.01
+#   → enter 127.0.0.2 … 127.0.0.5 as camera IPs in Settings → Configure Cameras
+
+import argparse
+import heapq
+import random
+import socket
+import threading
+import time
+
+VISCA_PORT = 52381
+
+# Position units per second for each step of commanded speed
+PAN_RATE   = 60     # pantilt speed 1–24
+TILT_RATE  = 40
+ZOOM_RATE  = 600    # zoom speed 1–7
+PAN_LIMIT  = (-2400, 2400)
+TILT_LIMIT = (-400, 1200)
+ZOOM_LIMIT = (0, 16384)
+
+ACK        = bytes.fromhex('9041ff')
+COMPLETION = bytes.fromhex('9051ff')
+SYNTAX     = bytes.fromhex('906002ff')
+
+
+def encode_nibbles(value, length=4, signed=True):
+    raw = value.to_bytes(length // 2, 'big', signed=signed).hex()
+    return bytes(int(c, 16) for c in raw)
+
+
+def decode_nibbles(data, signed=True):
+    raw = bytes.fromhex(''.join(f'{b & 0x0f:x}' for b in data))
+    return int.from_bytes(raw, 'big', signed=signed)
+
+
+def clamp(value, limits):
+    return max(limits[0], min(limits[1], value))
+
+
+# One simulated camera. Every command that reaches it is passed to
+# on_command(arrived, name, args) with arrived in time.monotonic() seconds,
+# before the ACK is scheduled.
+class ViscaSimulator:
+    def __init__(self, host='127.0.0.2', port=VISCA_PORT, delay_ms=0.0, jitter_ms=0.0,
+                 loss=0.0, on_command=None, seed=None):
+        self.host       = host
+        self.port       = port
+        self.delay_ms   = delay_ms
+        self.jitter_ms  = jitter_ms
+        self.loss       = loss
+        self.on_command = on_command
+        self.random     = random.Random(seed)
+        self.lock       = threading.Lock()
+        self.pan, self.tilt, self.zoom = 0.0, 0.0, 0.0
+        self.velocity   = (0.0, 0.0, 0.0)   # units/s on each axis
+        self.target     = None              # (pan, tilt, pan_rate, tilt_rate) for absolute moves
+        self.presets    = {}
+        self.updated    = time.monotonic()
+        self.received   = 0
+        self.dropped    = 0
+        self.replies    = []
+        self.counter    = 0
+        self.cond       = threading.Condition()
+        self.running    = False
+
+    def start(self):
+        self.sock = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+        # visca_over_ip binds its inquiry socket to the same port on all
+        # addresses, with SO_REUSEADDR; the more specific bind gets our traffic.
+        self.sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.sock.bind((self.host, self.port))
+        self.sock.settimeout(0.2)
+        self.running = True
+        threading.Thread(target=self._serve, daemon=True).start()
+        threading.Thread(target=self._reply_loop, daemon=True).start()
+        return self
+
+    def stop(self):
+        self.running = False
+        with self.cond:
+            self.cond.notify()
+        self.sock.close()
+
+    def position(self):
+        with self.lock:
+            self._advance(time.monotonic())
+            return round(self.pan), round(self.tilt), round(self.zoom)
+
+    # ── State ─────────────────────────────────────────────────────────────
+
+    def _advance(self, now):
+        dt, self.updated = now - self.updated, now
+        if self.target is not None:
+            pan, tilt, pan_rate, tilt_rate = self.target
+            step_pan  = max(-pan_rate * dt, min(pan_rate * dt, pan - self.pan))
+            step_tilt = max(-tilt_rate * dt, min(tilt_rate * dt, tilt - self.tilt))
+            self.pan  += step_pan
+            self.tilt += step_tilt
+            if self.pan == pan and self.tilt == tilt:
+                self.target = None
+        else:
+            self.pan  = clamp(self.pan + self.velocity[0] * dt, PAN_LIMIT)
+            self.tilt = clamp(self.tilt + self.velocity[1] * dt, TILT_LIMIT)
+        self.zoom = clamp(self.zoom + self.velocity[2] * dt, ZOOM_LIMIT)
+
+    def _move_to(self, pan, tilt, pan_speed=24, tilt_speed=24):
+        self.velocity = (0.0, 0.0, self.velocity[2])
+        self.target   = (clamp(pan, PAN_LIMIT), clamp(tilt, TILT_LIMIT),
+                         max(1, pan_speed) * PAN_RATE, max(1, tilt_speed) * TILT_RATE)
+
+    # Applies one command body (the bytes between 81 01 and FF). Returns
+    # (name, args) or None if the command is not understood.
+    def _command(self, body):
+        if body[:2] == b'\x06\x01' and len(body) == 6:
+            # Reported as visca_over_ip speeds: 01 (Left / Up) negative. Like a
+            # real camera, Right raises the pan position and Up the tilt position.
+            sign = {1: -1, 2: 1, 3: 0}
+            pan  = sign.get(body[4], 0) * body[2]
+            tilt = sign.get(body[5], 0) * body[3]
+            self.target   = None
+            self.velocity = (pan * PAN_RATE, -tilt * TILT_RATE, self.velocity[2])
+            return 'pantilt', (pan, tilt)
+        if body[:2] in (b'\x06\x02', b'\x06\x03') and len(body) == 12:
+            pan, tilt = decode_nibbles(body[4:8]), decode_nibbles(body[8:12])
+            if body[1] == 3:
+                pan, tilt = self.pan + pan, self.tilt + tilt
+            self._move_to(pan, tilt, body[2], body[3])
+            return 'pantilt_to', (pan, tilt)
+        if body in (b'\x06\x04', b'\x06\x05'):
+            self._move_to(0, 0)
+            return 'pantilt_home', ()
+        if body[:2] == b'\x04\x07' and len(body) == 3:
+            direction, speed = body[2] >> 4, body[2] & 0x0f
+            zoom = {0: 0, 2: speed, 3: -speed}.get(direction, 0)
+            self.velocity = (self.velocity[0], self.velocity[1], zoom * ZOOM_RATE)
+            return 'zoom', (zoom,)
+        if body[:2] == b'\x04\x47' and len(body) == 6:
+            self.zoom     = clamp(decode_nibbles(body[2:6], signed=False), ZOOM_LIMIT)
+            self.velocity = (self.velocity[0], self.velocity[1], 0.0)
+            return 'zoom_to', (round(self.zoom),)
+        if body[:3] == b'\x04\x3f\x01' and len(body) == 4:
+            self.presets[body[3]] = (self.pan, self.tilt, self.zoom)
+            return 'save_preset', (body[3],)
+        if body[:3] == b'\x04\x3f\x02' and len(body) == 4:
+            if body[3] in self.presets:
+                pan, tilt, self.zoom = self.presets[body[3]]
+                self._move_to(pan, tilt)
+            return 'recall_preset', (body[3],)
+        if body == b'\x00\x01':
+            return 'if_clear', ()
+        return None
+
+    def _inquiry(self, body):
+        if body == b'\x06\x12':
+            return b'\x90\x50' + encode_nibbles(round(self.pan)) + \
+                encode_nibbles(round(self.tilt)) + b'\xff'
+        if body == b'\x04\x47':
+            return b'\x90\x50' + encode_nibbles(round(self.zoom), signed=False) + b'\xff'
+        return None
+
+    # ── Network ───────────────────────────────────────────────────────────
+
+    def _lost(self):
+        return self.loss > 0 and self.random.random() < self.loss
+
+    def _schedule(self, delay_s, payload_type, sequence, payload, addr):
+        message = payload_type + len(payload).to_bytes(2, 'big') + sequence + payload
+        with self.cond:
+            self.counter += 1
+            heapq.heappush(self.replies, (time.monotonic() + delay_s, self.counter, message, addr))
+            self.cond.notify()
+
+    def _serve(self):
+        while self.running:
+            try:
+                message, addr = self.sock.recvfrom(64)
+            except socket.timeout:
+                continue
+            except OSError:
+                return
+            arrived = time.monotonic()
+            self.received += 1
+            if len(message) < 9 or self._lost():
+                self.dropped += 1
+                continue
+            payload_type, sequence, payload = message[:2], message[4:8], message[8:]
+
+            # Control command: only RESET (sequence number) is used
+            if payload_type == b'\x02\x00':
+                self._schedule(0, b'\x02\x01', sequence, b'\x01', addr)
+                continue
+
+            delay = max(0.0, self.delay_ms + self.random.uniform(-1, 1) * self.jitter_ms) / 1000
+            body  = payload[2:-1]
+            with self.lock:
+                self._advance(arrived)
+                if payload[:2] == b'\x81\x09':
+                    reply = self._inquiry(body)
+                    self._schedule(delay, b'\x01\x11', sequence, reply or SYNTAX, addr)
+                    continue
+                command = self._command(body)
+            if command is None:
+                self._schedule(delay, b'\x01\x11', sequence, SYNTAX, addr)
+                continue
+            if self.on_command is not None:
+                self.on_command(arrived, *command)
+            self._schedule(delay, b'\x01\x11', sequence, ACK, addr)
+            self._schedule(delay, b'\x01\x11', sequence, COMPLETION, addr)
+
+    def _reply_loop(self):
+        while True:
+            with self.cond:
+                while self.running and (not self.replies or
+                                        self.replies[0][0] > time.monotonic()):
+                    timeout = self.replies[0][0] - time.monotonic() if self.replies else None
+                    self.cond.wait(timeout)
+                if not self.running:
+                    return
+                _, _, message, addr = heapq.heappop(self.replies)
+            if self._lost():
+                self.dropped += 1
+                continue
+            try:
+                self.sock.sendto(message, addr)
+            except OSError:
+                return
+
+
+def start_simulators(count, first_host='127.0.0.2', **options):
+    base = first_host.rsplit('.', 1)
+    return [ViscaSimulator(f'{base[0]}.{int(base[1]) + i}', **options).start()
+            for i in range(count)]
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Simulated VISCA-over-IP cameras')
+    parser.add_argument('--cameras', type=int, default=1)
+    parser.add_argument('--host', default='127.0.0.2', help='address of the first camera')
+    parser.add_argument('--port', type=int, default=VISCA_PORT)
+    parser.add_argument('--delay-ms', type=float, default=5, help='ACK delay (default 5)')
+    parser.add_argument('--jitter-ms', type=float, default=0, help='± random ACK delay')
+    parser.add_argument('--loss', type=float, default=0, help='packet loss probability, 0–1')
+    args = parser.parse_args()
+
+    sims = start_simulators(args.cameras, args.host, port=args.port,
+                            delay_ms=args.delay_ms, jitter_ms=args.jitter_ms, loss=args.loss)
+    for sim in sims:
+        sim.on_command = lambda arrived, command, params, host=sim.host: \
+            print(f'{host} {command}{params}')
+        print(f'Simulated camera on {sim.host}:{sim.port}')
+    try:
+        while True:
+            time.sleep(5)
+            for sim in sims:
+                print(f'{sim.host} position {sim.position()} '
+                      f'({sim.received} packets, {sim.dropped} dropped)')
+    except KeyboardInterrupt:
+        for sim in sims:
+            sim.stop()
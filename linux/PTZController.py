@@ -1,14 +1,1500 @@
+import time
+STARTED = time.perf_counter()   # startup milestones are timed from here
+
 import tkinter as tk
 from tkinter import messagebox, Toplevel
-from visca_over_ip import Camera
-import cv2
-from PIL import Image, ImageTk
 import threading
-import time
+import importlib
+import os
+import random
+import argparse
+import bisect
+import collections
+import contextlib
+import functools
+import json
+import queue
+import select
+import multiprocessing
+from multiprocessing import shared_memory
+
+
+# ── Startup ───────────────────────────────────────────────────────────────
+# OpenCV, numpy, PIL and visca_over_ip take seconds to import on a thin
+# client, so nothing waits for them before the window is up: they load on
+# first use, and the app preloads them on the Tk thread once it is painted.
+# Threads should not be first to use them: OpenCV rewrites sys.path while it
+# loads, which breaks imports running concurrently on other threads.
+
+class LazyModule:
+    lock = threading.Lock()
+
+    def __init__(self, name):
+        self._name   = name
+        self._module = None
+
+    def load(self):
+        if self._module is None:
+            with LazyModule.lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    # Attributes are copied over on first use, so later lookups (cv2.resize
+    # on every frame) are plain instance attribute reads
+    def __getattr__(self, name):
+        value = getattr(self.load(), name)
+        setattr(self, name, value)
+        return value
+
+
+cv2           = LazyModule('cv2')
+np            = LazyModule('numpy')
+Image         = LazyModule('PIL.Image')
+ImageTk       = LazyModule('PIL.ImageTk')
+visca_over_ip = LazyModule('visca_over_ip')
+
+
+LAZY_MODULES = (np, cv2, Image, ImageTk, visca_over_ip)
+
+
+def preload_modules():
+    for module in LAZY_MODULES:
+        module.load()
+
+
+# Milestones of one start in ms since this module began running (interpreter
+# start-up before that is not included). The report is complete once every
+# expected milestone is in; it is printed then, or after STARTUP_REPORT_S.
+STARTUP_REPORT_S = 30
+
+
+class StartupReport:
+    def __init__(self):
+        self.marks    = {}
+        self.expected = {'window', 'interface', 'libraries'}
+
+    def mark(self, name):
+        self.marks.setdefault(name, round((time.perf_counter() - STARTED) * 1000, 1))
+
+    def complete(self):
+        return self.expected <= set(self.marks)
+
+    def text(self):
+        return ' • '.join(f"{name.replace('_', ' ')} {ms:.0f} ms"
+                          for name, ms in sorted(self.marks.items(), key=lambda item: item[1]))
+
+
+TILE_WIDTH, TILE_HEIGHT = 465, 430
+# Area shared by the tiles of one page until the window reports its real size
+GRID_WIDTH, GRID_HEIGHT = 4 * TILE_WIDTH, 2 * TILE_HEIGHT
+# Widest tile border (the active camera's); pictures are sized to fit inside it
+TILE_BORDER = 2
+MIN_TILE    = 32
+
+# Grid layouts offered in the View menu, columns × rows
+LAYOUTS = ('2x2', '3x2', '4x2', '3x3', '4x3', '4x4', '6x4', '8x4')
+
+# Per-camera display frame-rate caps offered in the config dialog (0: as
+# delivered by the camera).
+FPS_CAPS = {'Source': 0, '30': 30, '25': 25, '15': 15, '10': 10, '5': 5, '2': 2, '1': 1}
+
+# Per-camera decoder options. Threads per decoder go to OpenCV as
+# CAP_PROP_N_THREADS (Auto: FFmpeg's choice); RTSP runs over TCP unless the
+# camera is set to UDP. Keyframes only (always, or while the tile is a
+# focus-mode thumbnail) asks FFmpeg to discard all other packets.
+DECODER_THREADS = {'Auto': 0, '1': 1, '2': 2, '4': 4}
+TRANSPORTS      = {'TCP': 'tcp', 'UDP': 'udp'}
+KEYFRAME_MODES  = ('Never', 'Thumbnails', 'Always')
+
+# Bound on opening a stream and on a single read, so one dead RTSP URL can
+# only stall its own tile.
+CONNECT_TIMEOUT_MS = 5000
+
+# Camera configuration saved between sessions, in the XDG config directory.
+# The file holds RTSP URLs, usually with credentials, so it is mode 0600.
+CONFIG_DIR     = os.path.join(os.environ.get('XDG_CONFIG_HOME') or
+                              os.path.expanduser('~/.config'), 'ptzcontroller')
+CONFIG_PATH    = os.path.join(CONFIG_DIR, 'cameras.json')
+CONFIG_VERSION = 1
+
+# Camera positions are polled with VISCA inquiries while a camera's command
+# queue is idle: every POSITION_POLL_S (the --position-poll default) while it
+# is still, every POSITION_MOVING_POLL_S until it settles after a command.
+# Each inquiry is one attempt that gives up after INQUIRY_TIMEOUT_S, so a
+# command queued behind it is not held up by retries. Zoom positions run from
+# 0 to ZOOM_RANGE.
+POSITION_POLL_S        = 2.0
+POSITION_MOVING_POLL_S = 0.2
+INQUIRY_TIMEOUT_S      = 0.05
+ZOOM_RANGE             = 16384
+
+# Fastest VISCA drive speeds for absolute moves: pan goes to 0x18, but tilt on
+# common cameras only to 0x14 (faster is rejected as a syntax error)
+PAN_SPEED_MAX  = 24
+TILT_SPEED_MAX = 20
+
+# Pan/tilt motion profile (the --ramp-ms / --stop-ramp-ms defaults): seconds to
+# speed up to a new speed, and to slow down or stop (0: at once, so a camera
+# stops where the key is released)
+RAMP_S      = 0.25
+STOP_RAMP_S = 0.0
+
+# Worker-reported stream states, shared with pool processes by index:
+# stale means reads are failing on an open stream, reconnecting means the
+# stream is closed and being reopened with backoff, paused means the tile is
+# not on screen and the stream is closed until it is.
+STREAM_STATES = ('connecting', 'live', 'stale', 'reconnecting', 'paused')
+
+
+# Columns × rows of tiles per page. Cameras fill the pages in order, so a
+# camera's page and cell only depend on its number and the layout.
+class GridLayout:
+    def __init__(self, columns, rows):
+        self.columns  = max(1, columns)
+        self.rows     = max(1, rows)
+        self.per_page = self.columns * self.rows
+
+    # '4x2' → GridLayout(4, 2); also the --layout argument type
+    @classmethod
+    def parse(cls, text):
+        columns, rows = (int(v) for v in text.lower().replace('×', 'x').split('x'))
+        return cls(columns, rows)
+
+    def __str__(self):
+        return f'{self.columns}x{self.rows}'
+
+    def page_count(self, count):
+        return max(1, -(-count // self.per_page))
+
+    def page_of(self, index):
+        return index // self.per_page
+
+    # (camera index, row, column) for every cell used on the page
+    def cells(self, count, page):
+        first = page * self.per_page
+        for index in range(first, min(count, first + self.per_page)):
+            slot = index - first
+            yield index, slot // self.columns, slot % self.columns
+
+    def tile_size(self, width, height):
+        return (max(MIN_TILE, width // self.columns),
+                max(MIN_TILE, height // self.rows))
+
+    # (camera index, (x, y, width, height)) of the page's tiles, with the
+    # grid centred in the area
+    def frames(self, count, page, width, height):
+        tile_w, tile_h = self.tile_size(width, height)
+        x0 = max(0, (width - tile_w * self.columns) // 2)
+        y0 = max(0, (height - tile_h * self.rows) // 2)
+        for index, row, column in self.cells(count, page):
+            yield index, (x0 + column * tile_w, y0 + row * tile_h, tile_w, tile_h)
+
+
+# Spotlight geometry: the focused tile fills the area left of a strip that
+# holds the thumbnails, in one column or, for more than FOCUS_STRIP_ROWS,
+# two. Returns the focused (x, y, width, height) and one per thumbnail.
+FOCUS_STRIP      = 0.2
+FOCUS_STRIP_ROWS = 6
+
+
+def focus_frames(width, height, thumbnails):
+    if not thumbnails:
+        return (0, 0, width, height), []
+    columns = 1 if thumbnails <= FOCUS_STRIP_ROWS else 2
+    rows    = -(-thumbnails // columns)
+    strip   = int(width * FOCUS_STRIP)
+    thumb_w = strip // columns
+    thumb_h = max(MIN_TILE, min(height // rows, thumb_w * 3 // 4))
+    x0      = width - strip
+    return (0, 0, x0, height), [(x0 + (i % columns) * thumb_w, (i // columns) * thumb_h,
+                                 thumb_w, thumb_h) for i in range(thumbnails)]
+
+
+# OpenCV reads FFmpeg open options from the environment when a capture is
+# opened. Captures with identical options may open concurrently; one that
+# needs different options waits until those opens have finished.
+class CaptureOptionsGate:
+    def __init__(self):
+        self.cond    = threading.Condition()
+        self.options = None
+        self.active  = 0
+
+    @contextlib.contextmanager
+    def applied(self, options):
+        with self.cond:
+            while self.active and self.options != options:
+                self.cond.wait()
+            os.environ['OPENCV_FFMPEG_CAPTURE_OPTIONS'] = options
+            self.options = options
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.active -= 1
+                self.cond.notify_all()
+
+
+_capture_options_gate = CaptureOptionsGate()
+
+
+# OpenCV only defaults to RTSP over TCP while OPENCV_FFMPEG_CAPTURE_OPTIONS is
+# unset, so TCP is always restated.
+def open_capture(url, low_latency=False, timeout_ms=CONNECT_TIMEOUT_MS,
+                 threads=0, transport='tcp', low_delay=False, keyframes_only=False):
+    options = [f'rtsp_transport;{transport}']
+    if low_latency or low_delay:
+        options.append('fflags;nobuffer')
+    if low_delay:
+        # No demuxer delay and, over UDP, no reordering queue
+        options += ['max_delay;0', 'reorder_queue_size;0']
+    if keyframes_only:
+        options.append('avdiscard;nonkey')
+    params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+              cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms]
+    # OpenCV does not pass capture options on to the codec; threads has
+    # its own property (OpenCV 4.7+)
+    if threads and hasattr(cv2, 'CAP_PROP_N_THREADS'):
+        params += [cv2.CAP_PROP_N_THREADS, threads]
+    with _capture_options_gate.applied('|'.join(options)):
+        cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG, params)
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1 if low_latency else 2)
+    return cap
+
+
+# Resolution (as decoded), codec and frame rate (0: not reported) of an
+# open capture; cached per URL by the app between sessions.
+def capture_info(cap):
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC)) & 0xffffffff
+    fps    = cap.get(cv2.CAP_PROP_FPS)
+    return {'width':  int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+            'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+            'codec':  fourcc.to_bytes(4, 'little').decode('ascii', 'replace').strip('\0 '),
+            'fps':    round(fps, 2) if 1 <= fps <= 120 else 0}
+
+
+# Largest size with the source's aspect ratio that fits the tile. Cached: a
+# stream keeps one resolution and a tile one size, so this is computed once
+# per (stream, tile size) rather than per frame.
+@functools.lru_cache(maxsize=256)
+def fit_size(w, h, width, height):
+    scale = min(width / w, height / h)
+    return int(w * scale), int(h * scale)
+
+
+# Scale a decoded BGR frame to fit inside width×height (aspect preserved) and
+# convert it to RGBA. Runs on the capture threads so the Tk loop only blits.
+# RGBA (not RGB) because PIL can share an RGBA numpy buffer without copying.
+def fit_to_tile(frame, width, height):
+    h, w         = frame.shape[:2]
+    new_w, new_h = fit_size(w, h, width, height)
+    if new_w <= 0 or new_h <= 0:
+        return None
+    if (new_w, new_h) != (w, h):
+        frame = cv2.resize(frame, (new_w, new_h))
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
+
+
+# One persistent PhotoImage per tile, backed by a preallocated RGBA buffer that
+# PIL shares with numpy. Blitting copies pixels into the buffer and pastes it
+# into the same PhotoImage, so no Tk image objects are created per frame.
+# Allocated on the first blit: laying out tiles needs neither numpy nor PIL.
+class TileSurface:
+    def __init__(self, label, width, height):
+        self.label  = label
+        self.width  = width
+        self.height = height
+        self.photo  = None
+        self.content_size = None
+        self.shown  = False
+
+    def _allocate(self):
+        self.buffer = np.zeros((self.height, self.width, 4), np.uint8)
+        self.buffer[..., 3] = 255
+        self.image  = Image.frombuffer('RGBA', (self.width, self.height), self.buffer,
+                                       'raw', 'RGBA', 0, 1)
+        self.photo  = ImageTk.PhotoImage(image=self.image)
+
+    def blit(self, frame):
+        if self.photo is None:
+            self._allocate()
+        fh, fw = min(frame.shape[0], self.height), min(frame.shape[1], self.width)
+        # Letterbox bars only need clearing when the picture size changes
+        if (fw, fh) != self.content_size:
+            self.buffer[..., :3] = 0
+            self.content_size = (fw, fh)
+        y0 = (self.height - fh) // 2
+        x0 = (self.width - fw) // 2
+        self.buffer[y0:y0 + fh, x0:x0 + fw] = frame[:fh, :fw]
+        self.photo.paste(self.image)
+        if not self.shown:
+            self.label.configure(image=self.photo, text='')
+            self.shown = True
+
+
+# ── Instrumentation ───────────────────────────────────────────────────────
+# Every pipeline stage records its samples into a RollingHistogram: capture
+# workers (read, convert), the renderer (blit, capture-to-display) and the
+# VISCA dispatchers (command round trip). snapshot() turns the last window
+# into plain dicts, so the same data feeds the on-screen overlay and the
+# JSON stats file.
+
+class RollingHistogram:
+    EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self, window_s=10.0, max_samples=4096):
+        self.window_s = window_s
+        self.samples  = collections.deque(maxlen=max_samples)
+        self.started  = time.monotonic()
+
+    def add(self, value):
+        self.samples.append((time.monotonic(), value))
+
+    def _recent(self, now):
+        cutoff = now - self.window_s
+        return [v for t, v in list(self.samples) if t >= cutoff]
+
+    # Samples per second over the window (or since creation, if younger)
+    def rate(self):
+        now = time.monotonic()
+        span = min(self.window_s, now - self.started)
+        return len(self._recent(now)) / span if span > 0 else 0.0
+
+    def snapshot(self):
+        values = sorted(self._recent(time.monotonic()))
+        if not values:
+            return {'count': 0}
+        n       = len(values)
+        buckets = [0] * (len(self.EDGES_MS) + 1)
+        for v in values:
+            buckets[bisect.bisect_left(self.EDGES_MS, v)] += 1
+        labels = [f'<={e}' for e in self.EDGES_MS] + [f'>{self.EDGES_MS[-1]}']
+        return {'count': n,
+                'mean':  round(sum(values) / n, 3),
+                'p50':   round(values[n // 2], 3),
+                'p95':   round(values[min(n - 1, int(n * 0.95))], 3),
+                'p99':   round(values[min(n - 1, int(n * 0.99))], 3),
+                'max':   round(values[-1], 3),
+                'buckets': dict(zip(labels, buckets))}
+
+
+# ── Decoding ──────────────────────────────────────────────────────────────
+# A StreamWorker owns one RTSP stream: it opens the capture, decodes, scales
+# to its tile and hands the result to a publish callback. The same worker runs
+# on a thread (ThreadDecoder) or inside a pool process (ProcessDecoder); the
+# UI only talks to the decoder through update() / latest() / intact().
+
+class StreamWorker:
+    # In low-latency mode a grab that returns in less than this fraction of
+    # the frame interval was served from FFmpeg's buffer, not the network,
+    # so the frame is stale and is dropped without being retrieved.
+    STALE_GRAB_FRACTION = 0.3
+    MAX_DRAIN           = 30
+    # A stream whose reads keep failing for this long is closed and reopened,
+    # waiting RECONNECT_MIN_S doubling up to RECONNECT_MAX_S between attempts.
+    STALE_GRACE_S       = 2.0
+    RECONNECT_MIN_S     = 0.5
+    RECONNECT_MAX_S     = 30.0
+
+    def __init__(self, key, url, size, low_latency=False,
+                 timeout_ms=CONNECT_TIMEOUT_MS, visible=True, max_fps=0,
+                 decoder_options=None):
+        self.key          = key
+        self.url          = url
+        self.size         = size
+        self.low_latency  = low_latency
+        self.timeout_ms   = timeout_ms
+        self.visible      = visible
+        self.max_fps      = max_fps     # 0: publish every frame
+        self.decoder_options = decoder_options or {}    # open_capture keywords
+        self.state        = 'connecting'
+        self.report       = None
+        self.running      = True
+        self.dropped      = 0
+        self.throttled    = 0
+        self.reconnects   = 0
+        self.opened_with  = None
+        self.source       = None        # capture_info() of the open stream
+        # read: grab + decode, including the wait for the next frame (every
+        # frame received, published or not); convert: resize and BGR→RGBA
+        self.read_ms      = RollingHistogram()
+        self.convert_ms   = RollingHistogram()
+
+    def stats(self):
+        return {'state':      self.state,
+                'source_fps': round(self.read_ms.rate(), 2),
+                'decode_fps': round(self.convert_ms.rate(), 2),
+                'dropped':    self.dropped,
+                'throttled':  self.throttled,
+                'reconnects': self.reconnects,
+                'source':     self.source,
+                'read_ms':    self.read_ms.snapshot(),
+                'convert_ms': self.convert_ms.snapshot()}
+
+    def _set_state(self, state):
+        self.state = state
+        if self.report is not None:
+            self.report(state)
+
+    def _wanted(self):
+        return (self.url, self.low_latency,
+                tuple(sorted(self.decoder_options.items())))
+
+    def _open(self, state='connecting'):
+        self._set_state(state)
+        self.opened_with = self._wanted()
+        cap = open_capture(self.url, self.low_latency,
+                           timeout_ms=self.timeout_ms, **self.decoder_options)
+        if cap.isOpened():
+            self.source = dict(capture_info(cap), url=self.url)
+            self._set_state('live')
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if not 1 <= fps <= 120:
+            fps = 25
+        self.stale_grab_s = self.STALE_GRAB_FRACTION / fps
+        return cap
+
+    # Grab until a grab has to wait for the network, then retrieve only that
+    # newest frame. Returns (ok, frame, arrival time in monotonic ns).
+    def _read_latest(self, cap):
+        drained = 0
+        while True:
+            started = time.monotonic()
+            if not cap.grab():
+                return False, None, 0
+            arrived = time.monotonic_ns()
+            if time.monotonic() - started >= self.stale_grab_s or drained >= self.MAX_DRAIN:
+                break
+            drained += 1
+        self.dropped += drained
+        ret, frame = cap.retrieve()
+        return ret, frame, arrived
+
+    # Exponential backoff with jitter, so cameras that dropped together do
+    # not all hammer the network again in lockstep.
+    def _backoff(self, attempt):
+        delay = min(self.RECONNECT_MAX_S, self.RECONNECT_MIN_S * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    # Sleep, but wake early on stop, when the tile is hidden or when the
+    # stream options change. Returns True if the full delay elapsed.
+    def _wait(self, seconds):
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            if not self.running or not self.visible or self._wanted() != self.opened_with:
+                return False
+            time.sleep(0.1)
+        return True
+
+    # report, if given, is called with each new state (used to forward it
+    # across the process boundary).
+    def capture_loop(self, publish, report=None):
+        self.report = report
+        cap           = None
+        seq           = 0
+        attempt       = 0      # reopen attempts since the last good frame
+        failing_since = None
+        next_due      = 0.0    # with max_fps: when the next frame may be published
+        while self.running:
+            # A tile off the current page costs nothing: the stream is closed
+            # (no network, no decode) and reopened when it is shown again.
+            if not self.visible:
+                if self.state != 'paused':
+                    if cap is not None:
+                        cap.release()
+                    cap              = None
+                    self.opened_with = None
+                    self._set_state('paused')
+                time.sleep(0.1)
+                continue
+            # (Re)open on this thread when the tile is shown, switches between
+            # preview and full stream or the capture options change.
+            if self._wanted() != self.opened_with:
+                if cap is not None:
+                    cap.release()
+                cap           = self._open()
+                attempt       = 0
+                failing_since = None
+                print(f'{self.key} stream connected' if cap.isOpened()
+                      else f'{self.key} failed to open stream')
+            if not cap.isOpened():
+                # Only this stream is reopened; the others keep running.
+                self._set_state('reconnecting')
+                if self._wait(self._backoff(attempt)):
+                    attempt += 1
+                    self.reconnects += 1
+                    cap = self._open('reconnecting')
+                continue
+            started = time.perf_counter()
+            if self.max_fps and time.monotonic() < next_due:
+                # Frame-rate capped (focus-mode thumbnail): keep the stream
+                # flowing but skip retrieving, scaling and publishing frames
+                # that would never be shown
+                ret, frame, arrived = cap.grab(), None, 0
+            elif self.low_latency:
+                ret, frame, arrived = self._read_latest(cap)
+            else:
+                ret, frame = cap.read()
+                arrived    = time.monotonic_ns()
+            if not ret:
+                if failing_since is None:
+                    failing_since = time.monotonic()
+                    self._set_state('stale')
+                elif time.monotonic() - failing_since >= self.STALE_GRACE_S:
+                    print(f'{self.key} stream lost, reconnecting')
+                    cap.release()
+                    failing_since = None
+                    continue
+                time.sleep(0.2)
+                continue
+            if failing_since is not None or attempt:
+                if attempt:
+                    print(f'{self.key} stream reconnected after {attempt} attempt(s)')
+                failing_since = None
+                attempt       = 0
+                self._set_state('live')
+            converting = time.perf_counter()
+            self.read_ms.add((converting - started) * 1000)
+            if frame is None:
+                self.throttled += 1
+                continue
+            if self.max_fps:
+                # On a fixed schedule, so frames published average max_fps
+                # rather than one source interval less
+                interval = 1 / self.max_fps
+                next_due = max(next_due, time.monotonic() - interval) + interval
+            frame = fit_to_tile(frame, *self.size)
+            if frame is None:
+                continue
+            self.convert_ms.add((time.perf_counter() - converting) * 1000)
+            seq += 1
+            publish(self.key, seq, frame, arrived)
+            if not self.low_latency:
+                time.sleep(0.01)
+        if cap is not None:
+            cap.release()
+
+
+class ThreadDecoder:
+    def __init__(self):
+        self.workers = {}
+        self.frames  = {}
+
+    def start(self, specs):
+        for key, spec in specs.items():
+            worker = StreamWorker(key, **spec)
+            self.workers[key] = worker
+            self.frames[key]  = (0, None, 0)
+            threading.Thread(target=worker.capture_loop,
+                             args=(self.publish,), daemon=True).start()
+
+    # A single tuple store, so the renderer never pairs a new seq with the
+    # previous frame.
+    def publish(self, key, seq, frame, captured_ns):
+        self.frames[key] = (seq, frame, captured_ns)
+
+    def keys(self):
+        return list(self.frames)
+
+    def update(self, key, **changes):
+        for name, value in changes.items():
+            setattr(self.workers[key], name, value)
+
+    def latest(self, key):
+        return self.frames[key]
+
+    def intact(self, key, seq):
+        return True
+
+    def state(self, key):
+        return self.workers[key].state
+
+    def stats(self, key):
+        return self.workers[key].stats()
+
+    # CPU time used so far: the workers run in this process
+    def cpu_seconds(self):
+        return time.process_time()
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker.running = False
+
+
+# Single-producer ring of RGBA frames in shared memory. The header holds the
+# latest slot index and the stream state (an index into STREAM_STATES),
+# followed by (seq, width, height, captured_ns) per slot;
+# rows are packed at the frame's own width so small tiles only touch the
+# pages they use. A slot's seq is zeroed while it is being written, which
+# lets the reader detect a frame overwritten mid-blit.
+class SharedFrameRing:
+    SLOTS  = 3
+    HEADER = 64 + SLOTS * 32
+
+    def __init__(self, capacity, name=None):
+        width, height   = capacity
+        self.slot_bytes = width * height * 4
+        size            = self.HEADER + self.SLOTS * self.slot_bytes
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+        self.name   = self.shm.name
+        self.header = np.ndarray((self.HEADER // 8,), np.int64, self.shm.buf)
+        if name is None:
+            self.header[:] = 0
+
+    def set_state(self, state):
+        self.header[1] = STREAM_STATES.index(state)
+
+    def state(self):
+        return STREAM_STATES[int(self.header[1])]
+
+    def _meta(self, slot):
+        return self.header[8 + slot * 4: 12 + slot * 4]
+
+    def write(self, seq, frame, captured_ns):
+        slot = (int(self.header[0]) + 1) % self.SLOTS
+        meta = self._meta(slot)
+        h, w = frame.shape[:2]
+        meta[0] = 0
+        view = np.ndarray((h, w, 4), np.uint8, self.shm.buf,
+                          self.HEADER + slot * self.slot_bytes)
+        view[:] = frame
+        meta[1], meta[2], meta[3] = w, h, captured_ns
+        meta[0] = seq
+        self.header[0] = slot
+
+    def latest(self):
+        slot = int(self.header[0])
+        seq, w, h, captured_ns = (int(v) for v in self._meta(slot))
+        if seq <= 0:
+            return 0, None, 0
+        return seq, np.ndarray((h, w, 4), np.uint8, self.shm.buf,
+                               self.HEADER + slot * self.slot_bytes), captured_ns
+
+    def intact(self, seq):
+        return any(self._meta(slot)[0] == seq for slot in range(self.SLOTS))
+
+    def close(self, unlink=False):
+        del self.header
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+# Entry point of one pool process: decodes its share of the streams on local
+# threads and applies ('update', key, changes) / ('stop',) control messages.
+# Pool processes report (pid, CPU seconds, {key: worker stats()}) on the
+# shared stats queue roughly once a second.
+STATS_INTERVAL_S = 1.0
+
+
+def decode_process_main(streams, control, stats):
+    preload_modules()
+    workers = {}
+    rings   = []
+    threads = []
+    for key, ring_name, capacity, spec in streams:
+        ring   = SharedFrameRing(capacity, ring_name)
+        worker = StreamWorker(key, **spec)
+        workers[key] = worker
+        rings.append(ring)
+        thread = threading.Thread(
+            target=worker.capture_loop,
+            args=(lambda _key, seq, frame, ts, r=ring: r.write(seq, frame, ts),
+                  ring.set_state),
+            daemon=True)
+        thread.start()
+        threads.append(thread)
+    while True:
+        try:
+            message = control.get(timeout=STATS_INTERVAL_S)
+        except queue.Empty:
+            stats.put((os.getpid(), time.process_time(),
+                       {key: worker.stats() for key, worker in workers.items()}))
+            continue
+        if message[0] == 'stop':
+            break
+        _, key, changes = message
+        for name, value in changes.items():
+            setattr(workers[key], name, value)
+    for worker in workers.values():
+        worker.running = False
+    for thread in threads:
+        thread.join(timeout=2)
+    for ring in rings:
+        # A worker still stuck in cap.read() may hold a view; the mapping is
+        # released when the process exits anyway.
+        try:
+            ring.close()
+        except BufferError:
+            pass
+
+
+# Decodes streams in a small pool of processes so decoding scales across cores
+# instead of sharing the UI interpreter's GIL. Frames come back through one
+# SharedFrameRing per stream, sized for the largest tile (the screen) or, where
+# capacities gives one, for the stream's largest picture on that screen.
+class ProcessDecoder:
+    def __init__(self, workers, capacity, capacities=None):
+        self.workers   = max(1, workers)
+        self.capacity  = capacity
+        self.capacities = capacities or {}
+        self.context   = multiprocessing.get_context('spawn')
+        self.rings     = {}
+        self.queues    = {}
+        self.processes = []
+        self.stats_queue  = self.context.Queue()
+        self.worker_stats = {}
+        self.process_cpu  = {}    # pid → CPU seconds at its last report
+
+    def _capacity(self, key):
+        return self.capacities.get(key, self.capacity)
+
+    def _clamp(self, key, size):
+        capacity = self._capacity(key)
+        return (min(size[0], capacity[0]), min(size[1], capacity[1]))
+
+    def start(self, specs):
+        keys = list(specs)
+        for group in (keys[i::self.workers] for i in range(self.workers)):
+            if not group:
+                continue
+            control = self.context.Queue()
+            streams = []
+            for key in group:
+                spec = dict(specs[key], size=self._clamp(key, specs[key]['size']))
+                ring = SharedFrameRing(self._capacity(key))
+                self.rings[key]  = ring
+                self.queues[key] = control
+                streams.append((key, ring.name, self._capacity(key), spec))
+            process = self.context.Process(
+                target=decode_process_main,
+                args=(streams, control, self.stats_queue),
+                daemon=True)
+            process.start()
+            self.processes.append((process, control))
+
+    def keys(self):
+        return list(self.rings)
+
+    def update(self, key, **changes):
+        if 'size' in changes:
+            changes['size'] = self._clamp(key, changes['size'])
+        self.queues[key].put(('update', key, changes))
+
+    def latest(self, key):
+        return self.rings[key].latest()
+
+    def intact(self, key, seq):
+        return self.rings[key].intact(seq)
+
+    def state(self, key):
+        return self.rings[key].state()
+
+    def _drain_stats(self):
+        while True:
+            try:
+                pid, cpu, report = self.stats_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.process_cpu[pid] = cpu
+            self.worker_stats.update(report)
+
+    # Latest report from the stream's pool process (empty until the first)
+    def stats(self, key):
+        self._drain_stats()
+        return self.worker_stats.get(key, {})
+
+    # CPU time used so far by the UI process and the pool (as last reported)
+    def cpu_seconds(self):
+        self._drain_stats()
+        return time.process_time() + sum(self.process_cpu.values())
+
+    def stop(self):
+        for process, control in self.processes:
+            control.put(('stop',))
+        for process, _ in self.processes:
+            process.join(timeout=3)
+            if process.is_alive():
+                process.terminate()
+        for ring in self.rings.values():
+            ring.close(unlink=True)
+        self.processes.clear()
+        self.rings.clear()
+        self.queues.clear()
+
+
+# ── Decoder probe ─────────────────────────────────────────────────────────
+# Decodes a stream for a few seconds with each of PROBE_CANDIDATES and
+# measures the frame rate delivered and the CPU used (% of one core, FFmpeg's
+# decoder threads included), both per second of stream time, so a recording
+# that decodes faster than real time is measured like a live camera. The
+# pick is the cheapest candidate that reaches 90 % of the target frame rate,
+# or the fastest if none does. Run it in a process of its own (the config
+# dialog does), so other streams do not count.
+
+PROBE_SECONDS    = 4.0
+PROBE_TARGET_FPS = 25
+PROBE_CANDIDATES = ({'threads': 1}, {'threads': 2}, {'threads': 4}, {'threads': 0},
+                    {'threads': 1, 'keyframes_only': True})
+
+
+def probe_decoder_options(url, target_fps, transport='tcp', seconds=PROBE_SECONDS,
+                          report=None):
+    results = []
+    for candidate in PROBE_CANDIDATES:
+        options = dict(candidate, transport=transport)
+        cap     = open_capture(url, timeout_ms=CONNECT_TIMEOUT_MS, **options)
+        result  = {'options': options, 'fps': 0.0, 'cpu_pct': None}
+        # The first frame waits for the connection and stream setup
+        if cap.isOpened() and cap.read()[0]:
+            frames   = 0
+            first    = last = cap.get(cv2.CAP_PROP_POS_MSEC)
+            cpu      = time.process_time()
+            started  = time.monotonic()
+            while time.monotonic() - started < seconds and cap.read()[0]:
+                frames += 1
+                last    = cap.get(cv2.CAP_PROP_POS_MSEC)
+            span = (last - first) / 1000
+            if span <= 0:
+                span = time.monotonic() - started
+            result['fps']     = round(frames / span, 2)
+            result['cpu_pct'] = round(100 * (time.process_time() - cpu) / span, 1)
+        cap.release()
+        results.append(result)
+        if report is not None:
+            report(result)
+    working = [r for r in results if r['fps']]
+    meeting = [r for r in working if r['fps'] >= target_fps * 0.9]
+    if meeting:
+        best = min(meeting, key=lambda r: r['cpu_pct'])
+    else:
+        best = max(working, key=lambda r: r['fps'], default=None)
+    return best, results
+
+
+def describe_decoder_options(options):
+    threads = options.get('threads') or 'auto'
+    frames  = 'keyframes only' if options.get('keyframes_only') else 'all frames'
+    return f'{threads} thread(s), {frames}'
+
+
+# Entry point of a probe process: reports each result, then ('done', best)
+def probe_process_main(url, target_fps, transport, results):
+    best, _ = probe_decoder_options(url, target_fps, transport,
+                                    report=lambda result: results.put(('result', result)))
+    results.put(('done', best))
+
+
+# ── Render budget ─────────────────────────────────────────────────────────
+# Caps the frames decoded and drawn per second across all tiles. Once a
+# second the app passes each on-screen stream's demand (what it delivers,
+# up to its own cap) in priority order, active camera first, and the CPU
+# it measured; caps() returns the frame rate each stream may use.
+#
+# The budget is the smaller of frame_budget (frames/s) and an allowance
+# that backs off while CPU use is over cpu_budget (% of one core) and
+# recovers when it is well under. It is shared out background tiles first:
+# they are lowered, evenly, down to MIN_FPS before the active camera gives
+# up any of its rate.
+
+class RenderBudget:
+    MIN_FPS  = 1.0
+    BACK_OFF = 0.8     # allowance factor per second over the CPU budget
+    RECOVER  = 1.1     # … and per second under HEADROOM of it
+    HEADROOM = 0.85
+
+    def __init__(self, frame_budget=0, cpu_budget=0):
+        self.frame_budget = frame_budget    # 0: no frame limit
+        self.cpu_budget   = cpu_budget      # 0: no CPU limit
+        self.allowance    = None
+        self.cpu_pct      = None
+        self.sampled      = None            # (monotonic, CPU seconds)
+
+    def enabled(self):
+        return bool(self.frame_budget or self.cpu_budget)
+
+    # A new decoder counts CPU time from a new start
+    def reset(self):
+        self.allowance = None
+        self.cpu_pct   = None
+        self.sampled   = None
+
+    def measure(self, cpu_seconds):
+        now = time.monotonic()
+        if self.sampled is not None and now > self.sampled[0]:
+            self.cpu_pct = 100 * (cpu_seconds - self.sampled[1]) / (now - self.sampled[0])
+        self.sampled = (now, cpu_seconds)
+
+    def budget(self, demand):
+        limit = self.frame_budget or demand
+        if self.cpu_budget and self.cpu_pct is not None:
+            allowance = demand if self.allowance is None else self.allowance
+            if self.cpu_pct > self.cpu_budget:
+                allowance *= self.BACK_OFF
+            elif self.cpu_pct < self.cpu_budget * self.HEADROOM:
+                allowance *= self.RECOVER
+            self.allowance = min(demand, allowance)
+            limit = min(limit, self.allowance)
+        return min(limit, demand)
+
+    # demands: [(key, fps)] with the active camera first. Returns {key: fps}
+    # for the streams that must run below their demand.
+    def caps(self, demands):
+        if not demands:
+            return {}
+        left = self.budget(sum(fps for _, fps in demands))
+        (first, first_fps), rest = demands[0], demands[1:]
+        floors = sum(min(fps, self.MIN_FPS) for _, fps in rest)
+        rates  = {first: max(min(first_fps, self.MIN_FPS), min(first_fps, left - floors))}
+        left  -= rates[first]
+        # Even shares, topped up by what slower streams do not need
+        pending = sorted(rest, key=lambda item: item[1])
+        for i, (key, fps) in enumerate(pending):
+            share     = left / (len(pending) - i)
+            rates[key] = max(min(fps, self.MIN_FPS), min(fps, share))
+            left      -= rates[key]
+        demand = dict(demands)
+        # Half-frame steps, so small swings do not reconfigure every stream
+        return {key: max(self.MIN_FPS, round(rate * 2) / 2)
+                for key, rate in rates.items() if rate < demand[key] * 0.95}
+
+
+# ── Saved configuration ───────────────────────────────────────────────────
+# {'version': 1, 'cameras': [camera config, …], 'streams': {url: capture_info}}.
+# Loaded at startup so the wall comes back without retyping; the stream info
+# sizes decode rings and labels waiting tiles before the first frame arrives.
+
+def load_config(path):
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as exc:
+        print(f'Could not read {path}: {exc}')
+        return None
+    if (not isinstance(data, dict) or data.get('version') != CONFIG_VERSION
+            or not isinstance(data.get('cameras', []), list)
+            or not isinstance(data.get('streams', {}), dict)
+            or not isinstance(data.get('positions', {}), dict)):
+        print(f'Ignoring {path}: not a version {CONFIG_VERSION} configuration')
+        return None
+    return data
+
+
+# Written to a private temporary file and renamed, so the file is never
+# readable by others or half-written. Raises OSError.
+def save_config(path, data):
+    os.makedirs(os.path.dirname(path) or '.', mode=0o700, exist_ok=True)
+    partial = f'{path}.tmp'
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(partial)
+    with os.fdopen(os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), 'w') as f:
+        json.dump(data, f, indent=1)
+    os.replace(partial, path)
+
+
+# ── PTZ control ───────────────────────────────────────────────────────────
+# VISCA calls block on a UDP round trip (and on timeouts for an unreachable
+# camera), so each camera gets a dispatcher thread. Commands are keyed by
+# channel: a newer pantilt/zoom replaces one still waiting in the queue, so
+# only the latest velocity is ever sent and the Tk thread never waits.
+
+# visca_over_ip waits for inquiry replies on the fixed local port 52381, where
+# only one of several cameras' sockets receives them. Inquiries go out on the
+# camera's own command socket instead; its dispatcher never sends two at once.
+def open_camera(ip):
+    camera = visca_over_ip.Camera(ip)
+    camera._inq_sock.close()
+    camera._inq_sock = camera._cmd_sock
+    return camera
+
+
+# Soft limit text 'min..max' (e.g. '-1200..1200') as (min, max), or None if
+# blank. Raises ValueError.
+def parse_limits(text):
+    if not text.strip():
+        return None
+    low, sep, high = text.partition('..')
+    if not sep or int(low) > int(high):
+        raise ValueError(f'expected min..max, got {text!r}')
+    return int(low), int(high)
+
+
+class CommandDispatcher:
+    POSITION_SIGN = (1, -1)   # per axis: the sign of speed that raises the position
+
+    def __init__(self, key, camera, poll_interval=0, limits=(None, None)):
+        self.key        = key
+        self.camera     = camera
+        self.pending    = {}
+        self.cond       = threading.Condition()
+        self.running    = True
+        self.sent       = 0
+        self.coalesced  = 0
+        self.failed     = 0
+        self.rtt_totals = [0.0, 0]
+        self.rtt_ms     = RollingHistogram()
+        # Position cache, fed by inquiries while no command is waiting and
+        # the camera is not being driven (0: never). limits are the soft
+        # (min, max) for pan and tilt, or None; while any is set, a pan/tilt
+        # drive is still polled so the limits can stop it.
+        self.poll_interval = poll_interval
+        self.limits        = limits
+        self.position      = None     # (pan, tilt, zoom) from the last inquiry
+        self.settled       = False    # the last two inquiries agreed
+        self.drive         = (0, 0)   # pan/tilt speeds last sent
+        self.zooming       = False    # a zoom speed other than stop was last sent
+        self.inquiries     = 0
+        self.inquiry_failures = 0
+        self.next_poll     = time.monotonic()
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def send(self, method, *args, channel=None):
+        channel = channel or method
+        with self.cond:
+            if channel in self.pending:
+                self.coalesced += 1
+            self.pending[channel] = (method, args)
+            self.cond.notify()
+
+    # Drops commands still waiting on these channels
+    def cancel(self, *channels):
+        with self.cond:
+            for channel in channels:
+                self.pending.pop(channel, None)
+
+    def depth(self):
+        return len(self.pending)
+
+    # Average round trip (ms) since the previous call
+    def take_rtt(self):
+        with self.cond:
+            total, count = self.rtt_totals
+            self.rtt_totals = [0.0, 0]
+        return total / count if count else None
+
+    def stats(self):
+        return {'sent':      self.sent,
+                'coalesced': self.coalesced,
+                'failed':    self.failed,
+                'queue':     self.depth(),
+                'rtt_ms':    self.rtt_ms.snapshot(),
+                'inquiries': self.inquiries,
+                'position':  self.position}
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+
+    # Seconds until the next position inquiry is due, None if never (or not
+    # while the camera is driven)
+    def _poll_wait(self):
+        if not self.poll_interval or self.zooming:
+            return None
+        if self.drive != (0, 0) and not any(self.limits):
+            return None
+        return self.next_poll - time.monotonic()
+
+    # Commands go first; an inquiry only takes the line while none is waiting.
+    # Once stopped, the thread closes the camera's sockets: nothing else uses
+    # them, and a command in flight has finished by then.
+    def _run(self):
+        while True:
+            with self.cond:
+                while self.running and not self.pending:
+                    wait = self._poll_wait()
+                    if wait is not None and wait <= 0:
+                        break
+                    self.cond.wait(wait)
+                if not self.running:
+                    break
+                command = None
+                if self.pending:
+                    command = self.pending.pop(next(iter(self.pending)))
+            if command is None:
+                self._poll()
+            else:
+                self._execute(*command)
+        self.camera.close_connection()
+
+    def _execute(self, method, args):
+        if method == 'pantilt' and len(args) == 2:
+            args       = self._limit(*args)
+            self.drive = args
+        elif method in ('pantilt', 'pantilt_home', 'pantilt_reset', 'recall_preset'):
+            self.drive = (0, 0)
+        if method == 'zoom':
+            self.zooming = bool(args[0])
+        started = time.perf_counter()
+        try:
+            getattr(self.camera, method)(*args)
+        except Exception as exc:
+            self.failed += 1
+            print(f'{self.key} {method}{args} failed: {exc}')
+        rtt = (time.perf_counter() - started) * 1000
+        self.rtt_ms.add(rtt)
+        with self.cond:
+            self.sent += 1
+            self.rtt_totals[0] += rtt
+            self.rtt_totals[1] += 1
+            # The camera may be moving now: watch it closely until it settles
+            self.settled   = False
+            self.next_poll = min(self.next_poll, time.monotonic() + POSITION_MOVING_POLL_S)
+
+    # Runs a visca_over_ip inquiry as a single attempt with INQUIRY_TIMEOUT_S
+    # on the (shared) inquiry socket, instead of the library's retries
+    def _inquire(self, inquiry):
+        camera  = self.camera
+        retries = camera.num_retries
+        timeout = camera._inq_sock.gettimeout()
+        camera.num_retries = 1
+        camera._inq_sock.settimeout(INQUIRY_TIMEOUT_S)
+        try:
+            return inquiry()
+        finally:
+            camera.num_retries = retries
+            camera._inq_sock.settimeout(timeout)
+
+    def _poll(self):
+        try:
+            pan, tilt = self._inquire(self.camera.get_pantilt_position)
+            # A command queued meanwhile goes before the zoom inquiry
+            if self.pending and self.position:
+                zoom = self.position[2]
+            else:
+                zoom = self._inquire(self.camera.get_zoom_position)
+        except Exception as exc:
+            if not self.inquiry_failures:
+                print(f'{self.key} position inquiry failed: {exc}')
+            self.inquiry_failures += 1
+            # A camera that does not answer inquiries is asked less and less often
+            self.next_poll = (time.monotonic() +
+                              self.poll_interval * 2 ** min(self.inquiry_failures, 5))
+            return
+        position = (pan, tilt, zoom)
+        self.inquiry_failures = 0
+        self.inquiries       += 1
+        self.settled          = position == self.position
+        self.position         = position
+        # A drive is stopped as soon as the camera is seen past a soft limit
+        if self.drive != (0, 0) and self._limit(*self.drive) != self.drive:
+            self._execute('pantilt', self.drive)
+        interval = self.poll_interval if self.settled else POSITION_MOVING_POLL_S
+        with self.cond:
+            self.next_poll = time.monotonic() + min(interval, self.poll_interval)
+
+    # Zeroes a pan or tilt speed that would carry the camera further past its
+    # soft limit. A positive pan speed (VISCA Right) raises the reported pan
+    # position; a negative tilt speed (VISCA Up) raises the tilt position.
+    def _limit(self, pan, tilt):
+        if self.position is None:
+            return pan, tilt
+        speeds = [pan, tilt]
+        for axis, limits in enumerate(self.limits):
+            if limits and speeds[axis]:
+                low, high = limits
+                at        = self.position[axis]
+                rising    = speeds[axis] * self.POSITION_SIGN[axis] > 0
+                if (not rising and at <= low) or (rising and at >= high):
+                    speeds[axis] = 0
+        return tuple(speeds)
+
+
+# Turns the operator's current pan/tilt/zoom intent into VISCA commands for
+# the cameras being driven (one, or a group). A command goes out only when the
+# vector actually changes (so key auto-repeat and identical updates cost
+# nothing), and at most max_rate times per second per camera. A stop on any
+# axis is never delayed. A group's cameras are handed each change in the same
+# pass, and every dispatcher sends on its own thread, so they move together.
+# Cameras dropped from the target are stopped.
+#
+# Pan and tilt follow a motion profile rather than stepping: on a TICK_S
+# control tick each axis's speed moves towards the target, a speed-up taking
+# ramp_s and a slow-down stop_ramp_s (0: at once), and only a change of the
+# whole VISCA speed is sent. Zoom steps as before.
+class MovementController:
+    IDLE   = (0, 0, 0)
+    TICK_S = 0.05
+
+    def __init__(self, max_rate=10, ramp_s=0.0, stop_ramp_s=0.0):
+        self.interval    = 1.0 / max(1, max_rate)
+        self.ramp_s      = ramp_s
+        self.stop_ramp_s = stop_ramp_s
+        self.cond        = threading.Condition()
+        self.target      = None
+        self.sent        = {}
+        self.last_send   = {}
+        self.speed       = {}     # dispatcher → ramped (pan, tilt), fractional
+        self.ramps       = {}     # dispatcher → (goal, speed change per ramp) per axis
+        self.ramped_at   = {}     # dispatcher → time of the last step, while ramping
+        self.suppressed  = 0
+        self.running     = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def set_target(self, dispatchers, pan, tilt, zoom):
+        dispatchers = tuple(dispatchers)
+        vector      = (pan, tilt, zoom)
+        with self.cond:
+            if self.target is not None:
+                previous, wanted = self.target
+                for dispatcher in previous:
+                    if dispatcher not in dispatchers:
+                        self._send(dispatcher, self.IDLE)
+                        for profile in (self.speed, self.ramps, self.ramped_at):
+                            profile.pop(dispatcher, None)
+                if previous == dispatchers and wanted == vector:
+                    self.suppressed += 1
+                    return
+            self.target = (dispatchers, vector)
+            self.cond.notify()
+
+    def reset(self):
+        with self.cond:
+            self.target = None
+            self.sent.clear()
+            self.last_send.clear()
+            self.speed.clear()
+            self.ramps.clear()
+            self.ramped_at.clear()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+
+    # Called with self.cond held; dispatcher.send() never blocks.
+    def _send(self, dispatcher, vector):
+        last = self.sent.get(dispatcher, self.IDLE)
+        if vector[:2] != last[:2]:
+            dispatcher.send('pantilt', vector[0], vector[1])
+        if vector[2] != last[2]:
+            dispatcher.send('zoom', vector[2])
+        self.sent[dispatcher]      = vector
+        self.last_send[dispatcher] = time.monotonic()
+
+    # One axis's speed moved towards goal for dt seconds, changing by scale
+    # per ramp; a reversal slows to 0 first.
+    def _ramp(self, speed, goal, scale, dt):
+        slowing = abs(goal) < abs(speed) or goal * speed < 0
+        ramp    = self.stop_ramp_s if slowing else self.ramp_s
+        goal    = 0.0 if goal * speed < 0 else goal
+        if ramp <= 0:
+            return goal
+        step = scale / ramp * dt
+        return min(speed + step, goal) if goal > speed else max(speed - step, goal)
+
+    # Whole VISCA speed for a ramped one: a moving axis runs at least at 1,
+    # and an axis starting towards a goal starts at once
+    @staticmethod
+    def _quantise(speed, goal):
+        if not speed:
+            return (goal > 0) - (goal < 0)
+        steps = max(1, round(abs(speed)))
+        return steps if speed > 0 else -steps
+
+    # The vector to send to dispatcher now on the way to vector
+    def _profile(self, dispatcher, vector, now):
+        if not (self.ramp_s or self.stop_ramp_s):
+            return vector
+        speed = self.speed.get(dispatcher, (0.0, 0.0))
+        dt    = now - self.ramped_at.get(dispatcher, now)
+        goal, scales = self.ramps.get(dispatcher, (None, None))
+        # The slope is set when the goal changes: the larger of the two
+        # speeds is covered in one ramp, so every change takes the same time
+        if goal != vector[:2]:
+            goal   = vector[:2]
+            scales = tuple(max(abs(v), abs(g)) for v, g in zip(speed, goal))
+            self.ramps[dispatcher] = (goal, scales)
+        speed = tuple(self._ramp(v, g, scale, dt) for v, g, scale in zip(speed, goal, scales))
+        self.speed[dispatcher] = speed
+        if speed == vector[:2]:
+            self.ramped_at.pop(dispatcher, None)
+        else:
+            self.ramped_at[dispatcher] = now
+        return (self._quantise(speed[0], vector[0]), self._quantise(speed[1], vector[1]),
+                vector[2])
+
+    def _run(self):
+        with self.cond:
+            while self.running:
+                if self.target is None:
+                    self.cond.wait()
+                    continue
+                dispatchers, vector = self.target
+                now     = time.monotonic()
+                wanted  = {dispatcher: self._profile(dispatcher, vector, now)
+                           for dispatcher in dispatchers}
+                tick    = self.TICK_S if any(dispatcher in self.ramped_at
+                                             for dispatcher in dispatchers) else None
+                behind  = [dispatcher for dispatcher in dispatchers
+                           if self.sent.get(dispatcher, self.IDLE) != wanted[dispatcher]]
+                if not behind:
+                    self.cond.wait(tick)
+                    continue
+                stopping = any(old and not new for dispatcher in behind
+                               for old, new in zip(self.sent.get(dispatcher, self.IDLE),
+                                                   wanted[dispatcher]))
+                wait     = (max(self.last_send.get(dispatcher, 0.0) for dispatcher in behind)
+                            + self.interval - now)
+                if wait > 0 and not stopping:
+                    self.cond.wait(min(wait, tick or wait))
+                    continue
+                for dispatcher in behind:
+                    self._send(dispatcher, wanted[dispatcher])
+
+
+# ── Gamepad ───────────────────────────────────────────────────────────────
+# Analog sticks (Linux evdev, optional: pip install evdev) feed the same
+# MovementController as the keys. The reader thread only keeps the latest
+# deflection of each axis; the Tk thread samples them every GAMEPAD_POLL_MS
+# and turns them into whole speeds, so a stick reporting hundreds of events a
+# second costs one comparison per sample, and a command only when a speed
+# step changes (then at most --command-rate per second).
+
+evdev = LazyModule('evdev')
+
+GAMEPAD_POLL_MS  = 50
+GAMEPAD_RETRY_S  = 2.0
+GAMEPAD_DEADZONE = 0.12
+GAMEPAD_CURVE    = 2.0
+# Movement axis → (evdev axes to try in order, sign). Stick up reads negative:
+# left stick up tilts up, right stick up zooms in.
+GAMEPAD_AXES = {'pan':  (('ABS_X',), 1),
+                'tilt': (('ABS_Y',), 1),
+                'zoom': (('ABS_RY', 'ABS_RZ'), -1)}
+
+
+# Deflection -1..1 → -1..1 with a deadzone around the centre (drift and a
+# resting thumb read as 0) and a power curve for fine control near it. The
+# output starts from 0 at the deadzone edge, so there is no jump.
+def shape_axis(value, deadzone=GAMEPAD_DEADZONE, curve=GAMEPAD_CURVE):
+    magnitude = abs(value)
+    if magnitude <= deadzone:
+        return 0.0
+    shaped = min(1.0, (magnitude - deadzone) / (1 - deadzone)) ** curve
+    return shaped if value > 0 else -shaped
+
+
+# Shaped deflection → a VISCA speed: 0, or 1..top either way
+def axis_speed(value, top):
+    if not value:
+        return 0
+    speed = max(1, round(abs(value) * top))
+    return speed if value > 0 else -speed
+
+
+class GamepadReader:
+    def __init__(self, path=None):
+        self.path    = path         # None: the first device that looks like a gamepad
+        self.axes    = {axis: 0.0 for axis in GAMEPAD_AXES}
+        self.name    = None         # of the open device
+        self.events  = 0
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def stop(self):
+        self.running = False
+
+    def _find(self):
+        if self.path:
+            return evdev.InputDevice(self.path)
+        ecodes = evdev.ecodes
+        for path in evdev.list_devices():
+            # A device we may not read (EACCES) must not hide a gamepad after it
+            try:
+                device       = evdev.InputDevice(path)
+                capabilities = device.capabilities(absinfo=False)
+            except OSError:
+                continue
+            buttons = capabilities.get(ecodes.EV_KEY, [])
+            # Touchpads have X/Y axes too, but no gamepad or joystick buttons
+            if (ecodes.ABS_X in capabilities.get(ecodes.EV_ABS, []) and
+                    (ecodes.BTN_GAMEPAD in buttons or ecodes.BTN_JOYSTICK in buttons)):
+                return device
+            device.close()
+        return None
+
+    # evdev code → (movement axis, sign, centre, half range) for this device
+    def _calibrate(self, device):
+        present = device.capabilities(absinfo=False).get(evdev.ecodes.EV_ABS, [])
+        codes   = {}
+        for axis, (names, sign) in GAMEPAD_AXES.items():
+            code = next((evdev.ecodes.ecodes[name] for name in names
+                         if evdev.ecodes.ecodes[name] in present), None)
+            if code is None:
+                continue
+            info = device.absinfo(code)
+            codes[code] = (axis, sign, (info.max + info.min) / 2, (info.max - info.min) / 2 or 1)
+            self._set(codes[code], info.value)
+        return codes
+
+    def _set(self, mapping, value):
+        axis, sign, centre, half = mapping
+        self.axes[axis] = max(-1.0, min(1.0, sign * (value - centre) / half))
+
+    def _run(self):
+        missing = False
+        while self.running:
+            try:
+                device = self._find()
+            except OSError as exc:      # only a configured path fails to open
+                device = None
+                if not missing:
+                    print(f'Cannot open gamepad {self.path}: {exc}')
+                    missing = True
+            if device is None:
+                if not missing:
+                    print('No gamepad found; waiting for one')
+                missing = True
+                time.sleep(GAMEPAD_RETRY_S)
+                continue
+            missing = False
+            try:
+                codes     = self._calibrate(device)
+                self.name = device.name
+                print(f'Gamepad connected: {device.name} ({device.path})')
+                while self.running:
+                    if not select.select([device.fd], [], [], 0.5)[0]:
+                        continue
+                    for event in device.read():
+                        if event.type == evdev.ecodes.EV_ABS and event.code in codes:
+                            self.events += 1
+                            self._set(codes[event.code], event.value)
+            except OSError as exc:
+                print(f'Gamepad disconnected: {exc}')
+            finally:
+                # Centred at once, so an unplugged stick cannot keep a camera moving
+                self.axes = {axis: 0.0 for axis in GAMEPAD_AXES}
+                self.name = None
+                device.close()
+            time.sleep(GAMEPAD_RETRY_S)
 
 
 class PTZApp:
-    def __init__(self, root):
+    # Values a saved camera config may hold, for the fields with a fixed set
+    CONFIG_CHOICES = {'max_fps': FPS_CAPS, 'threads': DECODER_THREADS,
+                      'transport': TRANSPORTS, 'keyframes': KEYFRAME_MODES}
+
+    STREAM_STATE_TEXT = {'connecting':   'Connecting…',
+                         'live':         'Waiting for video…',
+                         'stale':        'Stream stalled',
+                         'reconnecting': 'Reconnecting…',
+                         'paused':       'Paused'}
+
+    def __init__(self, root, decode_mode='thread', decode_workers=2, low_latency=False,
+                 command_rate=10, connect_timeout=CONNECT_TIMEOUT_MS / 1000,
+                 stats_overlay=False, stats_file=None, layout=GridLayout(4, 2),
+                 camera_count=8, focus_mode=False, thumbnail_fps=2, frame_budget=0,
+                 cpu_budget=0, config_path=CONFIG_PATH, auto_connect=True, startup=None,
+                 exit_after_startup=False, position_poll=POSITION_POLL_S,
+                 restore_positions=False, gamepad=None, gamepad_deadzone=GAMEPAD_DEADZONE,
+                 gamepad_curve=GAMEPAD_CURVE, ramp=RAMP_S, stop_ramp=STOP_RAMP_S):
         self.root = root
         self.root.title("PTZ Camera Controller — Modern Edition")
         self.root.geometry("1880x980")
@@ -39,20 +1525,115 @@ class PTZApp:
 
         self.root.configure(bg='#000000')
 
+        # Painted before anything else is built, so the window is up at once
+        self.startup = startup or StartupReport()
+        self.exit_after_startup = exit_after_startup
+        splash = tk.Label(root,
+                          text='🎥 PTZ Camera Controller\n\nStarting…',
+                          font=('Ubuntu', 14, 'bold'),
+                          bg=self.colors['bg_dark'],
+                          fg=self.colors['text_secondary'])
+        splash.place(relx=0, rely=0, relwidth=1, relheight=1)
+        self.root.update()
+        self.startup.mark('window')
+
         self.cameras = {}
-        self.video_caps = {}
-        self.video_frames = {}
+        self.decode_mode = decode_mode
+        self.decode_workers = decode_workers
+        self.decoder = None
+        self.low_latency = tk.BooleanVar(value=low_latency)
+        self.connect_timeout_ms = int(connect_timeout * 1000)
+        # Cameras are created on connector threads; results are picked up by
+        # the Tk loop. The generation discards results of a superseded connect.
+        self.connect_results = queue.Queue()
+        self.connect_generation = 0
+        self.connect_pending = 0
+        self.stream_states = {}
+        self.rendered_seqs = {}
+        self.latency_totals = {}
+        # Render-side instrumentation per tile; see stats_snapshot()
+        self.show_stats = tk.BooleanVar(value=stats_overlay)
+        self.stats_file = stats_file
+        self.tile_stats_labels = {}
+        # Pan/tilt/zoom readouts from the dispatchers' position caches
+        self.show_positions = tk.BooleanVar(value=bool(position_poll))
+        self.tile_position_labels = {}
+        self.position_texts = {}
+        self.blit_ms = {}
+        self.display_ms = {}
+        self.render_gaps = {}
         self.video_labels = {}
+        self.tile_info_labels = {}
+        self.tile_surfaces = {}
         self.camera_name_labels = {}
+        self.tile_sizes = {}
+        self.enlarged_key = None
+        # Only the cameras on the shown page (or the enlarged one) are
+        # decoded and drawn; see apply_layout()
+        self.layout = layout
+        self.layout_var = tk.StringVar(value=str(layout))
+        self.page = 0
+        self.visible_keys = []
+        # Focus mode shows the steered camera large (full stream) next to
+        # thumbnails of the page, decoded at thumbnail_fps
+        self.focus_mode = tk.BooleanVar(value=focus_mode)
+        self.thumbnail_fps = thumbnail_fps
+        # Grid area and per-tile picture sizes follow the window; see
+        # on_grid_resize(). stream_targets is what the decoder was last told.
+        self.grid_area = (GRID_WIDTH, GRID_HEIGHT)
+        self.resize_job = None
+        self.stream_targets = {}
         self.active_cam = None
+        self.active_ptz = None
+        self.dispatchers = {}
         self.active_name = ''
+        # Cameras driven together with the active one (Ctrl+F-key / Ctrl+click)
+        self.group = []
 
         self.pressed_keys = set()
+        self.release_jobs = {}
         self.move_speed = 6
-        self.running = False
+        self.movement = MovementController(command_rate, ramp, stop_ramp)
+        self.position_poll = position_poll
+        self.restore_positions = tk.BooleanVar(value=restore_positions)
+        # Gamepad: device path, or '' for the first one found
+        self.gamepad_path = gamepad or None
+        self.use_gamepad = tk.BooleanVar(value=gamepad is not None)
+        self.gamepad = None
+        self.gamepad_job = None
+        self.gamepad_name = None    # shown in the status bar
+        self.gamepad_vector = MovementController.IDLE
+        self.gamepad_deadzone = gamepad_deadzone
+        self.gamepad_curve = gamepad_curve
         self.config_window = None
-
-        self.camera_configs = [{'ip': '', 'rtsp': ''} for _ in range(8)]
+        self.video_job = None
+
+        # Redraw accounting for the change-driven renderer (reset every second)
+        self.render_drawn = 0
+        self.render_skipped = 0
+        self.render_window_start = time.monotonic()
+
+        # Frame-rate caps handed out by the render budget, by stream
+        self.render_budget = RenderBudget(frame_budget, cpu_budget)
+        self.budget_caps   = {}
+
+        # 'rtsp' is the full stream, only decoded while a tile is enlarged;
+        # 'preview' is an optional substream used for the grid. The cameras
+        # saved last session come first; camera_count only adds empty slots.
+        # stream_info caches capture_info() by URL.
+        self.config_path    = config_path
+        saved               = load_config(config_path) if config_path else None
+        self.camera_configs = [self.restore_camera_config(cfg)
+                               for cfg in (saved or {}).get('cameras', [])]
+        self.camera_configs += [self.new_camera_config()
+                                for _ in range(camera_count - len(self.camera_configs))]
+        self.stream_info    = dict((saved or {}).get('streams', {}))
+        # Last settled (pan, tilt, zoom) of each camera, by IP
+        self.positions      = {ip: tuple(position) for ip, position
+                               in (saved or {}).get('positions', {}).items()
+                               if isinstance(position, list) and len(position) == 3
+                               and all(type(value) is int for value in position)}
+        self.position_save_job = None
 
         # ── Global keyboard bindings (tkinter bind_all — no external libs) ──
         # Works for all widgets in the window; no compilation or root needed.
@@ -71,12 +1652,46 @@ class PTZApp:
         menubar.add_cascade(label='Settings', menu=config_menu)
         config_menu.add_command(label='Configure Cameras...',
                                 command=self.open_config_window)
+        config_menu.add_checkbutton(label='Low-Latency Capture',
+                                    variable=self.low_latency,
+                                    command=self.apply_low_latency)
+        config_menu.add_checkbutton(label='Pipeline Stats Overlay',
+                                    variable=self.show_stats,
+                                    command=self.apply_stats_overlay)
+        config_menu.add_checkbutton(label='Gamepad Input',
+                                    variable=self.use_gamepad,
+                                    command=self.apply_gamepad)
+        config_menu.add_separator()
+        config_menu.add_checkbutton(label='Return to Last Position on Connect',
+                                    variable=self.restore_positions)
+        config_menu.add_command(label='Return All Cameras to Last Position',
+                                command=lambda: self.return_to_last_position(*self.dispatchers))
         config_menu.add_separator()
         config_menu.add_command(label='Exit', command=root.quit)
 
         help_menu = tk.Menu(menubar, tearoff=0,
                             bg=self.colors['bg_medium'],
                             fg=self.colors['text_primary'])
+        view_menu = tk.Menu(menubar, tearoff=0,
+                            bg=self.colors['bg_medium'],
+                            fg=self.colors['text_primary'])
+        menubar.add_cascade(label='View', menu=view_menu)
+        for name in LAYOUTS:
+            view_menu.add_radiobutton(label=f"{name.replace('x', ' × ')} grid",
+                                      value=name, variable=self.layout_var,
+                                      command=self.apply_layout_choice)
+        view_menu.add_separator()
+        view_menu.add_checkbutton(label='Focus on Active Camera',
+                                  variable=self.focus_mode,
+                                  command=self.apply_layout)
+        view_menu.add_checkbutton(label='Position Readout',
+                                  variable=self.show_positions)
+        view_menu.add_separator()
+        view_menu.add_command(label='Previous Page', accelerator='PgUp',
+                              command=lambda: self.show_page(self.page - 1))
+        view_menu.add_command(label='Next Page', accelerator='PgDn',
+                              command=lambda: self.show_page(self.page + 1))
+
         menubar.add_cascade(label='Help', menu=help_menu)
         help_menu.add_command(label='Controls', command=self.show_controls_help)
 
@@ -94,7 +1709,8 @@ class PTZApp:
                  fg=self.colors['text_primary']).pack()
 
         tk.Label(header_frame,
-                 text='Arrows: Pan/Tilt  •  +/-: Zoom  •  F1-F8: Switch cameras  •  Settings: Configure',
+                 text='Arrows: Pan/Tilt  •  +/-: Zoom  •  0-9: Presets  •  F1-F12 / click: Switch cameras (Ctrl: group)  •  '
+                      'PgUp/PgDn: Page  •  Double-click: Enlarge  •  Settings: Configure',
                  font=('Ubuntu', 8),
                  bg=self.colors['bg_medium'],
                  fg=self.colors['text_secondary']).pack(pady=(3, 0))
@@ -122,6 +1738,34 @@ class PTZApp:
                                      fg=self.colors['text_secondary'])
         self.status_label.pack(side='left')
 
+        self.gamepad_label = tk.Label(control_panel,
+                                      text='',
+                                      font=('Ubuntu', 9),
+                                      bg=self.colors['bg_medium'],
+                                      fg=self.colors['text_secondary'])
+        self.gamepad_label.pack(side='left', padx=20)
+
+        self.page_label = tk.Label(control_panel,
+                                   text='',
+                                   font=('Ubuntu Mono', 9),
+                                   bg=self.colors['bg_medium'],
+                                   fg=self.colors['text_secondary'])
+        self.page_label.pack(side='left', padx=20)
+
+        self.render_stats_label = tk.Label(control_panel,
+                                           text='',
+                                           font=('Ubuntu Mono', 9),
+                                           bg=self.colors['bg_medium'],
+                                           fg=self.colors['text_secondary'])
+        self.render_stats_label.pack(side='left', padx=20)
+
+        self.ptz_stats_label = tk.Label(control_panel,
+                                        text='',
+                                        font=('Ubuntu Mono', 9),
+                                        bg=self.colors['bg_medium'],
+                                        fg=self.colors['text_secondary'])
+        self.ptz_stats_label.pack(side='left', padx=20)
+
         # Speed control
         speed_frame = tk.Frame(top_frame,
                                bg=self.colors['bg_light'],
@@ -176,37 +1820,71 @@ class PTZApp:
         # ── Video grid ───────────────────────────────────────────────────
         video_container = tk.Frame(root, bg='#000000')
         video_container.pack(fill='both', expand=True, padx=1, pady=1)
+        video_container.bind('<Configure>', self.on_grid_resize)
 
         self.video_frame = tk.Frame(video_container, bg='#000000')
         self.video_frame.pack(fill='both', expand=True)
 
-        for i in range(8):
-            cam_container = tk.Frame(self.video_frame,
-                                     bg='#000000',
-                                     highlightbackground='#ffffff',
-                                     highlightthickness=1,
-                                     width=465, height=430)
-            cam_container.grid(row=i // 4, column=i % 4,
-                               padx=0, pady=0, sticky='nsew')
-            cam_container.grid_propagate(False)
-
-            lbl = tk.Label(cam_container,
-                           bg='#000000',
-                           text=f'F{i + 1}\nNo Signal',
-                           font=('Ubuntu', 10),
-                           fg='#666666',
-                           bd=0, padx=0, pady=0,
-                           highlightthickness=0)
-            lbl.pack(fill='both', expand=True)
-            self.video_labels[f'F{i + 1}'] = lbl
-            self.camera_name_labels[f'F{i + 1}'] = lbl
-
-        for i in range(2):
-            self.video_frame.grid_rowconfigure(i, weight=0, minsize=430)
-        for i in range(4):
-            self.video_frame.grid_columnconfigure(i, weight=0, minsize=465)
+        for key in self.camera_keys():
+            self.build_tile(key)
+        self.apply_layout()
 
+        splash.destroy()
         self.root.update()
+        self.startup.mark('interface')
+
+        # Connecting runs in the background, so the saved wall comes up on
+        # its own without holding up the window
+        connect = auto_connect and any(cfg['ip'] for cfg in self.camera_configs)
+        if connect:
+            self.startup.expected.add('first_frame')
+        self.root.after_idle(self.load_libraries, list(LAZY_MODULES), connect)
+        self.root.after(100, self.report_startup)
+        if self.use_gamepad.get():
+            self.root.after_idle(self.apply_gamepad)
+
+    # Tile widgets for one camera; placed on the grid by apply_layout()
+    def build_tile(self, key):
+        cam_container = tk.Frame(self.video_frame,
+                                 bg='#000000',
+                                 highlightbackground='#ffffff',
+                                 highlightthickness=1,
+                                 width=TILE_WIDTH, height=TILE_HEIGHT)
+        cam_container.pack_propagate(False)
+
+        lbl = tk.Label(cam_container,
+                       bg='#000000',
+                       text=f'{key}\nNo Signal',
+                       font=('Ubuntu', 10),
+                       fg='#666666',
+                       bd=0, padx=0, pady=0,
+                       highlightthickness=0)
+        lbl.pack(fill='both', expand=True)
+        lbl.bind('<Button-1>',
+                 lambda event, k=key: self.on_tile_click(k, event.state & self.CONTROL_MASK))
+        lbl.bind('<Double-Button-1>',
+                 lambda _event, k=key: self.toggle_enlarged(k))
+        self.video_labels[key] = lbl
+        self.tile_info_labels[key] = tk.Label(cam_container,
+                                              text='',
+                                              font=('Ubuntu Mono', 8),
+                                              bg='#000000',
+                                              fg=self.colors['success'],
+                                              padx=3, pady=0)
+        self.tile_stats_labels[key] = tk.Label(cam_container,
+                                               text='',
+                                               font=('Ubuntu Mono', 8),
+                                               bg='#000000',
+                                               fg=self.colors['text_secondary'],
+                                               justify='left',
+                                               padx=3, pady=0)
+        self.tile_position_labels[key] = tk.Label(cam_container,
+                                                  text='',
+                                                  font=('Ubuntu Mono', 8),
+                                                  bg='#000000',
+                                                  fg=self.colors['text_secondary'],
+                                                  padx=3, pady=0)
+        self.camera_name_labels[key] = lbl
 
     # ── Configuration window ─────────────────────────────────────────────
 
@@ -218,7 +1896,7 @@ class PTZApp:
 
         self.config_window = Toplevel(self.root)
         self.config_window.title('Camera Configuration')
-        self.config_window.geometry('1000x900')
+        self.config_window.geometry('1000x1000')
         self.config_window.configure(bg=self.colors['bg_dark'])
         self.config_window.transient(self.root)
         self.config_window.grab_set()
@@ -233,18 +1911,43 @@ class PTZApp:
                  fg=self.colors['text_primary']).pack(pady=15)
 
         tk.Label(header_frame,
-                 text='Configure IP addresses for PTZ control and RTSP URLs for video streams (8 cameras supported)',
+                 text='Configure IP addresses for PTZ control, RTSP URLs and optional preview substreams',
                  font=('Ubuntu', 9),
                  bg=self.colors['bg_medium'],
                  fg=self.colors['text_secondary']).pack(pady=(0, 15))
 
-        config_container = tk.Frame(self.config_window, bg=self.colors['bg_dark'])
-        config_container.pack(fill='both', expand=True, padx=20, pady=10)
+        button_frame = tk.Frame(self.config_window, bg=self.colors['bg_dark'])
+        button_frame.pack(side='bottom', pady=20)
+
+        # Camera rows scroll, so any number of cameras fits the window
+        scroll_frame = tk.Frame(self.config_window, bg=self.colors['bg_dark'])
+        scroll_frame.pack(fill='both', expand=True, padx=20, pady=10)
+        canvas = tk.Canvas(scroll_frame, bg=self.colors['bg_dark'], highlightthickness=0)
+        scrollbar = tk.Scrollbar(scroll_frame, orient='vertical', command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side='right', fill='y')
+        canvas.pack(side='left', fill='both', expand=True)
+
+        config_container = tk.Frame(canvas, bg=self.colors['bg_dark'])
+        container_id = canvas.create_window((0, 0), window=config_container, anchor='nw')
+        config_container.bind('<Configure>',
+                              lambda _event: canvas.configure(scrollregion=canvas.bbox('all')))
+        canvas.bind('<Configure>',
+                    lambda event: canvas.itemconfigure(container_id, width=event.width))
+        # X11 reports the mouse wheel as buttons 4 and 5
+        self.config_window.bind('<Button-4>', lambda _event: canvas.yview_scroll(-1, 'units'))
+        self.config_window.bind('<Button-5>', lambda _event: canvas.yview_scroll(1, 'units'))
 
         ip_entries = []
         rtsp_entries = []
-
-        for i in range(8):
+        preview_entries = []
+        fps_vars   = []
+        decoder_vars = []
+        limit_entries = []
+        # Rows past the current cameras are new ones, added on Connect
+        configs = list(self.camera_configs)
+
+        def add_row(i):
             cam_frame = tk.Frame(config_container,
                                  bg=self.colors['bg_light'],
                                  relief=tk.FLAT,
@@ -257,7 +1960,7 @@ class PTZApp:
                      font=('Ubuntu', 9, 'bold'),
                      bg=self.colors['accent'],
                      fg=self.colors['text_primary'],
-                     padx=10, pady=2).grid(row=0, column=0, rowspan=2,
+                     padx=10, pady=2).grid(row=0, column=0, rowspan=5,
                                            padx=(10, 15), pady=10, sticky='ns')
 
             tk.Label(cam_frame, text='IP Address:',
@@ -274,15 +1977,31 @@ class PTZApp:
                               relief=tk.FLAT,
                               highlightbackground=self.colors['border'],
                               highlightthickness=1)
-            ip_ent.insert(0, self.camera_configs[i]['ip'])
+            ip_ent.insert(0, configs[i]['ip'])
             ip_ent.grid(row=0, column=2, padx=5, pady=(10, 2), sticky='w')
             ip_entries.append(ip_ent)
 
+            tk.Label(cam_frame, text='Max FPS:',
+                     font=('Ubuntu', 9),
+                     bg=self.colors['bg_light'],
+                     fg=self.colors['text_secondary']).grid(row=0, column=3, sticky='e',
+                                                            padx=(20, 5), pady=(10, 2))
+
+            fps_var = tk.StringVar(value=configs[i]['max_fps'])
+            fps_menu = tk.OptionMenu(cam_frame, fps_var, *FPS_CAPS)
+            fps_menu.config(font=('Ubuntu', 8),
+                            bg=self.colors['bg_dark'],
+                            fg=self.colors['text_primary'],
+                            activebackground=self.colors['accent'],
+                            relief=tk.FLAT, highlightthickness=0)
+            fps_menu.grid(row=0, column=4, padx=(5, 10), pady=(10, 2), sticky='w')
+            fps_vars.append(fps_var)
+
             tk.Label(cam_frame, text='RTSP URL:',
                      font=('Ubuntu', 9),
                      bg=self.colors['bg_light'],
                      fg=self.colors['text_secondary'],
-                     anchor='w').grid(row=1, column=1, sticky='w', padx=5, pady=(2, 10))
+                     anchor='w').grid(row=1, column=1, sticky='w', padx=5, pady=2)
 
             rtsp_ent = tk.Entry(cam_frame, width=55,
                                 font=('Ubuntu Mono', 9),
@@ -292,16 +2011,158 @@ class PTZApp:
                                 relief=tk.FLAT,
                                 highlightbackground=self.colors['border'],
                                 highlightthickness=1)
-            rtsp_ent.insert(0, self.camera_configs[i]['rtsp'])
-            rtsp_ent.grid(row=1, column=2, padx=5, pady=(2, 10), sticky='w')
+            rtsp_ent.insert(0, configs[i]['rtsp'])
+            rtsp_ent.grid(row=1, column=2, columnspan=3, padx=5, pady=2, sticky='w')
             rtsp_entries.append(rtsp_ent)
 
-        button_frame = tk.Frame(self.config_window, bg=self.colors['bg_dark'])
-        button_frame.pack(pady=20)
+            tk.Label(cam_frame, text='Preview URL:',
+                     font=('Ubuntu', 9),
+                     bg=self.colors['bg_light'],
+                     fg=self.colors['text_secondary'],
+                     anchor='w').grid(row=2, column=1, sticky='w', padx=5, pady=2)
+
+            preview_ent = tk.Entry(cam_frame, width=55,
+                                   font=('Ubuntu Mono', 9),
+                                   bg=self.colors['bg_dark'],
+                                   fg=self.colors['text_primary'],
+                                   insertbackground=self.colors['text_primary'],
+                                   relief=tk.FLAT,
+                                   highlightbackground=self.colors['border'],
+                                   highlightthickness=1)
+            preview_ent.insert(0, configs[i]['preview'])
+            preview_ent.grid(row=2, column=2, columnspan=3, padx=5, pady=2, sticky='w')
+            preview_entries.append(preview_ent)
+
+            tk.Label(cam_frame, text='Decoder:',
+                     font=('Ubuntu', 9),
+                     bg=self.colors['bg_light'],
+                     fg=self.colors['text_secondary'],
+                     anchor='w').grid(row=3, column=1, sticky='w', padx=5, pady=2)
+
+            decoder_frame = tk.Frame(cam_frame, bg=self.colors['bg_light'])
+            decoder_frame.grid(row=3, column=2, columnspan=3, padx=5, pady=2, sticky='w')
+            cfg     = configs[i]
+            decoder = {'threads':   tk.StringVar(value=cfg['threads']),
+                       'transport': tk.StringVar(value=cfg['transport']),
+                       'keyframes': tk.StringVar(value=cfg['keyframes']),
+                       'low_delay': tk.BooleanVar(value=cfg['low_delay'])}
+            for label, name, choices in (('Threads', 'threads', DECODER_THREADS),
+                                         ('Transport', 'transport', TRANSPORTS),
+                                         ('Keyframes only', 'keyframes', KEYFRAME_MODES)):
+                tk.Label(decoder_frame, text=f'{label}:',
+                         font=('Ubuntu', 8),
+                         bg=self.colors['bg_light'],
+                         fg=self.colors['text_secondary']).pack(side='left', padx=(0, 3))
+                menu = tk.OptionMenu(decoder_frame, decoder[name], *choices)
+                menu.config(font=('Ubuntu', 8),
+                            bg=self.colors['bg_dark'],
+                            fg=self.colors['text_primary'],
+                            activebackground=self.colors['accent'],
+                            relief=tk.FLAT, highlightthickness=0)
+                menu.pack(side='left', padx=(0, 10))
+            tk.Checkbutton(decoder_frame, text='Low delay',
+                           variable=decoder['low_delay'],
+                           font=('Ubuntu', 8),
+                           bg=self.colors['bg_light'],
+                           fg=self.colors['text_secondary'],
+                           selectcolor=self.colors['bg_dark'],
+                           activebackground=self.colors['bg_light'],
+                           highlightthickness=0).pack(side='left', padx=(0, 10))
+            decoder_vars.append(decoder)
+
+            probe_label = tk.Label(decoder_frame, text='',
+                                   font=('Ubuntu', 8),
+                                   bg=self.colors['bg_light'],
+                                   fg=self.colors['text_secondary'])
+
+            # Benchmarks the options on the stream the grid decodes and
+            # selects the cheapest that reaches Max FPS (or PROBE_TARGET_FPS)
+            def probe():
+                url = preview_ent.get().strip() or rtsp_ent.get().strip()
+                if not url:
+                    probe_label.config(text='Enter an RTSP URL first')
+                    return
+                target = FPS_CAPS[fps_var.get()] or PROBE_TARGET_FPS
+                probe_label.config(text=f'Probing for {target} fps…')
+                self.run_probe(url, target, TRANSPORTS[decoder['transport'].get()], probed)
+
+            def probed(best):
+                if not probe_label.winfo_exists():
+                    return
+                if best is None:
+                    probe_label.config(text='Probe failed: no frames')
+                    return
+                options = best['options']
+                decoder['threads'].set(next(name for name, threads in DECODER_THREADS.items()
+                                            if threads == options['threads']))
+                if options.get('keyframes_only'):
+                    decoder['keyframes'].set('Always')
+                elif decoder['keyframes'].get() == 'Always':
+                    decoder['keyframes'].set('Never')
+                probe_label.config(text=f"→ {describe_decoder_options(options)}: "
+                                        f"{best['fps']:.0f} fps, {best['cpu_pct']:.0f}% CPU")
+
+            tk.Button(decoder_frame, text='Probe',
+                      command=probe,
+                      bg=self.colors['bg_dark'],
+                      fg=self.colors['text_primary'],
+                      font=('Ubuntu', 8),
+                      relief=tk.FLAT, cursor='hand2',
+                      padx=8, pady=1).pack(side='left', padx=(0, 6))
+            probe_label.pack(side='left')
+
+            tk.Label(cam_frame, text='Soft limits:',
+                     font=('Ubuntu', 9),
+                     bg=self.colors['bg_light'],
+                     fg=self.colors['text_secondary'],
+                     anchor='w').grid(row=4, column=1, sticky='w', padx=5, pady=(2, 10))
+
+            limits_frame = tk.Frame(cam_frame, bg=self.colors['bg_light'])
+            limits_frame.grid(row=4, column=2, columnspan=3, padx=5, pady=(2, 10), sticky='w')
+            limits = {}
+            for label, name in (('Pan', 'pan_limits'), ('Tilt', 'tilt_limits')):
+                tk.Label(limits_frame, text=f'{label}:',
+                         font=('Ubuntu', 8),
+                         bg=self.colors['bg_light'],
+                         fg=self.colors['text_secondary']).pack(side='left', padx=(0, 3))
+                limits[name] = tk.Entry(limits_frame, width=14,
+                                        font=('Ubuntu Mono', 9),
+                                        bg=self.colors['bg_dark'],
+                                        fg=self.colors['text_primary'],
+                                        insertbackground=self.colors['text_primary'],
+                                        relief=tk.FLAT,
+                                        highlightbackground=self.colors['border'],
+                                        highlightthickness=1)
+                limits[name].insert(0, configs[i][name])
+                limits[name].pack(side='left', padx=(0, 10))
+            tk.Label(limits_frame, text='min..max from the position readout, blank for none',
+                     font=('Ubuntu', 8),
+                     bg=self.colors['bg_light'],
+                     fg=self.colors['text_secondary']).pack(side='left')
+            limit_entries.append(limits)
+
+        for i in range(len(configs)):
+            add_row(i)
+
+        # A camera added here only joins the wall on Connect
+        def add_camera():
+            configs.append(self.new_camera_config())
+            add_row(len(configs) - 1)
+
+        tk.Button(button_frame,
+                  text='＋ Add Camera',
+                  command=add_camera,
+                  bg=self.colors['bg_light'],
+                  fg=self.colors['text_primary'],
+                  font=('Ubuntu', 10),
+                  relief=tk.FLAT, cursor='hand2',
+                  padx=30, pady=12).pack(side='left', padx=10)
 
         tk.Button(button_frame,
                   text='⚡ CONNECT & START',
-                  command=lambda: self.connect_and_close(ip_entries, rtsp_entries),
+                  command=lambda: self.connect_and_close(ip_entries, rtsp_entries,
+                                                         preview_entries, fps_vars,
+                                                         decoder_vars, limit_entries),
                   bg=self.colors['accent'],
                   fg=self.colors['text_primary'],
                   font=('Ubuntu', 11, 'bold'),
@@ -317,10 +2178,33 @@ class PTZApp:
                   relief=tk.FLAT, cursor='hand2',
                   padx=30, pady=12).pack(side='left', padx=10)
 
-    def connect_and_close(self, ip_entries, rtsp_entries):
-        for i in range(8):
+    def connect_and_close(self, ip_entries, rtsp_entries, preview_entries, fps_vars,
+                          decoder_vars, limit_entries):
+        for i in range(len(ip_entries)):
+            for name, entry in limit_entries[i].items():
+                try:
+                    parse_limits(entry.get())
+                except ValueError:
+                    messagebox.showerror('Invalid Soft Limit',
+                        f"CAM {i + 1}: {name.split('_')[0]} limits must be min..max "
+                        f"(e.g. -1200..1200) or blank.", parent=self.config_window)
+                    return
+        added = len(ip_entries) - len(self.camera_configs)
+        for _ in range(added):
+            self.camera_configs.append(self.new_camera_config())
+            self.build_tile(f'F{len(self.camera_configs)}')
+        if added:
+            self.apply_layout()
+        for i in range(len(ip_entries)):
             self.camera_configs[i]['ip'] = ip_entries[i].get().strip()
             self.camera_configs[i]['rtsp'] = rtsp_entries[i].get().strip()
+            self.camera_configs[i]['preview'] = preview_entries[i].get().strip()
+            self.camera_configs[i]['max_fps'] = fps_vars[i].get()
+            for name, var in decoder_vars[i].items():
+                self.camera_configs[i][name] = var.get()
+            for name, entry in limit_entries[i].items():
+                self.camera_configs[i][name] = entry.get().strip()
+        self.save_camera_config()
         self.connect_cameras()
         if self.config_window:
             self.config_window.destroy()
@@ -332,76 +2216,197 @@ class PTZApp:
             '• Arrow Keys: Control camera pan/tilt\n'
             '• + / =: Zoom in\n'
             '• - : Zoom out\n'
-            '• Speed Slider: Adjust movement speed\n\n'
+            '• Speed Slider: Adjust movement speed\n'
+            '• Gamepad (Settings → Gamepad Input): left stick pan/tilt,\n'
+            '  right stick zoom, faster the further it is pushed\n\n'
+            'Presets:\n'
+            '• 0-9: Recall that preset on the active camera\n'
+            '• Ctrl + 0-9: Store the active camera\'s position as that preset\n'
+            '• Alt + 0-9: Scene — recall that preset on every camera at once\n'
+            '• Ctrl + Alt + 0-9: Store that preset on every camera\n\n'
             'Camera Selection:\n'
-            '• F1-F8: Control Camera 1-8\n\n'
+            '• F1-F12: Control the 1st-12th camera on the page\n'
+            '• Click a tile: Control that camera\n'
+            '• Ctrl + F-key / Ctrl + click: Add that camera to the group driven\n'
+            '  with the active one, or take it out (F-key / click ends the group)\n'
+            '• Double-click a tile: Enlarge it (full stream) / restore grid\n\n'
+            'Layout:\n'
+            '• View → grid size; PgUp / PgDn: Previous / next page\n'
+            '• Only the cameras on screen are decoded; all stay controllable\n\n'
             'Configuration:\n'
-            '• Settings → Configure Cameras: Set IP and RTSP URLs')
+            '• Settings → Configure Cameras: Set IP, RTSP and preview URLs, add cameras\n'
+            '• Soft limits (pan / tilt min..max): a drive stops at that position\n'
+            '• View → Position Readout: Pan, tilt and zoom on each tile')
 
     # ── Connect ───────────────────────────────────────────────────────────
 
     def connect_cameras(self):
-        self.running = False
-        time.sleep(0.3)
-
-        for cap in self.video_caps.values():
-            cap.release()
+        # Connector and decode threads must find the libraries loaded
+        preload_modules()
+        self.stop_decoder()
+        for dispatcher in self.dispatchers.values():
+            dispatcher.stop()
 
         self.cameras.clear()
-        self.video_caps.clear()
-        self.video_frames.clear()
+        self.dispatchers.clear()
+        self.movement.reset()
+        for job in self.release_jobs.values():
+            self.root.after_cancel(job)
+        self.release_jobs.clear()
+        self.active_cam = None
+        self.active_ptz = None
+        self.group      = []
+        self.rendered_seqs.clear()
+        self.latency_totals.clear()
+        self.stream_states.clear()
+        self.blit_ms.clear()
+        self.display_ms.clear()
+        self.render_gaps.clear()
+        for key in self.tile_info_labels:
+            self.set_tile_info(key, '')
+            self.tile_position_labels[key].place_forget()
+        self.position_texts.clear()
         self.pressed_keys.clear()
+        self.update_active_camera_display()
 
-        for i in range(8):
+        ips     = {}
+        streams = {}
+        for i in range(len(self.camera_configs)):
             ip   = self.camera_configs[i]['ip']
-            rtsp = self.camera_configs[i]['rtsp']
+            rtsp = self.stream_url(f'F{i + 1}')
             key  = f'F{i + 1}'
 
             if ip:
-                try:
-                    self.cameras[key] = Camera(ip)
-                except Exception:
-                    pass
+                ips[key] = ip
 
+            # Streams are opened by the decoder's workers, off the Tk thread
             if rtsp:
-                cap = cv2.VideoCapture(rtsp, cv2.CAP_FFMPEG)
-                cap.set(cv2.CAP_PROP_BUFFERSIZE, 2)
-                if not cap.isOpened():
-                    print(f'{key} failed to open stream')
-                else:
-                    print(f'{key} stream connected')
-                self.video_caps[key] = cap
-                self.video_frames[key] = None
+                streams[key] = dict(self.stream_target(key),
+                                    low_latency=self.low_latency.get(),
+                                    timeout_ms=self.connect_timeout_ms)
 
-        if not self.cameras:
+        if not ips:
             messagebox.showwarning('No Cameras',
                 'Please configure at least one camera IP address.\n\n'
                 'Go to Settings → Configure Cameras to add camera configurations.')
             return
 
-        self.active_name = list(self.cameras.keys())[0]
-        self.active_cam  = self.cameras[self.active_name]
-
-        self.update_active_camera_display()
-        self.status_indicator.config(fg=self.colors['success'])
-        self.status_label.config(
-            text=f'Connected • Controlling {self.active_name}',
-            fg=self.colors['success'])
-
-        self.running = True
-
-        for key in self.video_caps:
-            threading.Thread(target=self.capture_loop,
-                             args=(key,), daemon=True).start()
-
+        # Every camera connects at once; each becomes controllable as soon as
+        # it is ready, so one unreachable address cannot hold up the rest.
+        self.connect_generation += 1
+        self.connect_pending = len(ips)
+        for key, ip in ips.items():
+            threading.Thread(target=self._connect_camera,
+                             args=(self.connect_generation, key, ip),
+                             daemon=True).start()
+        self.status_indicator.config(fg=self.colors['warning'])
+        self.status_label.config(text=f'Connecting • 0/{len(ips)} cameras ready',
+                                 fg=self.colors['warning'])
+
+        if self.decode_mode == 'process':
+            capacity = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+            self.decoder = ProcessDecoder(self.decode_workers, capacity,
+                                          {key: self.frame_capacity(key, capacity)
+                                           for key in streams})
+        else:
+            self.decoder = ThreadDecoder()
+        self.decoder.start(streams)
+        self.stream_targets = {key: self.stream_target(key) for key in streams}
+
+        # Reconnecting must not stack a second render loop on top of the first
+        if self.video_job is not None:
+            self.root.after_cancel(self.video_job)
         self.update_video()
 
         # Return focus to the main window so keyboard bindings fire immediately
         self.root.focus_set()
 
+    def _connect_camera(self, generation, key, ip):
+        try:
+            camera = open_camera(ip)
+        except Exception as exc:
+            print(f'{key} failed to connect to {ip}: {exc}')
+            camera = None
+        self.connect_results.put((generation, key, camera))
+
+    # Called from the render loop: adopts cameras as their connectors finish.
+    def poll_connections(self):
+        while True:
+            try:
+                generation, key, camera = self.connect_results.get_nowait()
+            except queue.Empty:
+                return
+            if generation != self.connect_generation:
+                if camera is not None:
+                    camera.close_connection()
+                continue
+            self.connect_pending -= 1
+            if camera is not None:
+                self.cameras[key]     = camera
+                self.dispatchers[key] = CommandDispatcher(key, camera, self.position_poll,
+                                                          self.soft_limits(key))
+                if self.restore_positions.get():
+                    self.return_to_last_position(key)
+                if self.active_cam is None:
+                    self.select_camera(key)
+            self.update_connection_status()
+
+    def update_connection_status(self):
+        ready = len(self.cameras)
+        total = ready + self.connect_pending
+        if self.connect_pending:
+            text, color = f'Connecting • {ready}/{total} cameras ready', 'warning'
+            if self.active_cam is not None:
+                text = f"Controlling {' + '.join(self.driven_keys())} • {ready}/{total} cameras ready"
+        elif self.active_cam is not None:
+            text, color = f"Connected • Controlling {' + '.join(self.driven_keys())}", 'success'
+        else:
+            text, color = 'No cameras reachable', 'accent'
+        self.status_indicator.config(fg=self.colors[color])
+        self.status_label.config(text=text, fg=self.colors[color])
+
+    # Selecting one camera ends any group
+    def select_camera(self, cam_key):
+        self.active_cam  = self.cameras[cam_key]
+        self.active_ptz  = self.dispatchers[cam_key]
+        self.active_name = cam_key
+        self.group       = []
+        self.update_active_camera_display()
+        self.update_connection_status()
+        # Held keys now drive the new camera; the old one is stopped
+        self.update_movement()
+
+    # Adds a camera to the group driven with the active one, or takes it out
+    def toggle_group(self, key):
+        if self.active_cam is None:
+            self.select_camera(key)
+            return
+        if key == self.active_name:
+            return
+        if key in self.group:
+            self.group.remove(key)
+        else:
+            self.group.append(key)
+        self.update_active_camera_display()
+        self.update_connection_status()
+        self.update_movement()
+
+    # The active camera first, then the rest of the group in the order added
+    def driven_keys(self):
+        return [self.active_name] + self.group
+
     # ── Keyboard (tkinter bind_all — no external libs, no compilation) ────
     # Captures all keypresses inside the app window regardless of which
-    # widget is focused. Arrow keys / F1-F8 / +/- all work here.
+    # widget is focused. Arrow keys / F1-F12 / +/- / PgUp / PgDn all work here.
+
+    MOVEMENT_KEYS       = ('up', 'down', 'left', 'right', 'zoom_in', 'zoom_out')
+    ZOOM_SPEED          = 4
+    MAX_ZOOM_SPEED      = 7     # full stick deflection
+    AUTOREPEAT_GRACE_MS = 15
+    # Modifier bits of event.state: Ctrl stores a preset or, with an F-key,
+    # groups cameras; Alt makes a preset a scene
+    CONTROL_MASK        = 0x4
+    ALT_MASK            = 0x8
 
     # Tkinter keysym → normalised name used by movement logic
     _KEYSYM_MAP = {
@@ -417,109 +2422,736 @@ class PTZApp:
         'F6':          'f6',
         'F7':          'f7',
         'F8':          'f8',
+        'F9':          'f9',
+        'F10':         'f10',
+        'F11':         'f11',
+        'F12':         'f12',
+        'Prior':       'page_prev',  # Page Up
+        'Next':        'page_next',  # Page Down
         'plus':        'zoom_in',
         'equal':       'zoom_in',   # '=' is the same physical key as '+' (unshifted)
         'KP_Add':      'zoom_in',   # numpad +
         'minus':       'zoom_out',
         'KP_Subtract': 'zoom_out',  # numpad -
     }
+    # Digits, on the main row or the keypad, are presets 0-9
+    _KEYSYM_MAP.update({f'{prefix}{n}': f'preset{n}' for prefix in ('', 'KP_') for n in range(10)})
 
     def _on_key_press(self, event):
-        if not self.active_cam:
-            return
         name = self._KEYSYM_MAP.get(event.keysym)
-        if name is None:
+        # Paging only changes what is shown, so it works before any camera
+        # is controllable
+        if name in ('page_prev', 'page_next'):
+            self.show_page(self.page + (1 if name == 'page_next' else -1))
+            return
+        if not self.active_cam or name is None:
+            return
+
+        # X11 auto-repeat arrives as release+press pairs: a press that finds
+        # its own release still pending is a repeat, not a new key-down.
+        job = self.release_jobs.pop(name, None)
+        if job is not None:
+            self.root.after_cancel(job)
             return
 
-        if name in ('up', 'down', 'left', 'right'):
+        if name in self.MOVEMENT_KEYS:
             if name not in self.pressed_keys:
                 self.pressed_keys.add(name)
                 self.update_movement()
 
-        elif name == 'zoom_in':
-            if 'zoom_in' not in self.pressed_keys:
-                self.pressed_keys.add('zoom_in')
-                self.active_cam.zoom(4)
-
-        elif name == 'zoom_out':
-            if 'zoom_out' not in self.pressed_keys:
-                self.pressed_keys.add('zoom_out')
-                self.active_cam.zoom(-4)
+        elif name.startswith('preset'):
+            # Digits typed into the config dialog are not preset keys
+            if not self._typing(event):
+                self.preset(int(name[6:]), save=bool(event.state & self.CONTROL_MASK),
+                            scene=bool(event.state & self.ALT_MASK))
 
         elif name.startswith('f'):
-            cam_key = f'F{name[1:]}'
-            if cam_key in self.cameras:
-                self.active_cam  = self.cameras[cam_key]
-                self.active_name = cam_key
-                self.update_active_camera_display()
-                self.status_label.config(text=f'Connected • Controlling {cam_key}')
+            # F-keys address the tiles of the current page in order
+            page_keys = self.page_keys()
+            index     = int(name[1:]) - 1
+            if index < len(page_keys) and page_keys[index] in self.cameras:
+                if event.state & self.CONTROL_MASK:
+                    self.toggle_group(page_keys[index])
+                else:
+                    self.select_camera(page_keys[index])
 
     def _on_key_release(self, event):
         if not self.active_cam:
             return
         name = self._KEYSYM_MAP.get(event.keysym)
-        if name is None:
-            return
-
-        if name in ('up', 'down', 'left', 'right'):
+        # Preset keys too, so that holding one down does not repeat it
+        if name in self.MOVEMENT_KEYS or (name or '').startswith('preset'):
+            self.release_jobs[name] = self.root.after(
+                self.AUTOREPEAT_GRACE_MS, self._release_key, name)
+
+    def _release_key(self, name):
+        self.release_jobs.pop(name, None)
+        if name in self.MOVEMENT_KEYS:
             self.pressed_keys.discard(name)
-            if self.pressed_keys - {'zoom_in', 'zoom_out'}:
-                self.update_movement()
-            else:
-                self.active_cam.pantilt(0, 0)
+            self.update_movement()
 
-        elif name in ('zoom_in', 'zoom_out'):
-            self.pressed_keys.discard(name)
-            self.active_cam.zoom(0)
+    @staticmethod
+    def _typing(event):
+        widget = getattr(event, 'widget', None)
+        return hasattr(widget, 'winfo_class') and widget.winfo_class() in ('Entry', 'Spinbox')
 
     # ── Video capture ─────────────────────────────────────────────────────
 
-    def capture_loop(self, key):
-        cap = self.video_caps[key]
-        while self.running:
-            if not cap.isOpened():
-                time.sleep(1)
-                continue
-            ret, frame = cap.read()
-            if not ret:
-                time.sleep(0.2)
-                continue
-            self.video_frames[key] = frame
-            time.sleep(0.01)
+    # Runs probe_process_main in a process of its own, so the measurement
+    # only counts the probe, and calls done(best) on the Tk thread
+    def run_probe(self, url, target_fps, transport, done):
+        context = multiprocessing.get_context('spawn')
+        results = context.Queue()
+        process = context.Process(target=probe_process_main,
+                                  args=(url, target_fps, transport, results),
+                                  daemon=True)
+        process.start()
+
+        def poll():
+            while True:
+                try:
+                    kind, value = results.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == 'done':
+                    process.join(timeout=1)
+                    done(value)
+                    return
+                cpu = f"{value['cpu_pct']:.0f}% CPU" if value['cpu_pct'] is not None else 'failed'
+                print(f"probe {describe_decoder_options(value['options'])}: "
+                      f"{value['fps']:.1f} fps, {cpu}")
+            if process.exitcode is not None and results.empty():
+                done(None)
+                return
+            self.root.after(250, poll)
+
+        self.root.after(250, poll)
+
+    # Imports the heavy modules one per idle callback, so the painted window
+    # keeps handling events between them, then connects if asked to
+    def load_libraries(self, pending, connect):
+        if pending:
+            pending.pop(0).load()
+            self.root.after_idle(self.load_libraries, pending, connect)
+            return
+        self.startup.mark('libraries')
+        if connect:
+            self.connect_cameras()
+
+    # Prints the startup report once it is complete (or STARTUP_REPORT_S
+    # after launch, without the milestones that were not reached)
+    def report_startup(self):
+        if not self.startup.complete() and time.perf_counter() - STARTED < STARTUP_REPORT_S:
+            self.root.after(100, self.report_startup)
+            return
+        print(f'Startup: {self.startup.text()}')
+        if self.exit_after_startup:
+            self.root.quit()
+
+    def stop_decoder(self):
+        if self.decoder is not None:
+            self.decoder.stop()
+            self.decoder = None
+        self.budget_caps = {}
+        self.render_budget.reset()
+
+    def apply_low_latency(self):
+        for key in (self.decoder.keys() if self.decoder else ()):
+            self.decoder.update(key, low_latency=self.low_latency.get())
 
     # ── Speed ─────────────────────────────────────────────────────────────
 
     def update_speed(self, value):
         self.move_speed = int(float(value))
         self.speed_value_label.config(text=str(self.move_speed))
+        if self.pressed_keys:
+            self.update_movement()
+
+    # ── Gamepad ───────────────────────────────────────────────────────────
+
+    def apply_gamepad(self):
+        if self.use_gamepad.get() and self.gamepad is None:
+            try:
+                evdev.load()
+            except ImportError:
+                self.use_gamepad.set(False)
+                messagebox.showerror('Gamepad Input',
+                                     'Gamepad input needs the evdev package:\n'
+                                     'pip install evdev')
+                return
+            self.gamepad = GamepadReader(self.gamepad_path)
+            self.gamepad_job = self.root.after(GAMEPAD_POLL_MS, self.poll_gamepad)
+        elif not self.use_gamepad.get() and self.gamepad is not None:
+            self.gamepad.stop()
+            self.gamepad = None
+            self.root.after_cancel(self.gamepad_job)
+            self.gamepad_vector = MovementController.IDLE
+            self.update_movement()
+        self.gamepad_name = None
+        self.update_gamepad_status()
+
+    def update_gamepad_status(self):
+        if self.gamepad is None:
+            text = ''
+        elif self.gamepad_name:
+            text = f'Gamepad: {self.gamepad_name}'
+        else:
+            text = 'Gamepad: none found'
+        self.gamepad_label.config(text=text)
+
+    # Samples the sticks; the top pan/tilt speed follows the speed slider.
+    # Only a change of a whole speed step reaches update_movement().
+    def poll_gamepad(self):
+        axes   = self.gamepad.axes
+        speed  = lambda axis, top: axis_speed(
+            shape_axis(axes[axis], self.gamepad_deadzone, self.gamepad_curve), top)
+        vector = (speed('pan', self.move_speed), speed('tilt', self.move_speed),
+                  speed('zoom', self.MAX_ZOOM_SPEED))
+        if vector != self.gamepad_vector:
+            self.gamepad_vector = vector
+            self.update_movement()
+        # The reader thread finds and loses the pad; the status bar follows
+        if self.gamepad.name != self.gamepad_name:
+            self.gamepad_name = self.gamepad.name
+            self.update_gamepad_status()
+        self.gamepad_job = self.root.after(GAMEPAD_POLL_MS, self.poll_gamepad)
+
+    # ── Streams ───────────────────────────────────────────────────────────
+
+    def new_camera_config(self):
+        return {'ip': '', 'rtsp': '', 'preview': '', 'max_fps': 'Source',
+                'threads': 'Auto', 'transport': 'TCP', 'keyframes': 'Never',
+                'low_delay': False, 'pan_limits': '', 'tilt_limits': ''}
+
+    # A saved camera config with unknown fields dropped and missing or
+    # invalid ones at their defaults
+    def restore_camera_config(self, saved):
+        cfg = self.new_camera_config()
+        if not isinstance(saved, dict):
+            return cfg
+        for name, default in cfg.items():
+            value   = saved.get(name, default)
+            choices = self.CONFIG_CHOICES.get(name)
+            if type(value) is type(default) and (choices is None or value in choices):
+                cfg[name] = value
+        return cfg
+
+    # Only the stream info and positions of URLs and IPs still configured are kept
+    def save_camera_config(self):
+        if not self.config_path:
+            return
+        urls = {cfg[name] for cfg in self.camera_configs for name in ('rtsp', 'preview')}
+        ips  = {cfg['ip'] for cfg in self.camera_configs}
+        data = {'version':   CONFIG_VERSION,
+                'cameras':   self.camera_configs,
+                'streams':   {url: info for url, info in self.stream_info.items()
+                              if url in urls},
+                'positions': {ip: list(position) for ip, position in self.positions.items()
+                              if ip in ips}}
+        try:
+            save_config(self.config_path, data)
+        except OSError as exc:
+            print(f'Could not save the camera configuration to {self.config_path}: {exc}')
+
+    # Picks up the capture_info() of newly opened streams; saved when it
+    # changed, so the next start knows each stream before it opens.
+    def update_stream_info(self):
+        changed = False
+        for key in self.decoder.keys():
+            source = dict(self.decoder.stats(key).get('source') or {})
+            url    = source.pop('url', None)
+            if url and self.stream_info.get(url) != source:
+                self.stream_info[url] = source
+                changed = True
+        if changed:
+            self.save_camera_config()
+
+    # '1920×1080 • H264 • 25 fps' as last seen on the stream the tile decodes
+    def stream_info_text(self, key):
+        info = self.stream_info.get(self.stream_url(key))
+        if not info or not info.get('width'):
+            return ''
+        parts = [f"{info['width']}×{info['height']}", info.get('codec')]
+        if info.get('fps'):
+            parts.append(f"{info['fps']:g} fps")
+        return ' • '.join(part for part in parts if part)
+
+    # Largest picture a stream can deliver on a screen: the cached resolution
+    # of each URL it may decode, fitted to the screen (the screen if unknown)
+    def frame_capacity(self, key, screen):
+        cfg   = self.config_for(key)
+        sizes = []
+        for url in {cfg['rtsp'], cfg['preview']} - {''}:
+            info = self.stream_info.get(url) or {}
+            if not info.get('width') or not info.get('height'):
+                return screen
+            sizes.append(fit_size(info['width'], info['height'], *screen))
+        return (max(w for w, _ in sizes), max(h for _, h in sizes)) if sizes else screen
+
+    def config_for(self, key):
+        return self.camera_configs[int(key[1:]) - 1]
+
+    def camera_keys(self):
+        return [f'F{i + 1}' for i in range(len(self.camera_configs))]
+
+    def page_keys(self):
+        keys = self.camera_keys()
+        return [keys[index] for index, _, _ in
+                self.layout.cells(len(keys), self.page)]
+
+    # Grid tiles decode the preview substream when one is configured; the
+    # full stream is only pulled while the tile is enlarged or in focus.
+    def stream_url(self, key):
+        cfg = self.config_for(key)
+        if key in (self.enlarged_key, self.focused_key()) and cfg['rtsp']:
+            return cfg['rtsp']
+        return cfg['preview'] or cfg['rtsp']
+
+    def is_thumbnail(self, key):
+        return (self.enlarged_key is None and key in self.visible_keys
+                and self.focused_key() not in (None, key))
+
+    # Frame-rate ceiling of a stream before the render budget: the camera's
+    # own cap and, for focus-mode thumbnails, thumbnail_fps (0: none)
+    def fps_ceiling(self, key):
+        caps = [FPS_CAPS[self.config_for(key)['max_fps']]]
+        if self.is_thumbnail(key):
+            caps.append(self.thumbnail_fps)
+        caps = [cap for cap in caps if cap]
+        return min(caps) if caps else 0
+
+    # open_capture keywords for the camera's stream as it is shown now
+    def decoder_options(self, key):
+        cfg = self.config_for(key)
+        return {'threads':        DECODER_THREADS[cfg['threads']],
+                'transport':      TRANSPORTS[cfg['transport']],
+                'low_delay':      cfg['low_delay'],
+                'keyframes_only': cfg['keyframes'] == 'Always' or
+                                  (cfg['keyframes'] == 'Thumbnails' and self.is_thumbnail(key))}
+
+    # What a stream should deliver: decoder spec fields, also sent as updates
+    def stream_target(self, key):
+        caps = [cap for cap in (self.fps_ceiling(key), self.budget_caps.get(key)) if cap]
+        return {'visible': key in self.visible_keys,
+                'url':     self.stream_url(key),
+                'size':    self.tile_sizes[key],
+                'max_fps': min(caps) if caps else 0,
+                'decoder_options': self.decoder_options(key)}
+
+    # Tells the decoder what each stream should deliver, sending only what
+    # changed since the last call (stream_targets caches what was sent).
+    def update_stream_targets(self):
+        for key in (self.decoder.keys() if self.decoder else ()):
+            target  = self.stream_target(key)
+            sent    = self.stream_targets.get(key, {})
+            changes = {name: value for name, value in target.items()
+                       if sent.get(name) != value}
+            if changes:
+                self.decoder.update(key, **changes)
+                self.stream_targets[key] = dict(sent, **changes)
+
+    def toggle_enlarged(self, key):
+        self.enlarged_key = None if self.enlarged_key == key else key
+        self.apply_layout()
+
+    def on_tile_click(self, key, add=False):
+        if key in self.cameras:
+            if add:
+                self.toggle_group(key)
+            else:
+                self.select_camera(key)
+
+    def apply_layout_choice(self):
+        # Stay on the page that holds the first camera shown so far
+        first       = self.page * self.layout.per_page
+        self.layout = GridLayout.parse(self.layout_var.get())
+        self.page   = self.layout.page_of(first)
+        self.apply_layout()
+
+    def show_page(self, page):
+        pages = self.layout.page_count(len(self.camera_configs))
+        if not 0 <= page < pages:
+            return
+        self.page         = page
+        self.enlarged_key = None
+        self.apply_layout()
+
+    # ── Layout ────────────────────────────────────────────────────────────
+    # Places the tiles of the current page (or the enlarged tile over the
+    # whole grid) and hides the rest. Hidden tiles keep their widgets but no
+    # surface, and their streams are paused, so a page of a large installation
+    # costs the same as a small one. PTZ control does not depend on the page.
+    #
+    # Tiles split the grid area the window actually has (from <Configure>),
+    # and pictures are sized to the inside of the tile border, so decoders
+    # resize to exactly the pixels that end up on screen.
+    #
+    # In focus mode the active camera takes most of the area, from its full
+    # stream, and the rest of the page become thumbnails capped at
+    # thumbnail_fps. The focused tile is listed first in visible_keys, so the
+    # renderer also draws it first.
+
+    RESIZE_SETTLE_MS = 150
+
+    def on_grid_resize(self, event):
+        area = (event.width, event.height)
+        if area == self.grid_area:
+            return
+        self.grid_area = area
+        # A window drag sends a stream of these; re-layout once it settles
+        if self.resize_job is not None:
+            self.root.after_cancel(self.resize_job)
+        self.resize_job = self.root.after(self.RESIZE_SETTLE_MS, self._apply_resize)
+
+    def _apply_resize(self):
+        self.resize_job = None
+        self.apply_layout()
+
+    def picture_size(self, cell):
+        return cell[0] - 2 * TILE_BORDER, cell[1] - 2 * TILE_BORDER
+
+    # The camera being steered, or the first of the page before any is
+    def focused_key(self):
+        if not self.focus_mode.get():
+            return None
+        if self.active_name in self.video_labels:
+            return self.active_name
+        page_keys = self.page_keys()
+        return page_keys[0] if page_keys else None
+
+    # (x, y, width, height) of every tile on screen, in drawing order
+    def tile_frames(self):
+        width, height = self.grid_area
+        if self.enlarged_key is not None:
+            return {self.enlarged_key: (0, 0, width, height)}
+        focus = self.focused_key()
+        if focus is not None:
+            others = [key for key in self.page_keys() if key != focus]
+            main, thumbs = focus_frames(width, height, len(others))
+            return dict([(focus, main)] + list(zip(others, thumbs)))
+        keys = self.camera_keys()
+        return {keys[index]: frame for index, frame in
+                self.layout.frames(len(keys), self.page, width, height)}
+
+    def apply_layout(self):
+        keys      = self.camera_keys()
+        self.page = min(self.page, self.layout.page_count(len(keys)) - 1)
+        frames    = self.tile_frames()
+        cell      = self.picture_size(self.layout.tile_size(*self.grid_area))
+
+        for key in keys:
+            container = self.video_labels[key].master
+            if key not in frames:
+                container.place_forget()
+                self.tile_stats_labels[key].place_forget()
+                self.tile_surfaces.pop(key, None)
+                self.rendered_seqs.pop(key, None)
+                self.tile_sizes[key] = cell
+                continue
+            x, y, width, height = frames[key]
+            container.place(x=x, y=y, width=width, height=height)
+            size = self.picture_size((width, height))
+            if self.tile_sizes.get(key) != size or key not in self.tile_surfaces:
+                self.tile_sizes[key] = size
+                self.tile_surfaces[key] = TileSurface(self.video_labels[key], *size)
+                self.rendered_seqs.pop(key, None)
+                # Shows the stream state until the first frame at this size
+                self.video_labels[key].config(image='')
+                self.stream_states.pop(key, None)
+
+        self.visible_keys = list(frames)
+        self.update_stream_targets()
+
+        pages = self.layout.page_count(len(keys))
+        focus = ' • focus' if self.focus_mode.get() else ''
+        self.page_label.config(
+            text=f"Page {self.page + 1}/{pages} • {str(self.layout).replace('x', '×')} • "
+                 f'{len(keys)} cameras{focus}')
 
     # ── UI helpers ────────────────────────────────────────────────────────
 
     def update_active_camera_display(self):
         for key, label in self.camera_name_labels.items():
-            color     = '#00ff00' if key == self.active_name else '#ffffff'
-            thickness = 2         if key == self.active_name else 1
+            color     = ('#00ff00' if key == self.active_name else
+                         self.colors['warning'] if key in self.group else '#ffffff')
+            thickness = 2 if key == self.active_name or key in self.group else 1
             label.master.config(highlightbackground=color,
                                  highlightthickness=thickness)
+        # The focused tile follows the active camera
+        if self.focus_mode.get():
+            self.apply_layout()
 
     def update_video(self):
-        for key, frame in self.video_frames.items():
-            if frame is None:
+        self.poll_connections()
+        decoded = self.decoder.keys() if self.decoder else ()
+        for key in self.visible_keys:
+            if key not in decoded:
                 continue
-            label            = self.video_labels[key]
-            width, height    = 465, 430
-            h, w             = frame.shape[:2]
-            scale            = min(width / w, height / h)
-            new_w, new_h     = int(w * scale), int(h * scale)
-            if new_w <= 0 or new_h <= 0:
+            state = self.decoder.state(key)
+            if state != self.stream_states.get(key):
+                self.stream_states[key] = state
+                self.show_stream_state(key, state)
+            seq, frame, captured_ns = self.decoder.latest(key)
+            previous = self.rendered_seqs.get(key)
+            if frame is None or seq == previous:
+                self.render_skipped += 1
                 continue
-            resized   = cv2.resize(frame, (new_w, new_h))
-            frame_rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
-            img       = Image.fromarray(frame_rgb)
-            imgtk     = ImageTk.PhotoImage(image=img)
-            label.imgtk = imgtk
-            label.configure(image=imgtk, text='')
-        self.root.after(30, self.update_video)
+            # Frames arrive tile-sized and RGBA from capture_loop
+            started = time.perf_counter()
+            self.tile_surfaces[key].blit(frame)
+            blit_ms = (time.perf_counter() - started) * 1000
+            # Overwritten mid-copy by a pool process: redraw next tick
+            if not self.decoder.intact(key, seq):
+                continue
+            self.rendered_seqs[key] = seq
+            self.render_drawn += 1
+            if 'first_frame' not in self.startup.marks:
+                self.startup.mark('first_frame')
+            # Decoded frames replaced before the renderer got to them
+            if previous is not None and seq > previous + 1:
+                self.render_gaps[key] = self.render_gaps.get(key, 0) + seq - previous - 1
+            # Capture-to-display: from the frame leaving the network to its
+            # pixels being handed to Tk
+            latency = (time.monotonic_ns() - captured_ns) / 1e6
+            totals  = self.latency_totals.setdefault(key, [0.0, 0])
+            totals[0] += latency
+            totals[1] += 1
+            self.blit_ms.setdefault(key, RollingHistogram()).add(blit_ms)
+            self.display_ms.setdefault(key, RollingHistogram()).add(latency)
+        self.update_positions()
+        self.update_render_stats()
+        self.video_job = self.root.after(30, self.update_video)
+
+    def update_render_stats(self):
+        now     = time.monotonic()
+        elapsed = now - self.render_window_start
+        if elapsed < 1.0:
+            return
+        drawn   = self.render_drawn / elapsed
+        skipped = self.render_skipped / elapsed
+        if self.decoder:
+            self.update_stream_info()
+        budget  = self.apply_render_budget()
+        self.render_stats_label.config(
+            text=f'Render: {drawn:.0f} redraws/s • {skipped:.0f} skipped/s{budget}')
+        self.render_drawn   = 0
+        self.render_skipped = 0
+        self.render_window_start = now
+        for key, totals in self.latency_totals.items():
+            if totals[1]:
+                self.set_tile_info(key, f'{key} • {totals[0] / totals[1]:.0f} ms')
+            totals[0], totals[1] = 0.0, 0
+        if self.active_ptz is not None:
+            rtt = self.active_ptz.take_rtt()
+            rtt = f'{rtt:.0f} ms' if rtt is not None else '—'
+            self.ptz_stats_label.config(
+                text=f'PTZ {self.active_name}: queue {self.active_ptz.depth()} • '
+                     f'rtt {rtt} • {self.active_ptz.coalesced} coalesced • '
+                     f'{self.movement.suppressed} repeats suppressed')
+        if self.show_stats.get() or self.stats_file:
+            snapshot = self.stats_snapshot()
+            if self.show_stats.get():
+                self.update_stats_overlay(snapshot)
+            if self.stats_file:
+                self.write_stats_file(snapshot)
+
+    # Position readouts for the tiles on screen, from the dispatchers' caches.
+    # A camera's position is remembered whenever it settles, and saved at
+    # most once per POSITION_SAVE_MS rather than on the video tick.
+    POSITION_SAVE_MS = 5000
+
+    def update_positions(self):
+        changed = False
+        for key, dispatcher in self.dispatchers.items():
+            position = dispatcher.position
+            if position is None:
+                continue
+            ip = self.config_for(key)['ip']
+            if dispatcher.settled and self.positions.get(ip) != position:
+                self.positions[ip] = position
+                changed = True
+            text = ''
+            if key in self.visible_keys and self.show_positions.get():
+                pan, tilt, zoom = position
+                text = f'P {pan} T {tilt} Z {zoom * 100 // ZOOM_RANGE}%'
+            if self.position_texts.get(key) != text:
+                self.position_texts[key] = text
+                label = self.tile_position_labels[key]
+                if text:
+                    label.config(text=text)
+                    label.place(relx=1.0, x=-4, y=4, anchor='ne')
+                else:
+                    label.place_forget()
+        if changed and self.position_save_job is None:
+            self.position_save_job = self.root.after(self.POSITION_SAVE_MS,
+                                                     self.save_positions)
+
+    def save_positions(self):
+        self.position_save_job = None
+        self.save_camera_config()
+
+    # Saves positions still waiting on POSITION_SAVE_MS (at exit)
+    def flush_positions(self):
+        if self.position_save_job is not None:
+            self.save_positions()
+
+    # Sends cameras back to where they last settled. The positions are known
+    # from the cache, so nothing waits on an inquiry.
+    def return_to_last_position(self, *keys):
+        for key in keys:
+            position = self.positions.get(self.config_for(key)['ip'])
+            if position is None:
+                continue
+            pan, tilt, zoom = position
+            self.dispatchers[key].send('pantilt', PAN_SPEED_MAX, TILT_SPEED_MAX, pan, tilt)
+            self.dispatchers[key].send('zoom_to', zoom / ZOOM_RANGE, channel='zoom')
+
+    # The camera's soft limits as (pan, tilt), each (min, max) or None
+    def soft_limits(self, key):
+        limits = []
+        for name in ('pan_limits', 'tilt_limits'):
+            try:
+                limits.append(parse_limits(self.config_for(key)[name]))
+            except ValueError:
+                limits.append(None)
+        return tuple(limits)
+
+    # Re-plans the render budget from the streams' measured source rates and
+    # the CPU used since the last call; returns a status bar suffix.
+    def apply_render_budget(self):
+        if not self.decoder:
+            return ''
+        self.render_budget.measure(self.decoder.cpu_seconds())
+        cpu = self.render_budget.cpu_pct
+        cpu = f' • CPU {cpu:.0f}%' if cpu is not None else ''
+        if not self.render_budget.enabled():
+            return cpu
+        decoded = self.decoder.keys()
+        order   = sorted((key for key in self.visible_keys if key in decoded),
+                         key=lambda key: key != self.active_name)
+        demands = []
+        for key in order:
+            # Until a stream has delivered frames, its cached frame rate
+            fps     = (self.decoder.stats(key).get('source_fps') or
+                       (self.stream_info.get(self.stream_url(key)) or {}).get('fps', 0))
+            ceiling = self.fps_ceiling(key)
+            if fps:
+                demands.append((key, min(fps, ceiling) if ceiling else fps))
+        self.budget_caps = self.render_budget.caps(demands)
+        self.update_stream_targets()
+        return f'{cpu} • {len(self.budget_caps)}/{len(demands)} tiles capped by budget'
+
+    # Machine-readable view of every stage for every camera: decode side
+    # (from the capture workers), render side and PTZ command latency, plus
+    # the gamepad and its axis event count while gamepad input is on.
+    # Timings are RollingHistogram snapshots over the last 10 s.
+    def stats_snapshot(self):
+        decoded = self.decoder.keys() if self.decoder else []
+        cameras = {}
+        for key in sorted(set(decoded) | set(self.dispatchers), key=lambda k: int(k[1:])):
+            entry = {}
+            if key in decoded:
+                blit = self.blit_ms.get(key)
+                entry.update(self.decoder.stats(key))
+                # The URL may carry credentials; the stats file is not private
+                if entry.get('source'):
+                    entry['source'] = {name: value for name, value in entry['source'].items()
+                                       if name != 'url'}
+                entry['render_fps']     = round(blit.rate(), 2) if blit else 0.0
+                entry['render_dropped'] = self.render_gaps.get(key, 0)
+                entry['blit_ms']        = blit.snapshot() if blit else {'count': 0}
+                display = self.display_ms.get(key)
+                entry['display_latency_ms'] = display.snapshot() if display else {'count': 0}
+            if key in self.budget_caps:
+                entry['budget_fps'] = self.budget_caps[key]
+            if key in self.dispatchers:
+                entry['ptz'] = self.dispatchers[key].stats()
+            cameras[key] = entry
+        snapshot = {'time':        round(time.time(), 3),
+                    'decode_mode': self.decode_mode,
+                    'cpu_pct':     self.render_budget.cpu_pct,
+                    'startup_ms':  dict(self.startup.marks),
+                    'cameras':     cameras}
+        if self.gamepad is not None:
+            snapshot['gamepad'] = {'name': self.gamepad.name, 'events': self.gamepad.events}
+        return snapshot
+
+    def update_stats_overlay(self, snapshot):
+        for key, label in self.tile_stats_labels.items():
+            entry = snapshot['cameras'].get(key)
+            if not entry or not label.master.winfo_ismapped():
+                label.place_forget()
+                continue
+            p95   = {name: entry.get(name, {}).get('p95', 0)
+                     for name in ('read_ms', 'convert_ms', 'blit_ms')}
+            lines = []
+            if 'render_fps' in entry:
+                lines.append(f"{entry.get('decode_fps', 0):.0f}/{entry['render_fps']:.0f} fps "
+                             f"dec/draw • drop {entry.get('dropped', 0) + entry['render_dropped']}")
+                lines.append(f"p95 read {p95['read_ms']:.0f} • cvt {p95['convert_ms']:.1f} • "
+                             f"blit {p95['blit_ms']:.1f} ms")
+            if 'ptz' in entry:
+                lines.append(f"p95 ptz {entry['ptz']['rtt_ms'].get('p95', 0):.0f} ms • "
+                             f"{entry['ptz']['failed']} failed")
+            label.config(text='\n'.join(lines))
+            label.place(x=4, rely=1.0, y=-4, anchor='sw')
+
+    def apply_stats_overlay(self):
+        if not self.show_stats.get():
+            for label in self.tile_stats_labels.values():
+                label.place_forget()
+
+    # Written atomically so a reader never sees a half-written file
+    def write_stats_file(self, snapshot):
+        partial = f'{self.stats_file}.tmp'
+        try:
+            with open(partial, 'w') as f:
+                json.dump(snapshot, f, indent=1)
+            os.replace(partial, self.stats_file)
+        except OSError as exc:
+            print(f'Could not write stats to {self.stats_file}: {exc}')
+            self.stats_file = None
+
+    # Until a tile has shown video the state replaces its placeholder text;
+    # afterwards it goes in the overlay so the last (frozen) frame stays
+    # visible under a stale / reconnecting notice.
+    def show_stream_state(self, key, state):
+        surface = self.tile_surfaces[key]
+        if not surface.shown:
+            info = self.stream_info_text(key)
+            surface.label.config(text=f'{key}\n{self.STREAM_STATE_TEXT[state]}'
+                                      + (f'\n{info}' if info else ''))
+        elif state == 'live':
+            self.set_tile_info(key, f'{key} • live')
+        else:
+            self.set_tile_info(key, f'{key} • {self.STREAM_STATE_TEXT[state]}')
+
+    def set_tile_info(self, key, text):
+        info = self.tile_info_labels[key]
+        if not text:
+            info.place_forget()
+            return
+        info.config(text=text)
+        info.place(x=4, y=4)
+
+    # ── Presets ───────────────────────────────────────────────────────────
+    # VISCA memory presets 0-9, on the active camera (and its group) or, as a
+    # scene, on every connected camera. Each camera's dispatcher sends on its own thread, so a
+    # scene sets all cameras moving at once instead of one round trip after
+    # another.
+
+    def preset(self, number, save=False, scene=False):
+        keys   = sorted(self.dispatchers, key=lambda k: int(k[1:])) if scene else self.driven_keys()
+        method = 'save_preset' if save else 'recall_preset'
+        for key in keys:
+            dispatcher = self.dispatchers[key]
+            if not save:
+                # A drive still waiting to go out would cut the move short
+                dispatcher.cancel('pantilt', 'zoom')
+            dispatcher.send(method, number)
+            # Cameras on other pages have no tile to show it on
+            if key in self.tile_info_labels:
+                self.set_tile_info(key, f"{key} • {'stored as' if save else 'to'} preset {number}")
 
     # ── Movement ──────────────────────────────────────────────────────────
 
@@ -532,12 +3164,118 @@ class PTZApp:
         if 'right' in self.pressed_keys: pan  += self.move_speed
         if 'up'    in self.pressed_keys: tilt -= self.move_speed
         if 'down'  in self.pressed_keys: tilt += self.move_speed
-        self.active_cam.pantilt(pan, tilt)
+        zoom = 0
+        if 'zoom_in'  in self.pressed_keys: zoom += self.ZOOM_SPEED
+        if 'zoom_out' in self.pressed_keys: zoom -= self.ZOOM_SPEED
+        # A held key wins over the stick on its axis
+        stick_pan, stick_tilt, stick_zoom = self.gamepad_vector
+        pan, tilt, zoom = pan or stick_pan, tilt or stick_tilt, zoom or stick_zoom
+        self.movement.set_target([self.dispatchers[key] for key in self.driven_keys()],
+                                 pan, tilt, zoom)
 
 
 # ── Entry point ───────────────────────────────────────────────────────────
 
 if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='PTZ Camera Controller')
+    parser.add_argument('--decode-mode', choices=('thread', 'process'),
+                        default='thread',
+                        help='decode streams on threads (default) or in a '
+                             'process pool with shared-memory frame rings')
+    parser.add_argument('--decode-workers', type=int,
+                        default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help='number of decode processes in process mode')
+    parser.add_argument('--low-latency', action='store_true',
+                        help='start with low-latency capture (drop stale frames)')
+    parser.add_argument('--command-rate', type=int, default=10,
+                        help='maximum pan/tilt/zoom updates per second (default 10)')
+    parser.add_argument('--ramp-ms', type=float, default=RAMP_S * 1000,
+                        help=f'time for pan/tilt to speed up to a new speed, 0 to step '
+                             f'(default {RAMP_S * 1000:g})')
+    parser.add_argument('--stop-ramp-ms', type=float, default=STOP_RAMP_S * 1000,
+                        help=f'time for pan/tilt to slow down or stop, 0 at once '
+                             f'(default {STOP_RAMP_S * 1000:g})')
+    parser.add_argument('--connect-timeout', type=float,
+                        default=CONNECT_TIMEOUT_MS / 1000,
+                        help='seconds to wait for a stream to open or deliver '
+                             'a frame (default 5)')
+    parser.add_argument('--stats-overlay', action='store_true',
+                        help='start with the per-tile pipeline stats overlay shown')
+    parser.add_argument('--stats-file', metavar='PATH',
+                        help='write a JSON stats snapshot to PATH once a second')
+    parser.add_argument('--layout', type=GridLayout.parse, default=GridLayout(4, 2),
+                        metavar='COLSxROWS',
+                        help='tiles per page, e.g. 4x4 (default 4x2); further '
+                             'cameras go on more pages')
+    parser.add_argument('--cameras', type=int, default=8,
+                        help='number of camera slots (default 8; more can be '
+                             'added in Configure Cameras)')
+    parser.add_argument('--focus', action='store_true',
+                        help='start in focus mode: the active camera large, the '
+                             'rest of the page as thumbnails')
+    parser.add_argument('--thumbnail-fps', type=float, default=2,
+                        help='frame rate of the thumbnails in focus mode (default 2)')
+    parser.add_argument('--frame-budget', type=float, default=0, metavar='FPS',
+                        help='frames per second decoded and drawn across all tiles; '
+                             'background tiles are slowed first (default: no limit)')
+    parser.add_argument('--probe', metavar='URL',
+                        help='benchmark the decoder options on a stream, print the '
+                             'cheapest that reaches --target-fps and exit')
+    parser.add_argument('--target-fps', type=float, default=PROBE_TARGET_FPS,
+                        help=f'frame rate --probe must reach (default {PROBE_TARGET_FPS})')
+    parser.add_argument('--cpu-budget', type=float, default=0, metavar='PERCENT',
+                        help='CPU use to stay under, in %% of one core; tile frame '
+                             'rates back off while it is exceeded (default: no limit)')
+    parser.add_argument('--config', metavar='PATH', default=CONFIG_PATH,
+                        help=f'camera configuration file, loaded at startup and saved '
+                             f'on connect (default {CONFIG_PATH})')
+    parser.add_argument('--no-connect', action='store_true',
+                        help='do not connect to the saved cameras on startup')
+    parser.add_argument('--position-poll', type=float, default=POSITION_POLL_S, metavar='SECONDS',
+                        help=f'ask each still camera for its position this often, 0 never '
+                             f'(default {POSITION_POLL_S:g}; faster while it moves)')
+    parser.add_argument('--restore-positions', action='store_true',
+                        help='send each camera back to its last saved position on connect')
+    parser.add_argument('--gamepad', nargs='?', const='', metavar='DEVICE',
+                        help='drive the cameras with a gamepad\'s analog sticks (needs '
+                             'evdev); DEVICE is an /dev/input/event* path, default the '
+                             'first gamepad found')
+    parser.add_argument('--gamepad-deadzone', type=float, default=GAMEPAD_DEADZONE,
+                        metavar='FRACTION',
+                        help=f'stick deflection read as centred (default {GAMEPAD_DEADZONE:g})')
+    parser.add_argument('--gamepad-curve', type=float, default=GAMEPAD_CURVE, metavar='EXPONENT',
+                        help=f'response curve: 1 linear, higher for finer control near '
+                             f'the centre (default {GAMEPAD_CURVE:g})')
+    parser.add_argument('--startup-report', action='store_true',
+                        help='exit once the startup report is printed (window, '
+                             'interface, libraries and, if connecting, first frame)')
+    args = parser.parse_args()
+
+    if args.probe:
+        print(f'Probing {args.probe} for {args.target_fps:g} fps, '
+              f'{PROBE_SECONDS:g} s per candidate\n')
+        best, _ = probe_decoder_options(
+            args.probe, args.target_fps,
+            report=lambda r: print(f"  {describe_decoder_options(r['options']):34}"
+                                   f"{r['fps']:6.1f} fps  {r['cpu_pct'] or 0:5.1f}% CPU"))
+        if best is None:
+            raise SystemExit('No candidate delivered any frames')
+        print(f"\nCheapest reaching {args.target_fps:g} fps (or fastest): "
+              f"{describe_decoder_options(best['options'])}")
+        raise SystemExit(0)
+
     root = tk.Tk()
-    app  = PTZApp(root)
+    app  = PTZApp(root, args.decode_mode, args.decode_workers, args.low_latency,
+                  args.command_rate, args.connect_timeout,
+                  args.stats_overlay, args.stats_file, args.layout, max(1, args.cameras),
+                  args.focus, max(0.1, args.thumbnail_fps),
+                  max(0, args.frame_budget), max(0, args.cpu_budget),
+                  args.config, not args.no_connect, exit_after_startup=args.startup_report,
+                  position_poll=max(0, args.position_poll),
+                  restore_positions=args.restore_positions, gamepad=args.gamepad,
+                  gamepad_deadzone=min(0.9, max(0.0, args.gamepad_deadzone)),
+                  gamepad_curve=max(0.1, args.gamepad_curve),
+                  ramp=max(0, args.ramp_ms) / 1000, stop_ramp=max(0, args.stop_ramp_ms) / 1000)
     root.mainloop()
+    app.flush_positions()
+    app.stop_decoder()
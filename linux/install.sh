@@ -89,6 +89,9 @@ info "Installing Python packages (this may take a minute)..."
 # Force pillow into the venv — the system python3-pil is compiled for a different
 # Python version and causes an ImportError when accessed from this venv.
 "$APP_DIR/venv/bin/python3" -m pip install --force-reinstall --quiet pillow
+# Optional: gamepad input (Settings → Gamepad Input); the app runs without it
+"$APP_DIR/venv/bin/python3" -m pip install --quiet evdev \
+  || warn "evdev could not be installed; gamepad input will be unavailable"
 ok "Python packages installed"
 
 # ── generate icon ────────────────────────────────────────────────────────
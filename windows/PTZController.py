@@ -1,14 +1,1569 @@
+import time
+STARTED = time.perf_counter()  # Startup milestones are timed from here
+
 import tkinter as tk
 from tkinter import messagebox, ttk, Toplevel
 import keyboard
-from visca_over_ip import Camera
-import cv2
-from PIL import Image, ImageTk
 import threading
-import time
+import importlib
+import os
+import random
+import argparse
+import bisect
+import collections
+import contextlib
+import functools
+import json
+import queue
+import multiprocessing
+from multiprocessing import shared_memory
+
+
+# ================= STARTUP =================
+# OpenCV, numpy, PIL and visca_over_ip take seconds to import on a thin client,
+# so nothing waits for them before the window is up: they load on first use,
+# and the app preloads them on the Tk thread once it is painted. Threads should
+# not be first to use them: OpenCV rewrites sys.path while it loads, which
+# breaks imports running concurrently on other threads.
+
+class LazyModule:
+    """Stand-in for a module that is imported the first time one of its attributes is used"""
+
+    lock = threading.Lock()
+
+    def __init__(self, name):
+        self._name = name
+        self._module = None
+
+    def load(self):
+        """Import the module now, if it is not loaded yet, and return it"""
+        if self._module is None:
+            with LazyModule.lock:
+                if self._module is None:
+                    self._module = importlib.import_module(self._name)
+        return self._module
+
+    def __getattr__(self, name):
+        # Copied over on first use, so later lookups (cv2.resize on every
+        # frame) are plain instance attribute reads
+        value = getattr(self.load(), name)
+        setattr(self, name, value)
+        return value
+
+
+cv2 = LazyModule("cv2")
+np = LazyModule("numpy")
+Image = LazyModule("PIL.Image")
+ImageTk = LazyModule("PIL.ImageTk")
+visca_over_ip = LazyModule("visca_over_ip")
+LAZY_MODULES = (np, cv2, Image, ImageTk, visca_over_ip)
+
+
+def preload_modules():
+    """Import every lazily loaded module that is not loaded yet"""
+    for module in LAZY_MODULES:
+        module.load()
+
+
+# The startup report is printed once complete, or this many seconds after launch
+STARTUP_REPORT_S = 30
+
+
+class StartupReport:
+    """Milestones of one start, in ms since this module began running.
+
+    Interpreter start-up before that is not included. The report is complete
+    once every expected milestone is in.
+    """
+
+    def __init__(self):
+        self.marks = {}
+        self.expected = {"window", "interface", "libraries"}
+
+    def mark(self, name):
+        """Record a milestone (only its first occurrence counts)"""
+        self.marks.setdefault(name, round((time.perf_counter() - STARTED) * 1000, 1))
+
+    def complete(self):
+        return self.expected <= set(self.marks)
+
+    def text(self):
+        return " • ".join(f"{name.replace('_', ' ')} {ms:.0f} ms"
+                          for name, ms in sorted(self.marks.items(), key=lambda item: item[1]))
+
+# Size of one video grid cell in pixels (4x2 layout)
+TILE_WIDTH = 465
+TILE_HEIGHT = 430
+
+# Area shared by the tiles of one page until the window reports its real size
+GRID_WIDTH = 4 * TILE_WIDTH
+GRID_HEIGHT = 2 * TILE_HEIGHT
+
+# Widest tile border (the active camera's); pictures are sized to fit inside it
+TILE_BORDER = 2
+MIN_TILE = 32
+
+# Grid layouts offered in the View menu, columns x rows
+LAYOUTS = ("2x2", "3x2", "4x2", "3x3", "4x3", "4x4", "6x4", "8x4")
+
+# Per-camera display frame-rate caps offered in the config dialog
+# (0: as delivered by the camera)
+FPS_CAPS = {"Source": 0, "30": 30, "25": 25, "15": 15, "10": 10, "5": 5, "2": 2, "1": 1}
+
+# Per-camera decoder options: threads per decoder (Auto: FFmpeg's choice), RTSP
+# transport, and keyframes only - always, or while the tile is a focus-mode
+# thumbnail - which asks FFmpeg to discard all other packets
+DECODER_THREADS = {"Auto": 0, "1": 1, "2": 2, "4": 4}
+TRANSPORTS = {"TCP": "tcp", "UDP": "udp"}
+KEYFRAME_MODES = ("Never", "Thumbnails", "Always")
+
+# Bound on opening a stream and on a single read, so one dead RTSP URL can only
+# stall its own tile
+CONNECT_TIMEOUT_MS = 5000
+
+# Camera configuration saved between sessions, in the user's %APPDATA% folder.
+# The file holds RTSP URLs, usually with credentials; %APPDATA% is private to
+# the user, and the file is created owner-only where the OS honours modes
+CONFIG_DIR = os.path.join(os.environ.get("APPDATA") or os.path.expanduser("~"), "PTZController")
+CONFIG_PATH = os.path.join(CONFIG_DIR, "cameras.json")
+CONFIG_VERSION = 1
+
+# Camera positions are polled with VISCA inquiries while a camera's command queue
+# is idle: every POSITION_POLL_S (the --position-poll default) while it is still,
+# every POSITION_MOVING_POLL_S until it settles after a command. Each inquiry is
+# one attempt that gives up after INQUIRY_TIMEOUT_S, so a command queued behind
+# it is not held up by retries.
+# Zoom positions run from 0 to ZOOM_RANGE
+POSITION_POLL_S = 2.0
+POSITION_MOVING_POLL_S = 0.2
+INQUIRY_TIMEOUT_S = 0.05
+ZOOM_RANGE = 16384
+
+# Fastest VISCA drive speeds for absolute moves: pan goes to 0x18, but tilt on common
+# cameras only to 0x14 (faster is rejected as a syntax error)
+PAN_SPEED_MAX = 24
+TILT_SPEED_MAX = 20
+
+# Pan/tilt motion profile (the --ramp-ms / --stop-ramp-ms defaults): seconds to speed
+# up to a new speed, and to slow down or stop (0: at once, so a camera stops where
+# the key is released)
+RAMP_S = 0.25
+STOP_RAMP_S = 0.0
+
+# Stream states reported by the capture workers (shared with pool processes by index).
+# "stale" means reads are failing on an open stream; "reconnecting" means the
+# stream is closed and being reopened with backoff; "paused" means the tile is
+# not on screen and the stream stays closed until it is
+STREAM_STATES = ("connecting", "live", "stale", "reconnecting", "paused")
+
+
+class GridLayout:
+    """Columns x rows of tiles per page; cameras fill the pages in order"""
+
+    def __init__(self, columns, rows):
+        self.columns = max(1, columns)
+        self.rows = max(1, rows)
+        self.per_page = self.columns * self.rows
+
+    @classmethod
+    def parse(cls, text):
+        """'4x2' -> GridLayout(4, 2); also used as the --layout argument type"""
+        columns, rows = (int(v) for v in text.lower().replace("×", "x").split("x"))
+        return cls(columns, rows)
+
+    def __str__(self):
+        return f"{self.columns}x{self.rows}"
+
+    def page_count(self, count):
+        """Pages needed for count cameras (at least one)"""
+        return max(1, -(-count // self.per_page))
+
+    def page_of(self, index):
+        return index // self.per_page
+
+    def cells(self, count, page):
+        """Yield (camera index, row, column) for every cell used on the page"""
+        first = page * self.per_page
+        for index in range(first, min(count, first + self.per_page)):
+            slot = index - first
+            yield index, slot // self.columns, slot % self.columns
+
+    def tile_size(self, width, height):
+        """Size of one cell when the grid fills width x height"""
+        return (max(MIN_TILE, width // self.columns),
+                max(MIN_TILE, height // self.rows))
+
+    def frames(self, count, page, width, height):
+        """Yield (camera index, (x, y, width, height)) for the page's tiles, centred in the area"""
+        tile_w, tile_h = self.tile_size(width, height)
+        x0 = max(0, (width - tile_w * self.columns) // 2)
+        y0 = max(0, (height - tile_h * self.rows) // 2)
+        for index, row, column in self.cells(count, page):
+            yield index, (x0 + column * tile_w, y0 + row * tile_h, tile_w, tile_h)
+
+
+# Focus mode: share of the width given to the thumbnail strip, and thumbnails
+# per column before the strip splits into two columns
+FOCUS_STRIP = 0.2
+FOCUS_STRIP_ROWS = 6
+
+
+def focus_frames(width, height, thumbnails):
+    """Spotlight geometry: the focused tile fills the area left of a thumbnail strip.
+
+    Returns the focused tile's (x, y, width, height) and one such rectangle
+    per thumbnail.
+    """
+    if not thumbnails:
+        return (0, 0, width, height), []
+    columns = 1 if thumbnails <= FOCUS_STRIP_ROWS else 2
+    rows = -(-thumbnails // columns)
+    strip = int(width * FOCUS_STRIP)
+    thumb_w = strip // columns
+    thumb_h = max(MIN_TILE, min(height // rows, thumb_w * 3 // 4))
+    x0 = width - strip
+    thumbs = [(x0 + (i % columns) * thumb_w, (i // columns) * thumb_h, thumb_w, thumb_h)
+              for i in range(thumbnails)]
+    return (0, 0, x0, height), thumbs
+
+
+class CaptureOptionsGate:
+    """Serialises FFmpeg option changes without serialising stream opens.
+
+    OpenCV reads FFmpeg open options from the environment when a capture is
+    opened. Captures with identical options may open concurrently; one that
+    needs different options waits until those opens have finished.
+    """
+
+    def __init__(self):
+        self.cond = threading.Condition()
+        self.options = None
+        self.active = 0
+
+    @contextlib.contextmanager
+    def applied(self, options):
+        with self.cond:
+            while self.active and self.options != options:
+                self.cond.wait()
+            os.environ["OPENCV_FFMPEG_CAPTURE_OPTIONS"] = options
+            self.options = options
+            self.active += 1
+        try:
+            yield
+        finally:
+            with self.cond:
+                self.active -= 1
+                self.cond.notify_all()
+
+
+_capture_options_gate = CaptureOptionsGate()
+
+
+def open_capture(url, low_latency=False, timeout_ms=CONNECT_TIMEOUT_MS,
+                 threads=0, transport="tcp", low_delay=False, keyframes_only=False):
+    """Open an RTSP stream with the FFmpeg backend and the given decoder options.
+
+    OpenCV only defaults to RTSP over TCP while OPENCV_FFMPEG_CAPTURE_OPTIONS is
+    unset, so the transport is always restated alongside any other option.
+    Low-latency mode and low_delay disable FFmpeg's input buffering; low_delay
+    also drops the demuxer delay and, over UDP, the reordering queue. Opening
+    and each read give up after timeout_ms.
+    """
+    options = [f"rtsp_transport;{transport}"]
+    if low_latency or low_delay:
+        options.append("fflags;nobuffer")
+    if low_delay:
+        options += ["max_delay;0", "reorder_queue_size;0"]
+    if keyframes_only:
+        options.append("avdiscard;nonkey")
+
+    params = [cv2.CAP_PROP_OPEN_TIMEOUT_MSEC, timeout_ms,
+              cv2.CAP_PROP_READ_TIMEOUT_MSEC, timeout_ms]
+    # OpenCV does not pass capture options on to the codec; the thread count
+    # has its own property (OpenCV 4.7+)
+    if threads and hasattr(cv2, "CAP_PROP_N_THREADS"):
+        params += [cv2.CAP_PROP_N_THREADS, threads]
+
+    with _capture_options_gate.applied("|".join(options)):
+        cap = cv2.VideoCapture(url, cv2.CAP_FFMPEG, params)
+
+    cap.set(cv2.CAP_PROP_BUFFERSIZE, 1 if low_latency else 2)
+    return cap
+
+
+def capture_info(cap):
+    """Resolution (as decoded), codec and frame rate (0: not reported) of an open capture.
+
+    Cached per URL by the app between sessions.
+    """
+    fourcc = int(cap.get(cv2.CAP_PROP_FOURCC)) & 0xffffffff
+    fps = cap.get(cv2.CAP_PROP_FPS)
+    return {
+        'width': int(cap.get(cv2.CAP_PROP_FRAME_WIDTH)),
+        'height': int(cap.get(cv2.CAP_PROP_FRAME_HEIGHT)),
+        'codec': fourcc.to_bytes(4, "little").decode("ascii", "replace").strip("\0 "),
+        'fps': round(fps, 2) if 1 <= fps <= 120 else 0
+    }
+
+
+@functools.lru_cache(maxsize=256)
+def fit_size(w, h, width, height):
+    """Largest size with the aspect ratio of a w x h source that fits inside width x height.
+
+    Cached: a stream keeps one resolution and a tile one size, so this is
+    computed once per (stream, tile size) rather than for every frame.
+    """
+    scale = min(width / w, height / h)
+    return int(w * scale), int(h * scale)
+
+
+def fit_to_tile(frame, width, height):
+    """Scale a BGR frame to fit inside width x height (aspect preserved) and convert it to RGBA.
+
+    Called from the capture threads so the Tk main loop only has to blit pixels.
+    RGBA is used because PIL can share an RGBA numpy buffer without copying it.
+    Returns None if the frame would collapse to zero size.
+    """
+    h, w = frame.shape[:2]
+    new_w, new_h = fit_size(w, h, width, height)
+
+    if new_w <= 0 or new_h <= 0:
+        return None
+
+    # A stream that already matches the tile only needs the colour conversion
+    if (new_w, new_h) != (w, h):
+        frame = cv2.resize(frame, (new_w, new_h))
+    return cv2.cvtColor(frame, cv2.COLOR_BGR2RGBA)
+
+
+class TileSurface:
+    """Persistent PhotoImage for one video tile, updated in place.
+
+    The PhotoImage is backed by a preallocated RGBA numpy buffer that PIL shares,
+    so drawing a frame is a pixel copy plus a paste - no new Tk image objects.
+    """
+
+    def __init__(self, label, width, height):
+        self.label = label
+        self.width = width
+        self.height = height
+        self.photo = None  # Allocated on the first blit, so layout needs neither numpy nor PIL
+
+        self.content_size = None
+        self.shown = False
+
+    def _allocate(self):
+        self.buffer = np.zeros((self.height, self.width, 4), np.uint8)
+        self.buffer[..., 3] = 255  # Opaque black letterbox
+
+        # frombuffer with a raw RGBA layout shares memory with self.buffer
+        self.image = Image.frombuffer("RGBA", (self.width, self.height), self.buffer,
+                                      "raw", "RGBA", 0, 1)
+        self.photo = ImageTk.PhotoImage(image=self.image)
+
+    def blit(self, frame):
+        """Copy an RGBA frame (centered) into the buffer and refresh the PhotoImage"""
+        if self.photo is None:
+            self._allocate()
+
+        fh = min(frame.shape[0], self.height)
+        fw = min(frame.shape[1], self.width)
+
+        # Letterbox bars only need clearing when the picture size changes
+        if (fw, fh) != self.content_size:
+            self.buffer[..., :3] = 0
+            self.content_size = (fw, fh)
+
+        y0 = (self.height - fh) // 2
+        x0 = (self.width - fw) // 2
+        self.buffer[y0:y0 + fh, x0:x0 + fw] = frame[:fh, :fw]
+        self.photo.paste(self.image)
+
+        # Swap the "No Signal" text for the image on the first frame only
+        if not self.shown:
+            self.label.configure(image=self.photo, text="")
+            self.shown = True
+
+
+# ================= INSTRUMENTATION =================
+
+class RollingHistogram:
+    """Timing samples over a rolling time window, summarised as percentiles and buckets.
+
+    Every pipeline stage records into one: capture workers (read, convert), the
+    renderer (blit, capture-to-display) and the VISCA dispatchers (round trip).
+    snapshot() returns plain dicts, so the same data feeds the on-screen overlay
+    and the JSON stats file.
+    """
+
+    EDGES_MS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+
+    def __init__(self, window_s=10.0, max_samples=4096):
+        self.window_s = window_s
+        self.samples = collections.deque(maxlen=max_samples)  # (monotonic time, value)
+        self.started = time.monotonic()
+
+    def add(self, value):
+        self.samples.append((time.monotonic(), value))
+
+    def _recent(self, now):
+        cutoff = now - self.window_s
+        return [v for t, v in list(self.samples) if t >= cutoff]
+
+    def rate(self):
+        """Samples per second over the window (or since creation, if younger)"""
+        now = time.monotonic()
+        span = min(self.window_s, now - self.started)
+        return len(self._recent(now)) / span if span > 0 else 0.0
+
+    def snapshot(self):
+        """Count, mean, p50/p95/p99, max and bucket counts of the samples in the window"""
+        values = sorted(self._recent(time.monotonic()))
+        if not values:
+            return {'count': 0}
+
+        n = len(values)
+        buckets = [0] * (len(self.EDGES_MS) + 1)
+        for v in values:
+            buckets[bisect.bisect_left(self.EDGES_MS, v)] += 1
+        labels = [f"<={e}" for e in self.EDGES_MS] + [f">{self.EDGES_MS[-1]}"]
+
+        return {
+            'count': n,
+            'mean': round(sum(values) / n, 3),
+            'p50': round(values[n // 2], 3),
+            'p95': round(values[min(n - 1, int(n * 0.95))], 3),
+            'p99': round(values[min(n - 1, int(n * 0.99))], 3),
+            'max': round(values[-1], 3),
+            'buckets': dict(zip(labels, buckets))
+        }
+
+
+# ================= DECODING =================
+# A StreamWorker owns one RTSP stream: it opens the capture, decodes, scales to
+# its tile and hands the result to a publish callback. The same worker runs on a
+# thread (ThreadDecoder) or inside a pool process (ProcessDecoder); the UI only
+# talks to the decoder through update() / latest() / intact().
+
+class StreamWorker:
+    """Capture loop for a single stream, usable on a thread or in a pool process"""
+
+    # In low-latency mode a grab that returns in less than this fraction of the
+    # frame interval was served from FFmpeg's buffer, not the network, so the
+    # frame is stale and is dropped without being retrieved
+    STALE_GRAB_FRACTION = 0.3
+    MAX_DRAIN = 30
+
+    # A stream whose reads keep failing for STALE_GRACE_S is closed and reopened,
+    # waiting RECONNECT_MIN_S (doubling up to RECONNECT_MAX_S) between attempts
+    STALE_GRACE_S = 2.0
+    RECONNECT_MIN_S = 0.5
+    RECONNECT_MAX_S = 30.0
+
+    def __init__(self, key, url, size, low_latency=False,
+                 timeout_ms=CONNECT_TIMEOUT_MS, visible=True, max_fps=0, decoder_options=None):
+        self.key = key
+        self.url = url
+        self.size = size
+        self.low_latency = low_latency
+        self.timeout_ms = timeout_ms
+        self.visible = visible     # False while the tile is off the current page
+        self.max_fps = max_fps     # Publish at most this many frames a second (0: all)
+        self.decoder_options = decoder_options or {}  # Keyword arguments for open_capture
+        self.state = "connecting"  # One of STREAM_STATES
+        self.report = None
+        self.running = True
+        self.dropped = 0          # Stale frames skipped in low-latency mode
+        self.throttled = 0        # Frames grabbed but not decoded under max_fps
+        self.reconnects = 0       # Reopen attempts after the stream dropped
+        self.opened_with = None
+        self.source = None        # capture_info() of the open stream, with its url
+        self.read_ms = RollingHistogram()     # grab + decode of every frame received, published or not
+        self.convert_ms = RollingHistogram()  # resize and BGR->RGBA in fit_to_tile
+
+    def stats(self):
+        """Decode-side stats for this stream (see PTZApp.stats_snapshot)"""
+        return {
+            'state': self.state,
+            'source_fps': round(self.read_ms.rate(), 2),
+            'decode_fps': round(self.convert_ms.rate(), 2),
+            'dropped': self.dropped,
+            'throttled': self.throttled,
+            'reconnects': self.reconnects,
+            'source': self.source,
+            'read_ms': self.read_ms.snapshot(),
+            'convert_ms': self.convert_ms.snapshot()
+        }
+
+    def _set_state(self, state):
+        self.state = state
+        if self.report is not None:
+            self.report(state)
+
+    def _wanted(self):
+        """The options the stream should currently be open with"""
+        return (self.url, self.low_latency,
+                tuple(sorted(self.decoder_options.items())))
+
+    def _open(self, state="connecting"):
+        """Open the stream with the current options and derive the stale-grab threshold"""
+        self._set_state(state)
+        self.opened_with = self._wanted()
+        cap = open_capture(self.url, self.low_latency,
+                           timeout_ms=self.timeout_ms, **self.decoder_options)
+        if cap.isOpened():
+            self.source = dict(capture_info(cap), url=self.url)
+            self._set_state("live")
+
+        fps = cap.get(cv2.CAP_PROP_FPS)
+        if not 1 <= fps <= 120:
+            fps = 25
+        self.stale_grab_s = self.STALE_GRAB_FRACTION / fps
+
+        return cap
+
+    def _read_latest(self, cap):
+        """Grab until a grab has to wait for the network, then retrieve only that newest frame.
+
+        Returns (ok, frame, arrival time in monotonic ns).
+        """
+        drained = 0
+
+        while True:
+            started = time.monotonic()
+            if not cap.grab():
+                return False, None, 0
+            arrived = time.monotonic_ns()
+
+            if time.monotonic() - started >= self.stale_grab_s or drained >= self.MAX_DRAIN:
+                break
+            drained += 1
+
+        self.dropped += drained
+        ret, frame = cap.retrieve()
+        return ret, frame, arrived
+
+    def _backoff(self, attempt):
+        """Exponential backoff with jitter, so cameras that dropped together do not retry in lockstep"""
+        delay = min(self.RECONNECT_MAX_S, self.RECONNECT_MIN_S * 2 ** attempt)
+        return delay * random.uniform(0.5, 1.0)
+
+    def _wait(self, seconds):
+        """Sleep, waking early on stop, when the tile is hidden or when the stream options change.
+
+        Returns True if the full delay elapsed.
+        """
+        deadline = time.monotonic() + seconds
+        while time.monotonic() < deadline:
+            if not self.running or not self.visible or self._wanted() != self.opened_with:
+                return False
+            time.sleep(0.1)
+        return True
+
+    def capture_loop(self, publish, report=None):
+        """Decode frames until stopped and publish them as (key, seq, rgba_frame, captured_ns).
+
+        report, if given, is called with each new stream state; pool processes
+        use it to forward the state to the UI.
+        """
+        self.report = report
+        cap = None
+
+        seq = 0
+        attempt = 0             # Reopen attempts since the last good frame
+        failing_since = None    # When reads started failing on the open stream
+        next_due = 0.0          # With max_fps: when the next frame may be published
+
+        while self.running:
+
+            # A tile off the current page costs nothing: the stream is closed
+            # (no network, no decoding) until the tile is shown again
+            if not self.visible:
+                if self.state != "paused":
+                    if cap is not None:
+                        cap.release()
+                    cap = None
+                    self.opened_with = None
+                    self._set_state("paused")
+                time.sleep(0.1)
+                continue
+
+            # (Re)open here, not on the Tk thread, when the tile is shown, switches
+            # between preview and full stream or the capture options change
+            if self._wanted() != self.opened_with:
+                if cap is not None:
+                    cap.release()
+                cap = self._open()
+                attempt = 0
+                failing_since = None
+
+                if not cap.isOpened():
+                    print(f"{self.key} failed to open stream")
+                else:
+                    print(f"{self.key} stream connected")
+
+            # Closed or never opened: back off, then reopen only this stream
+            if not cap.isOpened():
+                self._set_state("reconnecting")
+                if self._wait(self._backoff(attempt)):
+                    attempt += 1
+                    self.reconnects += 1
+                    cap = self._open("reconnecting")
+                continue
+
+            started = time.perf_counter()
+            if self.max_fps and time.monotonic() < next_due:
+                # Frame-rate capped (focus-mode thumbnail): keep the stream flowing
+                # but skip retrieving, scaling and publishing frames nobody sees
+                ret, frame, arrived = cap.grab(), None, 0
+            elif self.low_latency:
+                ret, frame, arrived = self._read_latest(cap)
+            else:
+                ret, frame = cap.read()
+                arrived = time.monotonic_ns()
+
+            if not ret:
+                if failing_since is None:
+                    failing_since = time.monotonic()
+                    self._set_state("stale")
+                elif time.monotonic() - failing_since >= self.STALE_GRACE_S:
+                    print(f"{self.key} stream lost, reconnecting")
+                    cap.release()
+                    failing_since = None
+                    continue
+                time.sleep(0.2)
+                continue
+
+            if failing_since is not None or attempt:
+                if attempt:
+                    print(f"{self.key} stream reconnected after {attempt} attempt(s)")
+                failing_since = None
+                attempt = 0
+                self._set_state("live")
+
+            converting = time.perf_counter()
+            self.read_ms.add((converting - started) * 1000)
+            if frame is None:
+                self.throttled += 1
+                continue
+            if self.max_fps:
+                # A fixed schedule, so published frames average max_fps rather
+                # than one source interval less
+                interval = 1 / self.max_fps
+                next_due = max(next_due, time.monotonic() - interval) + interval
+
+            # Resize and convert here, off the Tk thread
+            frame = fit_to_tile(frame, *self.size)
+            if frame is None:
+                continue
+            self.convert_ms.add((time.perf_counter() - converting) * 1000)
+
+            seq += 1
+            publish(self.key, seq, frame, arrived)
+
+            if not self.low_latency:
+                time.sleep(0.01)
+
+        if cap is not None:
+            cap.release()
+
+
+class ThreadDecoder:
+    """Default decoder: one daemon thread per stream inside the UI process"""
+
+    def __init__(self):
+        self.workers = {}
+        self.frames = {}
+
+    def start(self, specs):
+        """Start one capture thread per stream spec (url, size, ...)"""
+        for key, spec in specs.items():
+            worker = StreamWorker(key, **spec)
+            self.workers[key] = worker
+            self.frames[key] = (0, None, 0)
+            threading.Thread(target=worker.capture_loop,
+                             args=(self.publish,),
+                             daemon=True).start()
+
+    def publish(self, key, seq, frame, captured_ns):
+        # A single tuple store, so the renderer never pairs a new seq with the previous frame
+        self.frames[key] = (seq, frame, captured_ns)
+
+    def keys(self):
+        return list(self.frames)
+
+    def update(self, key, **changes):
+        """Change a running stream's url, size or decoder options"""
+        for name, value in changes.items():
+            setattr(self.workers[key], name, value)
+
+    def latest(self, key):
+        """Return (seq, frame, captured_ns) for the newest frame of a stream"""
+        return self.frames[key]
+
+    def intact(self, key, seq):
+        """Frames handed over between threads are never overwritten in place"""
+        return True
+
+    def state(self, key):
+        """Return the stream's current entry in STREAM_STATES"""
+        return self.workers[key].state
+
+    def stats(self, key):
+        return self.workers[key].stats()
+
+    def cpu_seconds(self):
+        """CPU time used so far; the workers run in this process"""
+        return time.process_time()
+
+    def stop(self):
+        for worker in self.workers.values():
+            worker.running = False
+
+
+class SharedFrameRing:
+    """Single-producer ring of RGBA frames in shared memory.
+
+    The header holds the latest slot index and the stream state (an index into
+    STREAM_STATES), followed by (seq, width, height, captured_ns) per slot. Rows are packed at the frame's own width so small
+    tiles only touch the pages they use. A slot's seq is zeroed while it is being
+    written, which lets the reader detect a frame overwritten mid-blit.
+    """
+
+    SLOTS = 3
+    HEADER = 64 + SLOTS * 32
+
+    def __init__(self, capacity, name=None):
+        width, height = capacity
+        self.slot_bytes = width * height * 4
+        size = self.HEADER + self.SLOTS * self.slot_bytes
+
+        if name is None:
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+
+        self.name = self.shm.name
+        self.header = np.ndarray((self.HEADER // 8,), np.int64, self.shm.buf)
+        if name is None:
+            self.header[:] = 0
+
+    def set_state(self, state):
+        self.header[1] = STREAM_STATES.index(state)
+
+    def state(self):
+        return STREAM_STATES[int(self.header[1])]
+
+    def _meta(self, slot):
+        return self.header[8 + slot * 4: 12 + slot * 4]
+
+    def write(self, seq, frame, captured_ns):
+        """Copy a frame into the next slot and make it the latest (producer side)"""
+        slot = (int(self.header[0]) + 1) % self.SLOTS
+        meta = self._meta(slot)
+        h, w = frame.shape[:2]
+
+        meta[0] = 0  # Mark the slot as being written
+        view = np.ndarray((h, w, 4), np.uint8, self.shm.buf, self.HEADER + slot * self.slot_bytes)
+        view[:] = frame
+        meta[1], meta[2], meta[3] = w, h, captured_ns
+        meta[0] = seq
+
+        self.header[0] = slot
+
+    def latest(self):
+        """Return (seq, view, captured_ns) of the newest frame without copying it (consumer side)"""
+        slot = int(self.header[0])
+        seq, w, h, captured_ns = (int(v) for v in self._meta(slot))
+        if seq <= 0:
+            return 0, None, 0
+        view = np.ndarray((h, w, 4), np.uint8, self.shm.buf, self.HEADER + slot * self.slot_bytes)
+        return seq, view, captured_ns
+
+    def intact(self, seq):
+        """True if the frame with this seq has not been overwritten since latest()"""
+        return any(self._meta(slot)[0] == seq for slot in range(self.SLOTS))
+
+    def close(self, unlink=False):
+        del self.header
+        self.shm.close()
+        if unlink:
+            self.shm.unlink()
+
+
+# How often pool processes report their workers' stats
+STATS_INTERVAL_S = 1.0
+
+
+def decode_process_main(streams, control, stats):
+    """Entry point of one pool process.
+
+    Decodes this process's share of the streams on local threads and applies
+    ('update', key, changes) / ('stop',) messages from the control queue.
+    (pid, CPU seconds, {key: worker stats}) is put on the stats queue about
+    once a second.
+    """
+    preload_modules()
+    workers = {}
+    rings = []
+    threads = []
+
+    for key, ring_name, capacity, spec in streams:
+        ring = SharedFrameRing(capacity, ring_name)
+        worker = StreamWorker(key, **spec)
+        workers[key] = worker
+        rings.append(ring)
+
+        thread = threading.Thread(target=worker.capture_loop,
+                                  args=(lambda _key, seq, frame, ts, r=ring: r.write(seq, frame, ts),
+                                        ring.set_state),
+                                  daemon=True)
+        thread.start()
+        threads.append(thread)
+
+    while True:
+        try:
+            message = control.get(timeout=STATS_INTERVAL_S)
+        except queue.Empty:
+            stats.put((os.getpid(), time.process_time(),
+                       {key: worker.stats() for key, worker in workers.items()}))
+            continue
+        if message[0] == "stop":
+            break
+        _, key, changes = message
+        for name, value in changes.items():
+            setattr(workers[key], name, value)
+
+    for worker in workers.values():
+        worker.running = False
+    for thread in threads:
+        thread.join(timeout=2)
+
+    for ring in rings:
+        # A worker still stuck in cap.read() may hold a view; the mapping is
+        # released when the process exits anyway
+        try:
+            ring.close()
+        except BufferError:
+            pass
+
+
+class ProcessDecoder:
+    """Decodes streams in a small pool of worker processes.
+
+    Decoding then scales across cores instead of sharing the UI interpreter's GIL.
+    Frames come back through one SharedFrameRing per stream, sized for the
+    largest possible tile (the screen) or, where capacities gives one, for the
+    stream's largest picture on that screen.
+    """
+
+    def __init__(self, workers, capacity, capacities=None):
+        self.workers = max(1, workers)
+        self.capacity = capacity
+        self.capacities = capacities or {}  # key -> (width, height) smaller than the screen
+        self.context = multiprocessing.get_context("spawn")
+        self.rings = {}
+        self.queues = {}
+        self.processes = []
+        self.stats_queue = self.context.Queue()  # Reports from all pool processes
+        self.worker_stats = {}
+        self.process_cpu = {}  # pid -> CPU seconds at the pool process's last report
+
+    def _capacity(self, key):
+        return self.capacities.get(key, self.capacity)
+
+    def _clamp(self, key, size):
+        capacity = self._capacity(key)
+        return (min(size[0], capacity[0]), min(size[1], capacity[1]))
+
+    def start(self, specs):
+        """Spread the streams round-robin over the pool and start the processes"""
+        keys = list(specs)
+
+        for group in (keys[i::self.workers] for i in range(self.workers)):
+            if not group:
+                continue
+
+            control = self.context.Queue()
+            streams = []
+            for key in group:
+                spec = dict(specs[key], size=self._clamp(key, specs[key]['size']))
+                ring = SharedFrameRing(self._capacity(key))
+                self.rings[key] = ring
+                self.queues[key] = control
+                streams.append((key, ring.name, self._capacity(key), spec))
+
+            process = self.context.Process(target=decode_process_main,
+                                           args=(streams, control, self.stats_queue),
+                                           daemon=True)
+            process.start()
+            self.processes.append((process, control))
+
+    def keys(self):
+        return list(self.rings)
+
+    def update(self, key, **changes):
+        """Change a running stream's url, size or decoder options"""
+        if 'size' in changes:
+            changes['size'] = self._clamp(key, changes['size'])
+        self.queues[key].put(("update", key, changes))
+
+    def latest(self, key):
+        """Return (seq, view, captured_ns) for the newest frame of a stream"""
+        return self.rings[key].latest()
+
+    def intact(self, key, seq):
+        return self.rings[key].intact(seq)
+
+    def state(self, key):
+        return self.rings[key].state()
+
+    def _drain_stats(self):
+        while True:
+            try:
+                pid, cpu, report = self.stats_queue.get_nowait()
+            except queue.Empty:
+                break
+            self.process_cpu[pid] = cpu
+            self.worker_stats.update(report)
+
+    def stats(self, key):
+        """Latest stats reported by the stream's pool process (empty until the first report)"""
+        self._drain_stats()
+        return self.worker_stats.get(key, {})
+
+    def cpu_seconds(self):
+        """CPU time used so far by the UI process and the pool (as last reported)"""
+        self._drain_stats()
+        return time.process_time() + sum(self.process_cpu.values())
+
+    def stop(self):
+        for process, control in self.processes:
+            control.put(("stop",))
+
+        for process, _ in self.processes:
+            process.join(timeout=3)
+            if process.is_alive():
+                process.terminate()
+
+        for ring in self.rings.values():
+            ring.close(unlink=True)
+
+        self.processes.clear()
+        self.rings.clear()
+        self.queues.clear()
+
+
+# ================= DECODER PROBE =================
+
+PROBE_SECONDS = 4.0
+PROBE_TARGET_FPS = 25
+PROBE_CANDIDATES = ({'threads': 1}, {'threads': 2}, {'threads': 4}, {'threads': 0},
+                    {'threads': 1, 'keyframes_only': True})
+
+
+def probe_decoder_options(url, target_fps, transport="tcp", seconds=PROBE_SECONDS,
+                          report=None):
+    """Benchmark PROBE_CANDIDATES on a stream and pick the cheapest that reaches target_fps.
+
+    Each candidate decodes the stream for a few seconds. Frame rate and CPU use
+    (% of one core, FFmpeg's decoder threads included) are measured per second
+    of stream time, so a recording that decodes faster than real time is
+    measured like a live camera. The pick is the cheapest candidate reaching
+    90% of target_fps, or the fastest if none does. Run it in a process of its
+    own (the config dialog does), so other streams are not counted.
+
+    Returns (best result or None, all results); report(result) is called as
+    each candidate finishes.
+    """
+    results = []
+    for candidate in PROBE_CANDIDATES:
+        options = dict(candidate, transport=transport)
+        cap = open_capture(url, timeout_ms=CONNECT_TIMEOUT_MS, **options)
+        result = {'options': options, 'fps': 0.0, 'cpu_pct': None}
+
+        # The first frame waits for the connection and stream setup
+        if cap.isOpened() and cap.read()[0]:
+            frames = 0
+            first = last = cap.get(cv2.CAP_PROP_POS_MSEC)
+            cpu = time.process_time()
+            started = time.monotonic()
+            while time.monotonic() - started < seconds and cap.read()[0]:
+                frames += 1
+                last = cap.get(cv2.CAP_PROP_POS_MSEC)
+            span = (last - first) / 1000
+            if span <= 0:
+                span = time.monotonic() - started
+            result['fps'] = round(frames / span, 2)
+            result['cpu_pct'] = round(100 * (time.process_time() - cpu) / span, 1)
+
+        cap.release()
+        results.append(result)
+        if report is not None:
+            report(result)
+
+    working = [r for r in results if r['fps']]
+    meeting = [r for r in working if r['fps'] >= target_fps * 0.9]
+    if meeting:
+        best = min(meeting, key=lambda r: r['cpu_pct'])
+    else:
+        best = max(working, key=lambda r: r['fps'], default=None)
+    return best, results
+
+
+def describe_decoder_options(options):
+    """Short description of probed decoder options, e.g. '2 thread(s), all frames'"""
+    threads = options.get('threads') or "auto"
+    frames = "keyframes only" if options.get('keyframes_only') else "all frames"
+    return f"{threads} thread(s), {frames}"
+
+
+def probe_process_main(url, target_fps, transport, results):
+    """Entry point of a probe process: puts ('result', r) per candidate, then ('done', best)"""
+    best, _ = probe_decoder_options(url, target_fps, transport,
+                                    report=lambda result: results.put(("result", result)))
+    results.put(("done", best))
+
+
+# ================= RENDER BUDGET =================
+
+class RenderBudget:
+    """Caps the frames decoded and drawn per second across all tiles.
+
+    Once a second the app passes each on-screen stream's demand (what it
+    delivers, up to its own cap) in priority order, active camera first, and
+    the CPU time used; caps() returns the frame rate each stream may use.
+
+    The budget is the smaller of frame_budget (frames/s) and an allowance that
+    backs off while CPU use is over cpu_budget (% of one core) and recovers
+    when it is well under. Background tiles are lowered first, evenly, down to
+    MIN_FPS; only then does the active camera give up any of its rate.
+    """
+
+    MIN_FPS = 1.0
+    BACK_OFF = 0.8    # Allowance factor per second over the CPU budget
+    RECOVER = 1.1     # ... and per second under HEADROOM of it
+    HEADROOM = 0.85
+
+    def __init__(self, frame_budget=0, cpu_budget=0):
+        self.frame_budget = frame_budget  # 0: no frame limit
+        self.cpu_budget = cpu_budget      # 0: no CPU limit
+        self.allowance = None
+        self.cpu_pct = None
+        self.sampled = None               # (monotonic, CPU seconds) of the last measure()
+
+    def enabled(self):
+        return bool(self.frame_budget or self.cpu_budget)
+
+    def reset(self):
+        """Start over for a new decoder, which counts CPU time from a new start"""
+        self.allowance = None
+        self.cpu_pct = None
+        self.sampled = None
+
+    def measure(self, cpu_seconds):
+        """Update cpu_pct from the CPU seconds used so far"""
+        now = time.monotonic()
+        if self.sampled is not None and now > self.sampled[0]:
+            self.cpu_pct = 100 * (cpu_seconds - self.sampled[1]) / (now - self.sampled[0])
+        self.sampled = (now, cpu_seconds)
+
+    def budget(self, demand):
+        """Frames per second to share out this second"""
+        limit = self.frame_budget or demand
+        if self.cpu_budget and self.cpu_pct is not None:
+            allowance = demand if self.allowance is None else self.allowance
+            if self.cpu_pct > self.cpu_budget:
+                allowance *= self.BACK_OFF
+            elif self.cpu_pct < self.cpu_budget * self.HEADROOM:
+                allowance *= self.RECOVER
+            self.allowance = min(demand, allowance)
+            limit = min(limit, self.allowance)
+        return min(limit, demand)
+
+    def caps(self, demands):
+        """Share out the budget.
+
+        demands is [(key, fps)] with the active camera first. Returns {key: fps}
+        for the streams that must run below their demand.
+        """
+        if not demands:
+            return {}
+        left = self.budget(sum(fps for _, fps in demands))
+        (first, first_fps), rest = demands[0], demands[1:]
+
+        # The active camera keeps its rate unless the background is at the floor
+        floors = sum(min(fps, self.MIN_FPS) for _, fps in rest)
+        rates = {first: max(min(first_fps, self.MIN_FPS), min(first_fps, left - floors))}
+        left -= rates[first]
+
+        # Even shares, topped up by what slower streams do not need
+        pending = sorted(rest, key=lambda item: item[1])
+        for i, (key, fps) in enumerate(pending):
+            share = left / (len(pending) - i)
+            rates[key] = max(min(fps, self.MIN_FPS), min(fps, share))
+            left -= rates[key]
+
+        # Half-frame steps, so small swings do not reconfigure every stream
+        demand = dict(demands)
+        return {key: max(self.MIN_FPS, round(rate * 2) / 2)
+                for key, rate in rates.items() if rate < demand[key] * 0.95}
+
+
+# ================= SAVED CONFIGURATION =================
+# {'version': 1, 'cameras': [camera config, ...], 'streams': {url: capture_info},
+#  'positions': {ip: [pan, tilt, zoom]}}.
+# Loaded at startup so the wall comes back without retyping; the stream info
+# sizes decode rings and labels waiting tiles before the first frame arrives,
+# and the positions let cameras return to where they were.
+
+def load_config(path):
+    """Return the saved configuration at path, or None if there is no usable one"""
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError) as e:
+        print(f"Could not read {path}: {e}")
+        return None
+
+    if (not isinstance(data, dict) or data.get('version') != CONFIG_VERSION
+            or not isinstance(data.get('cameras', []), list)
+            or not isinstance(data.get('streams', {}), dict)
+            or not isinstance(data.get('positions', {}), dict)):
+        print(f"Ignoring {path}: not a version {CONFIG_VERSION} configuration")
+        return None
+    return data
+
+
+def save_config(path, data):
+    """Write the configuration to a fresh owner-only file and rename it over path.
+
+    The file is therefore never half-written or readable by others. Raises OSError.
+    """
+    os.makedirs(os.path.dirname(path) or ".", mode=0o700, exist_ok=True)
+    partial = f"{path}.tmp"
+    with contextlib.suppress(FileNotFoundError):
+        os.unlink(partial)
+    with os.fdopen(os.open(partial, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600), "w") as f:
+        json.dump(data, f, indent=1)
+    os.replace(partial, path)
+
+
+# ================= PTZ CONTROL =================
+# VISCA calls block on a UDP round trip (and on timeouts for an unreachable
+# camera), so each camera gets its own dispatcher thread.
+
+def open_camera(ip):
+    """Connect a visca_over_ip.Camera whose inquiries use its own command socket.
+
+    The library waits for inquiry replies on the fixed local port 52381, where
+    only one of several cameras' sockets receives them. The camera's dispatcher
+    never sends two messages at once, so one socket serves both.
+    """
+    camera = visca_over_ip.Camera(ip)
+    camera._inq_sock.close()
+    camera._inq_sock = camera._cmd_sock
+    return camera
+
+
+def parse_limits(text):
+    """Soft limit text 'min..max' (e.g. '-1200..1200') as (min, max), or None if blank.
+
+    Raises ValueError.
+    """
+    if not text.strip():
+        return None
+    low, sep, high = text.partition("..")
+    if not sep or int(low) > int(high):
+        raise ValueError(f"expected min..max, got {text!r}")
+    return int(low), int(high)
+
+
+class CommandDispatcher:
+    """Per-camera VISCA command queue serviced off the UI thread.
+
+    Commands are keyed by channel (the method name by default). A newer pantilt
+    or zoom replaces one that is still waiting, so only the latest velocity is
+    ever sent and callers never block.
+
+    While no command is waiting and the camera is not being driven, its position
+    is polled with inquiries every poll_interval seconds (0: never), faster until
+    it settles after a command. limits are the soft (min, max) for pan and tilt,
+    or None; while any is set, a pan/tilt drive is still polled, and a drive
+    towards a limit the camera has reached is stopped.
+    """
+
+    POSITION_SIGN = (1, -1)  # Per axis: the sign of speed that raises the position
+
+    def __init__(self, key, camera, poll_interval=0, limits=(None, None)):
+        self.key = key
+        self.camera = camera
+        self.pending = {}         # channel -> (method, args), in arrival order
+        self.cond = threading.Condition()
+        self.running = True
+
+        # Observability
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+        self.rtt_totals = [0.0, 0]
+        self.rtt_ms = RollingHistogram()
+
+        # Position cache
+        self.poll_interval = poll_interval
+        self.limits = limits
+        self.position = None      # (pan, tilt, zoom) from the last inquiry
+        self.settled = False      # the last two inquiries agreed
+        self.drive = (0, 0)       # pan/tilt speeds last sent
+        self.zooming = False      # a zoom speed other than stop was last sent
+        self.inquiries = 0
+        self.inquiry_failures = 0
+        self.next_poll = time.monotonic()
+
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def send(self, method, *args, channel=None):
+        """Queue camera.<method>(*args), replacing any pending command on the same channel"""
+        channel = channel or method
+        with self.cond:
+            if channel in self.pending:
+                self.coalesced += 1
+            self.pending[channel] = (method, args)
+            self.cond.notify()
+
+    def cancel(self, *channels):
+        """Drop any commands still waiting on these channels"""
+        with self.cond:
+            for channel in channels:
+                self.pending.pop(channel, None)
+
+    def depth(self):
+        """Number of commands waiting to be sent"""
+        return len(self.pending)
+
+    def take_rtt(self):
+        """Average round-trip time in ms since the previous call, or None"""
+        with self.cond:
+            total, count = self.rtt_totals
+            self.rtt_totals = [0.0, 0]
+        return total / count if count else None
+
+    def stats(self):
+        """Command counters and round-trip histogram for the stats snapshot"""
+        return {
+            'sent': self.sent,
+            'coalesced': self.coalesced,
+            'failed': self.failed,
+            'queue': self.depth(),
+            'rtt_ms': self.rtt_ms.snapshot(),
+            'inquiries': self.inquiries,
+            'position': self.position
+        }
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+
+    def _poll_wait(self):
+        """Seconds until the next position inquiry is due, or None if never (or not
+        while the camera is driven)"""
+        if not self.poll_interval or self.zooming:
+            return None
+        if self.drive != (0, 0) and not any(self.limits):
+            return None
+        return self.next_poll - time.monotonic()
+
+    def _run(self):
+        # Commands go first; an inquiry only takes the line while none is waiting.
+        # Once stopped, the thread closes the camera's sockets: nothing else uses
+        # them, and a command in flight has finished by then.
+        while True:
+            with self.cond:
+                while self.running and not self.pending:
+                    wait = self._poll_wait()
+                    if wait is not None and wait <= 0:
+                        break
+                    self.cond.wait(wait)
+                if not self.running:
+                    break
+                command = None
+                if self.pending:
+                    command = self.pending.pop(next(iter(self.pending)))
+
+            if command is None:
+                self._poll()
+            else:
+                self._execute(*command)
+        self.camera.close_connection()
+
+    def _execute(self, method, args):
+        if method == "pantilt" and len(args) == 2:
+            args = self._limit(*args)
+            self.drive = args
+        elif method in ("pantilt", "pantilt_home", "pantilt_reset", "recall_preset"):
+            self.drive = (0, 0)
+        if method == "zoom":
+            self.zooming = bool(args[0])
+
+        started = time.perf_counter()
+        try:
+            getattr(self.camera, method)(*args)
+        except Exception as exc:
+            self.failed += 1
+            print(f"{self.key} {method}{args} failed: {exc}")
+        rtt = (time.perf_counter() - started) * 1000
+        self.rtt_ms.add(rtt)
+
+        with self.cond:
+            self.sent += 1
+            self.rtt_totals[0] += rtt
+            self.rtt_totals[1] += 1
+            # The camera may be moving now: watch it closely until it settles
+            self.settled = False
+            self.next_poll = min(self.next_poll, time.monotonic() + POSITION_MOVING_POLL_S)
+
+    def _inquire(self, inquiry):
+        """Run a visca_over_ip inquiry as a single attempt with INQUIRY_TIMEOUT_S on
+        the (shared) inquiry socket, instead of the library's retries"""
+        camera = self.camera
+        retries = camera.num_retries
+        timeout = camera._inq_sock.gettimeout()
+        camera.num_retries = 1
+        camera._inq_sock.settimeout(INQUIRY_TIMEOUT_S)
+        try:
+            return inquiry()
+        finally:
+            camera.num_retries = retries
+            camera._inq_sock.settimeout(timeout)
+
+    def _poll(self):
+        """Refresh the position cache with a pan/tilt and a zoom inquiry"""
+        try:
+            pan, tilt = self._inquire(self.camera.get_pantilt_position)
+            # A command queued meanwhile goes before the zoom inquiry
+            if self.pending and self.position:
+                zoom = self.position[2]
+            else:
+                zoom = self._inquire(self.camera.get_zoom_position)
+        except Exception as exc:
+            if not self.inquiry_failures:
+                print(f"{self.key} position inquiry failed: {exc}")
+            self.inquiry_failures += 1
+            # A camera that does not answer inquiries is asked less and less often
+            self.next_poll = time.monotonic() + self.poll_interval * 2 ** min(self.inquiry_failures, 5)
+            return
+
+        position = (pan, tilt, zoom)
+        self.inquiry_failures = 0
+        self.inquiries += 1
+        self.settled = position == self.position
+        self.position = position
+
+        # A drive is stopped as soon as the camera is seen past a soft limit
+        if self.drive != (0, 0) and self._limit(*self.drive) != self.drive:
+            self._execute("pantilt", self.drive)
+
+        interval = self.poll_interval if self.settled else POSITION_MOVING_POLL_S
+        with self.cond:
+            self.next_poll = time.monotonic() + min(interval, self.poll_interval)
+
+    def _limit(self, pan, tilt):
+        """Zero a pan or tilt speed that would carry the camera further past its
+        soft limit. A positive pan speed (VISCA Right) raises the reported pan
+        position; a negative tilt speed (VISCA Up) raises the tilt position."""
+        if self.position is None:
+            return pan, tilt
+        speeds = [pan, tilt]
+        for axis, limits in enumerate(self.limits):
+            if limits and speeds[axis]:
+                low, high = limits
+                at = self.position[axis]
+                rising = speeds[axis] * self.POSITION_SIGN[axis] > 0
+                if (not rising and at <= low) or (rising and at >= high):
+                    speeds[axis] = 0
+        return tuple(speeds)
+
+
+class MovementController:
+    """Turns the operator's pan/tilt/zoom intent into rate-limited VISCA commands.
+
+    The target is one camera or a group. A command is sent only when the
+    effective vector changes, so key auto-repeat and identical updates cost
+    nothing, and at most max_rate times per second per camera. A stop on any axis
+    is never delayed. A group's cameras are handed each change in the same pass,
+    and every dispatcher sends on its own thread, so they move together. Cameras
+    dropped from the target are stopped.
+
+    Pan and tilt follow a motion profile rather than stepping: on a TICK_S
+    control tick each axis's speed moves towards the target, a speed-up taking
+    ramp_s and a slow-down stop_ramp_s (0: at once), and only a change of the
+    whole VISCA speed is sent. Zoom steps as before.
+    """
+
+    IDLE = (0, 0, 0)
+    TICK_S = 0.05
+
+    def __init__(self, max_rate=10, ramp_s=0.0, stop_ramp_s=0.0):
+        self.interval = 1.0 / max(1, max_rate)
+        self.ramp_s = ramp_s
+        self.stop_ramp_s = stop_ramp_s
+        self.cond = threading.Condition()
+        self.target = None        # ((dispatcher, ...), (pan, tilt, zoom)) currently wanted
+        self.sent = {}            # dispatcher -> last vector sent
+        self.last_send = {}       # dispatcher -> time of last send
+        self.speed = {}           # dispatcher -> ramped (pan, tilt), fractional
+        self.ramps = {}           # dispatcher -> (goal, speed change per ramp) per axis
+        self.ramped_at = {}       # dispatcher -> time of the last step, while ramping
+        self.suppressed = 0       # Updates dropped because nothing changed
+        self.running = True
+        threading.Thread(target=self._run, daemon=True).start()
+
+    def set_target(self, dispatchers, pan, tilt, zoom):
+        """Request a new velocity vector for the cameras behind dispatchers"""
+        dispatchers = tuple(dispatchers)
+        vector = (pan, tilt, zoom)
+        with self.cond:
+            if self.target is not None:
+                previous, wanted = self.target
+                for dispatcher in previous:
+                    if dispatcher not in dispatchers:
+                        self._send(dispatcher, self.IDLE)
+                        for profile in (self.speed, self.ramps, self.ramped_at):
+                            profile.pop(dispatcher, None)
+                if previous == dispatchers and wanted == vector:
+                    self.suppressed += 1
+                    return
+            self.target = (dispatchers, vector)
+            self.cond.notify()
+
+    def reset(self):
+        """Forget all cameras (used when reconnecting)"""
+        with self.cond:
+            self.target = None
+            self.sent.clear()
+            self.last_send.clear()
+            self.speed.clear()
+            self.ramps.clear()
+            self.ramped_at.clear()
+
+    def stop(self):
+        with self.cond:
+            self.running = False
+            self.cond.notify()
+
+    def _send(self, dispatcher, vector):
+        # Called with self.cond held; dispatcher.send() never blocks
+        last = self.sent.get(dispatcher, self.IDLE)
+        if vector[:2] != last[:2]:
+            dispatcher.send('pantilt', vector[0], vector[1])
+        if vector[2] != last[2]:
+            dispatcher.send('zoom', vector[2])
+        self.sent[dispatcher] = vector
+        self.last_send[dispatcher] = time.monotonic()
+
+    def _ramp(self, speed, goal, scale, dt):
+        """One axis's speed moved towards goal for dt seconds, changing by scale
+        per ramp; a reversal slows to 0 first"""
+        slowing = abs(goal) < abs(speed) or goal * speed < 0
+        ramp = self.stop_ramp_s if slowing else self.ramp_s
+        goal = 0.0 if goal * speed < 0 else goal
+        if ramp <= 0:
+            return goal
+        step = scale / ramp * dt
+        return min(speed + step, goal) if goal > speed else max(speed - step, goal)
+
+    @staticmethod
+    def _quantise(speed, goal):
+        """Whole VISCA speed for a ramped one: a moving axis runs at least at 1,
+        and an axis starting towards a goal starts at once"""
+        if not speed:
+            return (goal > 0) - (goal < 0)
+        steps = max(1, round(abs(speed)))
+        return steps if speed > 0 else -steps
+
+    def _profile(self, dispatcher, vector, now):
+        """The vector to send to dispatcher now on the way to vector"""
+        if not (self.ramp_s or self.stop_ramp_s):
+            return vector
+        speed = self.speed.get(dispatcher, (0.0, 0.0))
+        dt = now - self.ramped_at.get(dispatcher, now)
+        goal, scales = self.ramps.get(dispatcher, (None, None))
+        # The slope is set when the goal changes: the larger of the two
+        # speeds is covered in one ramp, so every change takes the same time
+        if goal != vector[:2]:
+            goal = vector[:2]
+            scales = tuple(max(abs(v), abs(g)) for v, g in zip(speed, goal))
+            self.ramps[dispatcher] = (goal, scales)
+        speed = tuple(self._ramp(v, g, scale, dt) for v, g, scale in zip(speed, goal, scales))
+        self.speed[dispatcher] = speed
+        if speed == vector[:2]:
+            self.ramped_at.pop(dispatcher, None)
+        else:
+            self.ramped_at[dispatcher] = now
+        return (self._quantise(speed[0], vector[0]), self._quantise(speed[1], vector[1]),
+                vector[2])
+
+    def _run(self):
+        with self.cond:
+            while self.running:
+                if self.target is None:
+                    self.cond.wait()
+                    continue
+
+                dispatchers, vector = self.target
+                now = time.monotonic()
+                wanted = {dispatcher: self._profile(dispatcher, vector, now)
+                          for dispatcher in dispatchers}
+                # While any camera is still ramping, wake every control tick
+                tick = self.TICK_S if any(dispatcher in self.ramped_at
+                                          for dispatcher in dispatchers) else None
+                behind = [dispatcher for dispatcher in dispatchers
+                          if self.sent.get(dispatcher, self.IDLE) != wanted[dispatcher]]
+                if not behind:
+                    self.cond.wait(tick)
+                    continue
+
+                # Stopping an axis goes out immediately; anything else waits for the rate limit
+                stopping = any(old and not new for dispatcher in behind
+                               for old, new in zip(self.sent.get(dispatcher, self.IDLE),
+                                                   wanted[dispatcher]))
+                wait = (max(self.last_send.get(dispatcher, 0.0) for dispatcher in behind)
+                        + self.interval - now)
+                if wait > 0 and not stopping:
+                    self.cond.wait(min(wait, tick or wait))
+                    continue
+
+                for dispatcher in behind:
+                    self._send(dispatcher, wanted[dispatcher])
+
 
 class PTZApp:
-    def __init__(self, root):
+    # Values a saved camera config may hold, for the fields with a fixed set
+    CONFIG_CHOICES = {
+        'max_fps': FPS_CAPS,
+        'threads': DECODER_THREADS,
+        'transport': TRANSPORTS,
+        'keyframes': KEYFRAME_MODES
+    }
+
+    # Tile text for each stream state until the first frame arrives
+    STREAM_STATE_TEXT = {
+        "connecting": "Connecting…",
+        "live": "Waiting for video…",
+        "stale": "Stream stalled",
+        "reconnecting": "Reconnecting…",
+        "paused": "Paused"
+    }
+
+    def __init__(self, root, decode_mode="thread", decode_workers=2, low_latency=False, command_rate=10,
+                 connect_timeout=CONNECT_TIMEOUT_MS / 1000, stats_overlay=False, stats_file=None,
+                 layout=GridLayout(4, 2), camera_count=8, focus_mode=False, thumbnail_fps=2,
+                 frame_budget=0, cpu_budget=0, config_path=CONFIG_PATH, auto_connect=True,
+                 startup=None, exit_after_startup=False, position_poll=POSITION_POLL_S,
+                 restore_positions=False, ramp=RAMP_S, stop_ramp=STOP_RAMP_S):
         self.root = root
         self.root.title("PTZ Camera Controller — Modern Edition")
         self.root.geometry("1880x980")
@@ -39,30 +1594,100 @@ class PTZApp:
         
         self.root.configure(bg="#000000")
 
+        # Splash screen, painted before anything else is built so the window is up at once
+        self.startup = startup or StartupReport()
+        self.exit_after_startup = exit_after_startup  # Quit once the startup report is printed
+        splash = tk.Label(root,
+                          text="🎥 PTZ Camera Controller\n\nStarting…",
+                          font=('Segoe UI', 14, 'bold'),
+                          bg=self.colors['bg_dark'],
+                          fg=self.colors['text_secondary'])
+        splash.place(relx=0, rely=0, relwidth=1, relheight=1)
+        self.root.update()
+        self.startup.mark("window")
+
         self.cameras = {}
-        self.video_caps = {}
-        self.video_frames = {}
+        self.decode_mode = decode_mode        # "thread" or "process"
+        self.decode_workers = decode_workers  # Pool size in process mode
+        self.decoder = None
+        self.low_latency = tk.BooleanVar(value=low_latency)  # Drain to the newest frame
+        self.connect_timeout_ms = int(connect_timeout * 1000)  # Per-stream open/read timeout
+        # Cameras are created on connector threads and picked up by the Tk loop;
+        # the generation discards results from a superseded connect
+        self.connect_results = queue.Queue()
+        self.connect_generation = 0
+        self.connect_pending = 0
+        self.stream_states = {}   # Last stream state shown on each tile
+        self.rendered_seqs = {}   # Sequence number last drawn for each tile
+        self.latency_totals = {}  # Capture-to-display latency per tile: [sum_ms, count]
+        # Render-side instrumentation per tile (see stats_snapshot)
+        self.show_stats = tk.BooleanVar(value=stats_overlay)  # Per-tile stats overlay
+        self.stats_file = stats_file    # JSON snapshot written once a second, if set
+        self.tile_stats_labels = {}
+        # Pan/tilt/zoom readouts from the dispatchers' position caches
+        self.show_positions = tk.BooleanVar(value=bool(position_poll))
+        self.tile_position_labels = {}
+        self.position_texts = {}  # Readout last shown on each tile
+        self.blit_ms = {}
+        self.display_ms = {}
+        self.render_gaps = {}     # Decoded frames replaced before they were drawn
         self.video_labels = {}
+        self.tile_surfaces = {}   # Persistent PhotoImage per tile
+        self.tile_info_labels = {}  # Small overlay in each tile (latency readout)
         self.camera_name_labels = {}
+        self.tile_sizes = {}      # Target size for capture-side scaling, per tile
+        self.enlarged_key = None  # Tile currently enlarged to fill the grid
+        # Only the cameras on the shown page (or the enlarged one) are decoded
+        # and drawn - see apply_layout
+        self.layout = layout
+        self.layout_var = tk.StringVar(value=str(layout))
+        self.page = 0
+        self.visible_keys = []        # Tiles on screen, the focused one first
+        # Focus mode: the steered camera large from its full stream, the rest of
+        # the page as thumbnails decoded at thumbnail_fps
+        self.focus_mode = tk.BooleanVar(value=focus_mode)
+        self.thumbnail_fps = thumbnail_fps
+        self.grid_area = (GRID_WIDTH, GRID_HEIGHT)  # Follows the window (see on_grid_resize)
+        self.resize_job = None
+        self.stream_targets = {}  # What each decoder stream was last told (see stream_target)
         self.active_cam = None
+        self.active_ptz = None    # CommandDispatcher of the active camera
+        self.dispatchers = {}     # One VISCA command queue per camera
         self.active_name = ""
+        self.group = []           # Cameras driven together with the active one (Ctrl+F-key / Ctrl+click)
 
         self.pressed_keys = set()
         self.move_speed = 6
-        self.running = False
+        self.movement = MovementController(command_rate, ramp, stop_ramp)  # Send-on-change, rate-limited PTZ
+        self.position_poll = position_poll  # Seconds between position inquiries, 0 for none
+        self.restore_positions = tk.BooleanVar(value=restore_positions)  # Return to last position on connect
         self.config_window = None
+        self.video_job = None
+
+        # Redraw counters for the change-driven renderer (reset every second)
+        self.render_drawn = 0
+        self.render_skipped = 0
+        self.render_window_start = time.monotonic()
+
+        # Frame-rate caps handed out by the render budget, by stream
+        self.render_budget = RenderBudget(frame_budget, cpu_budget)
+        self.budget_caps = {}
 
         # Store camera configuration values
-        self.camera_configs = [
-            {'ip': '', 'rtsp': ''},
-            {'ip': '', 'rtsp': ''},
-            {'ip': '', 'rtsp': ''},
-            {'ip': '', 'rtsp': ''},
-            {'ip': '', 'rtsp': ''},
-            {'ip': '', 'rtsp': ''},
-            {'ip': '', 'rtsp': ''},
-            {'ip': '', 'rtsp': ''}
-        ]
+        # 'rtsp' is the full stream, only decoded while the tile is enlarged;
+        # 'preview' is an optional substream used for the grid.
+        # The cameras saved last session come first; camera_count only adds empty slots
+        self.config_path = config_path
+        saved = (load_config(config_path) if config_path else None) or {}
+        self.camera_configs = [self.restore_camera_config(cfg) for cfg in saved.get('cameras', [])]
+        self.camera_configs += [self.new_camera_config()
+                                for _ in range(camera_count - len(self.camera_configs))]
+        self.stream_info = dict(saved.get('streams', {}))  # url -> capture_info() as last seen
+        # ip -> last settled (pan, tilt, zoom)
+        self.positions = {ip: tuple(position) for ip, position in saved.get('positions', {}).items()
+                          if isinstance(position, list) and len(position) == 3
+                          and all(type(value) is int for value in position)}
+        self.position_save_job = None
 
         # ================= UI =================
         # Menu bar
@@ -72,9 +1697,40 @@ class PTZApp:
         config_menu = tk.Menu(menubar, tearoff=0, bg=self.colors['bg_medium'], fg=self.colors['text_primary'])
         menubar.add_cascade(label="Settings", menu=config_menu)
         config_menu.add_command(label="Configure Cameras...", command=self.open_config_window)
+        config_menu.add_checkbutton(label="Low-Latency Capture",
+                                    variable=self.low_latency,
+                                    command=self.apply_low_latency)
+        config_menu.add_checkbutton(label="Pipeline Stats Overlay",
+                                    variable=self.show_stats,
+                                    command=self.apply_stats_overlay)
+        config_menu.add_separator()
+        config_menu.add_checkbutton(label="Return to Last Position on Connect",
+                                    variable=self.restore_positions)
+        config_menu.add_command(label="Return All Cameras to Last Position",
+                                command=lambda: self.return_to_last_position(*self.dispatchers))
         config_menu.add_separator()
         config_menu.add_command(label="Exit", command=root.quit)
         
+        # Grid size and paging
+        view_menu = tk.Menu(menubar, tearoff=0, bg=self.colors['bg_medium'], fg=self.colors['text_primary'])
+        menubar.add_cascade(label="View", menu=view_menu)
+        for name in LAYOUTS:
+            view_menu.add_radiobutton(label=f"{name.replace('x', ' × ')} grid",
+                                      value=name,
+                                      variable=self.layout_var,
+                                      command=self.apply_layout_choice)
+        view_menu.add_separator()
+        view_menu.add_checkbutton(label="Focus on Active Camera",
+                                  variable=self.focus_mode,
+                                  command=self.apply_layout)
+        view_menu.add_checkbutton(label="Position Readout",
+                                  variable=self.show_positions)
+        view_menu.add_separator()
+        view_menu.add_command(label="Previous Page", accelerator="PgUp",
+                              command=lambda: self.show_page(self.page - 1))
+        view_menu.add_command(label="Next Page", accelerator="PgDn",
+                              command=lambda: self.show_page(self.page + 1))
+        
         help_menu = tk.Menu(menubar, tearoff=0, bg=self.colors['bg_medium'], fg=self.colors['text_primary'])
         menubar.add_cascade(label="Help", menu=help_menu)
         help_menu.add_command(label="Controls", command=self.show_controls_help)
@@ -94,7 +1750,8 @@ class PTZApp:
                 fg=self.colors['text_primary']).pack()
         
         tk.Label(header_frame, 
-                text="Arrows: Pan/Tilt • +/-: Zoom • F1-F8: Switch cameras • Settings: Configure",
+                text="Arrows: Pan/Tilt • +/-: Zoom • 0-9: Presets • F1-F12 / click: Switch cameras (Ctrl: group) • PgUp/PgDn: Page • "
+                     "Double-click: Enlarge • Settings: Configure",
                 font=('Segoe UI', 8),
                 bg=self.colors['bg_medium'],
                 fg=self.colors['text_secondary']).pack(pady=(3, 0))
@@ -125,6 +1782,30 @@ class PTZApp:
                                      fg=self.colors['text_secondary'])
         self.status_label.pack(side="left")
         
+        # Current page, layout and camera count
+        self.page_label = tk.Label(control_panel,
+                                   text="",
+                                   font=('Consolas', 9),
+                                   bg=self.colors['bg_medium'],
+                                   fg=self.colors['text_secondary'])
+        self.page_label.pack(side="left", padx=20)
+        
+        # Render statistics (redraws vs. skipped unchanged frames)
+        self.render_stats_label = tk.Label(control_panel,
+                                           text="",
+                                           font=('Consolas', 9),
+                                           bg=self.colors['bg_medium'],
+                                           fg=self.colors['text_secondary'])
+        self.render_stats_label.pack(side="left", padx=20)
+        
+        # PTZ command queue depth and round-trip time for the active camera
+        self.ptz_stats_label = tk.Label(control_panel,
+                                        text="",
+                                        font=('Consolas', 9),
+                                        bg=self.colors['bg_medium'],
+                                        fg=self.colors['text_secondary'])
+        self.ptz_stats_label.pack(side="left", padx=20)
+        
         # Speed control
         speed_frame = tk.Frame(top_frame, 
                               bg=self.colors['bg_light'],
@@ -184,45 +1865,92 @@ class PTZApp:
         # ================= VIDEO GRID =================
         video_container = tk.Frame(root, bg="#000000")
         video_container.pack(fill="both", expand=True, padx=1, pady=1)
+        video_container.bind("<Configure>", self.on_grid_resize)
         
         self.video_frame = tk.Frame(video_container, bg="#000000")
         self.video_frame.pack(fill="both", expand=True)
 
-        for i in range(8):
-            # Container for each camera view - FIXED SIZE
-            cam_container = tk.Frame(self.video_frame, 
-                                    bg="#000000",
-                                    highlightbackground="#ffffff",
-                                    highlightthickness=1,
-                                    width=465,
-                                    height=430)
-            cam_container.grid(row=i//4, column=i%4, padx=0, pady=0, sticky="nsew")
-            cam_container.grid_propagate(False)  # Prevent container from resizing to contents
-            
-            # Video display label (no separate name label)
-            lbl = tk.Label(cam_container, 
-                          bg="#000000",
-                          text=f"F{i+1}\nNo Signal",
-                          font=('Segoe UI', 10),
-                          fg="#666666",
-                          bd=0,
-                          padx=0,
-                          pady=0,
-                          highlightthickness=0)
-            lbl.pack(fill="both", expand=True, padx=0, pady=0)
-            self.video_labels[f"F{i+1}"] = lbl
-            
-            # Store label reference for active camera highlighting (optional)
-            self.camera_name_labels[f"F{i+1}"] = lbl
-        
-        # Make video grid with FIXED equal cells (no fighting)
-        for i in range(2):
-            self.video_frame.grid_rowconfigure(i, weight=0, minsize=430)
-        for i in range(4):
-            self.video_frame.grid_columnconfigure(i, weight=0, minsize=465)
+        for key in self.camera_keys():
+            self.build_tile(key)
+        self.apply_layout()
         
         # Force widget size calculation
+        splash.destroy()
         self.root.update()
+        self.startup.mark("interface")
+
+        # One global keyboard hook for the app's lifetime, so paging works before
+        # any camera is connected (the Linux build's bind_all does the same)
+        keyboard.hook(self.on_key_event)
+
+        # Connecting runs in the background, so the saved wall comes up on its
+        # own without holding up the window
+        connect = auto_connect and any(cfg['ip'] for cfg in self.camera_configs)
+        if connect:
+            self.startup.expected.add("first_frame")
+        self.root.after_idle(self.load_libraries, list(LAZY_MODULES), connect)
+        self.root.after(100, self.report_startup)
+
+    def build_tile(self, key):
+        """Create the widgets of one camera tile; apply_layout places it on the grid"""
+        # Container for each camera view - FIXED SIZE
+        cam_container = tk.Frame(self.video_frame, 
+                                bg="#000000",
+                                highlightbackground="#ffffff",
+                                highlightthickness=1,
+                                width=TILE_WIDTH,
+                                height=TILE_HEIGHT)
+        cam_container.pack_propagate(False)  # Prevent container from resizing to contents
+        
+        # Video display label (no separate name label)
+        lbl = tk.Label(cam_container, 
+                      bg="#000000",
+                      text=f"{key}\nNo Signal",
+                      font=('Segoe UI', 10),
+                      fg="#666666",
+                      bd=0,
+                      padx=0,
+                      pady=0,
+                      highlightthickness=0)
+        lbl.pack(fill="both", expand=True, padx=0, pady=0)
+        
+        # Click takes control of the camera; double-click enlarges the tile
+        # (and switches it to the full stream)
+        lbl.bind("<Button-1>", lambda event, k=key: self.on_tile_click(k, event.state & self.CONTROL_MASK))
+        lbl.bind("<Double-Button-1>", lambda event, k=key: self.toggle_enlarged(k))
+        
+        self.video_labels[key] = lbl
+        
+        # Overlay for per-tile readouts, placed once there is something to show
+        self.tile_info_labels[key] = tk.Label(cam_container,
+                                              text="",
+                                              font=('Consolas', 8),
+                                              bg="#000000",
+                                              fg=self.colors['success'],
+                                              padx=3,
+                                              pady=0)
+
+        # Pipeline stats overlay in the bottom-left corner
+        self.tile_stats_labels[key] = tk.Label(cam_container,
+                                               text="",
+                                               font=('Consolas', 8),
+                                               bg="#000000",
+                                               fg=self.colors['text_secondary'],
+                                               justify='left',
+                                               padx=3,
+                                               pady=0)
+
+        # Pan/tilt/zoom readout in the top-right corner
+        self.tile_position_labels[key] = tk.Label(cam_container,
+                                                  text="",
+                                                  font=('Consolas', 8),
+                                                  bg="#000000",
+                                                  fg=self.colors['text_secondary'],
+                                                  padx=3,
+                                                  pady=0)
+        
+        # Store label reference for active camera highlighting (optional)
+        self.camera_name_labels[key] = lbl
 
     # ================= CONFIGURATION WINDOW =================
     
@@ -235,7 +1963,7 @@ class PTZApp:
         
         self.config_window = Toplevel(self.root)
         self.config_window.title("Camera Configuration")
-        self.config_window.geometry("1000x900")
+        self.config_window.geometry("1000x1000")
         self.config_window.configure(bg=self.colors['bg_dark'])
         
         # Make it modal
@@ -253,21 +1981,46 @@ class PTZApp:
                 fg=self.colors['text_primary']).pack(pady=15)
         
         tk.Label(header_frame,
-                text="Configure IP addresses for PTZ control and RTSP URLs for video streams (8 cameras supported)",
+                text="Configure IP addresses for PTZ control, RTSP URLs and optional preview substreams",
                 font=('Segoe UI', 9),
                 bg=self.colors['bg_medium'],
                 fg=self.colors['text_secondary']).pack(pady=(0, 15))
         
-        # Configuration container
-        config_container = tk.Frame(self.config_window, bg=self.colors['bg_dark'])
-        config_container.pack(fill="both", expand=True, padx=20, pady=10)
+        # Button frame (packed first so the list below cannot push it off screen)
+        button_frame = tk.Frame(self.config_window, bg=self.colors['bg_dark'])
+        button_frame.pack(side="bottom", pady=20)
+        
+        # Scrollable configuration container, so any number of cameras fits
+        scroll_frame = tk.Frame(self.config_window, bg=self.colors['bg_dark'])
+        scroll_frame.pack(fill="both", expand=True, padx=20, pady=10)
+        
+        canvas = tk.Canvas(scroll_frame, bg=self.colors['bg_dark'], highlightthickness=0)
+        scrollbar = tk.Scrollbar(scroll_frame, orient="vertical", command=canvas.yview)
+        canvas.configure(yscrollcommand=scrollbar.set)
+        scrollbar.pack(side="right", fill="y")
+        canvas.pack(side="left", fill="both", expand=True)
+        
+        config_container = tk.Frame(canvas, bg=self.colors['bg_dark'])
+        container_id = canvas.create_window((0, 0), window=config_container, anchor="nw")
+        config_container.bind("<Configure>",
+                              lambda event: canvas.configure(scrollregion=canvas.bbox("all")))
+        canvas.bind("<Configure>",
+                    lambda event: canvas.itemconfigure(container_id, width=event.width))
+        self.config_window.bind("<MouseWheel>",
+                                lambda event: canvas.yview_scroll(int(-event.delta / 120), "units"))
         
         # Store entry widgets temporarily
         ip_entries = []
         rtsp_entries = []
+        preview_entries = []
+        fps_vars = []
+        decoder_vars = []
+        limit_entries = []
+        # Rows past the current cameras are new ones, added on Connect
+        configs = list(self.camera_configs)
         
-        # Camera configuration grid
-        for i in range(8):
+        def add_row(i):
+            """Add the configuration row of camera i"""
             cam_frame = tk.Frame(config_container,
                                 bg=self.colors['bg_light'],
                                 relief=tk.FLAT,
@@ -283,7 +2036,7 @@ class PTZApp:
                            fg=self.colors['text_primary'],
                            padx=10,
                            pady=2)
-            badge.grid(row=0, column=0, rowspan=2, padx=(10, 15), pady=10, sticky="ns")
+            badge.grid(row=0, column=0, rowspan=5, padx=(10, 15), pady=10, sticky="ns")
             
             # IP Configuration
             tk.Label(cam_frame,
@@ -302,17 +2055,35 @@ class PTZApp:
                             relief=tk.FLAT,
                             highlightbackground=self.colors['border'],
                             highlightthickness=1)
-            ip_ent.insert(0, self.camera_configs[i]['ip'])
+            ip_ent.insert(0, configs[i]['ip'])
             ip_ent.grid(row=0, column=2, padx=5, pady=(10, 2), sticky="w")
             ip_entries.append(ip_ent)
             
-            # RTSP Configuration
+            # Display frame-rate cap
+            tk.Label(cam_frame,
+                    text="Max FPS:",
+                    font=('Segoe UI', 9),
+                    bg=self.colors['bg_light'],
+                    fg=self.colors['text_secondary']).grid(row=0, column=3, sticky="e", padx=(20, 5), pady=(10, 2))
+            
+            fps_var = tk.StringVar(value=configs[i]['max_fps'])
+            fps_menu = tk.OptionMenu(cam_frame, fps_var, *FPS_CAPS)
+            fps_menu.config(font=('Segoe UI', 8),
+                            bg=self.colors['bg_dark'],
+                            fg=self.colors['text_primary'],
+                            activebackground=self.colors['accent'],
+                            relief=tk.FLAT,
+                            highlightthickness=0)
+            fps_menu.grid(row=0, column=4, padx=(5, 10), pady=(10, 2), sticky="w")
+            fps_vars.append(fps_var)
+            
+            # RTSP Configuration (full stream)
             tk.Label(cam_frame,
                     text="RTSP URL:",
                     font=('Segoe UI', 9),
                     bg=self.colors['bg_light'],
                     fg=self.colors['text_secondary'],
-                    anchor="w").grid(row=1, column=1, sticky="w", padx=5, pady=(2, 10))
+                    anchor="w").grid(row=1, column=1, sticky="w", padx=5, pady=2)
             
             rtsp_ent = tk.Entry(cam_frame,
                                width=55,
@@ -323,18 +2094,184 @@ class PTZApp:
                                relief=tk.FLAT,
                                highlightbackground=self.colors['border'],
                                highlightthickness=1)
-            rtsp_ent.insert(0, self.camera_configs[i]['rtsp'])
-            rtsp_ent.grid(row=1, column=2, padx=5, pady=(2, 10), sticky="w")
+            rtsp_ent.insert(0, configs[i]['rtsp'])
+            rtsp_ent.grid(row=1, column=2, columnspan=3, padx=5, pady=2, sticky="w")
             rtsp_entries.append(rtsp_ent)
+            
+            # Preview substream used for the grid
+            tk.Label(cam_frame,
+                    text="Preview URL:",
+                    font=('Segoe UI', 9),
+                    bg=self.colors['bg_light'],
+                    fg=self.colors['text_secondary'],
+                    anchor="w").grid(row=2, column=1, sticky="w", padx=5, pady=2)
+            
+            preview_ent = tk.Entry(cam_frame,
+                                   width=55,
+                                   font=('Consolas', 9),
+                                   bg=self.colors['bg_dark'],
+                                   fg=self.colors['text_primary'],
+                                   insertbackground=self.colors['text_primary'],
+                                   relief=tk.FLAT,
+                                   highlightbackground=self.colors['border'],
+                                   highlightthickness=1)
+            preview_ent.insert(0, configs[i]['preview'])
+            preview_ent.grid(row=2, column=2, columnspan=3, padx=5, pady=2, sticky="w")
+            preview_entries.append(preview_ent)
+            
+            # Decoder options
+            tk.Label(cam_frame,
+                    text="Decoder:",
+                    font=('Segoe UI', 9),
+                    bg=self.colors['bg_light'],
+                    fg=self.colors['text_secondary'],
+                    anchor="w").grid(row=3, column=1, sticky="w", padx=5, pady=2)
+            
+            decoder_frame = tk.Frame(cam_frame, bg=self.colors['bg_light'])
+            decoder_frame.grid(row=3, column=2, columnspan=3, padx=5, pady=2, sticky="w")
+            cfg = configs[i]
+            decoder = {
+                'threads': tk.StringVar(value=cfg['threads']),
+                'transport': tk.StringVar(value=cfg['transport']),
+                'keyframes': tk.StringVar(value=cfg['keyframes']),
+                'low_delay': tk.BooleanVar(value=cfg['low_delay'])
+            }
+            for label, name, choices in (("Threads", 'threads', DECODER_THREADS),
+                                         ("Transport", 'transport', TRANSPORTS),
+                                         ("Keyframes only", 'keyframes', KEYFRAME_MODES)):
+                tk.Label(decoder_frame,
+                        text=f"{label}:",
+                        font=('Segoe UI', 8),
+                        bg=self.colors['bg_light'],
+                        fg=self.colors['text_secondary']).pack(side="left", padx=(0, 3))
+                menu = tk.OptionMenu(decoder_frame, decoder[name], *choices)
+                menu.config(font=('Segoe UI', 8),
+                            bg=self.colors['bg_dark'],
+                            fg=self.colors['text_primary'],
+                            activebackground=self.colors['accent'],
+                            relief=tk.FLAT,
+                            highlightthickness=0)
+                menu.pack(side="left", padx=(0, 10))
+            
+            tk.Checkbutton(decoder_frame,
+                           text="Low delay",
+                           variable=decoder['low_delay'],
+                           font=('Segoe UI', 8),
+                           bg=self.colors['bg_light'],
+                           fg=self.colors['text_secondary'],
+                           selectcolor=self.colors['bg_dark'],
+                           activebackground=self.colors['bg_light'],
+                           highlightthickness=0).pack(side="left", padx=(0, 10))
+            decoder_vars.append(decoder)
+            
+            probe_label = tk.Label(decoder_frame,
+                                   text="",
+                                   font=('Segoe UI', 8),
+                                   bg=self.colors['bg_light'],
+                                   fg=self.colors['text_secondary'])
+            
+            def probe():
+                """Benchmark the options on the stream the grid decodes, for Max FPS (or PROBE_TARGET_FPS)"""
+                url = preview_ent.get().strip() or rtsp_ent.get().strip()
+                if not url:
+                    probe_label.config(text="Enter an RTSP URL first")
+                    return
+                target = FPS_CAPS[fps_var.get()] or PROBE_TARGET_FPS
+                probe_label.config(text=f"Probing for {target} fps…")
+                self.run_probe(url, target, TRANSPORTS[decoder['transport'].get()], probed)
+            
+            def probed(best):
+                """Select the options the probe picked"""
+                if not probe_label.winfo_exists():
+                    return
+                if best is None:
+                    probe_label.config(text="Probe failed: no frames")
+                    return
+                options = best['options']
+                decoder['threads'].set(next(name for name, threads in DECODER_THREADS.items()
+                                            if threads == options['threads']))
+                if options.get('keyframes_only'):
+                    decoder['keyframes'].set("Always")
+                elif decoder['keyframes'].get() == "Always":
+                    decoder['keyframes'].set("Never")
+                probe_label.config(text=f"→ {describe_decoder_options(options)}: "
+                                        f"{best['fps']:.0f} fps, {best['cpu_pct']:.0f}% CPU")
+            
+            tk.Button(decoder_frame,
+                      text="Probe",
+                      command=probe,
+                      bg=self.colors['bg_dark'],
+                      fg=self.colors['text_primary'],
+                      font=('Segoe UI', 8),
+                      relief=tk.FLAT,
+                      cursor="hand2",
+                      padx=8,
+                      pady=1).pack(side="left", padx=(0, 6))
+            probe_label.pack(side="left")
+
+            # Soft limits, in the units of the position readout
+            tk.Label(cam_frame,
+                    text="Soft limits:",
+                    font=('Segoe UI', 9),
+                    bg=self.colors['bg_light'],
+                    fg=self.colors['text_secondary'],
+                    anchor="w").grid(row=4, column=1, sticky="w", padx=5, pady=(2, 10))
+
+            limits_frame = tk.Frame(cam_frame, bg=self.colors['bg_light'])
+            limits_frame.grid(row=4, column=2, columnspan=3, padx=5, pady=(2, 10), sticky="w")
+            limits = {}
+            for label, name in (("Pan", 'pan_limits'), ("Tilt", 'tilt_limits')):
+                tk.Label(limits_frame,
+                         text=f"{label}:",
+                         font=('Segoe UI', 8),
+                         bg=self.colors['bg_light'],
+                         fg=self.colors['text_secondary']).pack(side="left", padx=(0, 3))
+                limits[name] = tk.Entry(limits_frame,
+                                        width=14,
+                                        font=('Consolas', 9),
+                                        bg=self.colors['bg_dark'],
+                                        fg=self.colors['text_primary'],
+                                        insertbackground=self.colors['text_primary'],
+                                        relief=tk.FLAT,
+                                        highlightbackground=self.colors['border'],
+                                        highlightthickness=1)
+                limits[name].insert(0, configs[i][name])
+                limits[name].pack(side="left", padx=(0, 10))
+            tk.Label(limits_frame,
+                     text="min..max from the position readout, blank for none",
+                     font=('Segoe UI', 8),
+                     bg=self.colors['bg_light'],
+                     fg=self.colors['text_secondary']).pack(side="left")
+            limit_entries.append(limits)
         
-        # Button frame
-        button_frame = tk.Frame(self.config_window, bg=self.colors['bg_dark'])
-        button_frame.pack(pady=20)
+        # Camera configuration grid
+        for i in range(len(configs)):
+            add_row(i)
+        
+        def add_camera():
+            """Add a row for a new camera; it only joins the wall on Connect"""
+            configs.append(self.new_camera_config())
+            add_row(len(configs) - 1)
+        
+        # Add camera button
+        add_btn = tk.Button(button_frame,
+                           text="＋ Add Camera",
+                           command=add_camera,
+                           bg=self.colors['bg_light'],
+                           fg=self.colors['text_primary'],
+                           font=('Segoe UI', 10),
+                           relief=tk.FLAT,
+                           cursor="hand2",
+                           padx=30,
+                           pady=12)
+        add_btn.pack(side="left", padx=10)
         
         # Connect button
         connect_btn = tk.Button(button_frame,
                                text="⚡ CONNECT & START",
-                               command=lambda: self.connect_and_close(ip_entries, rtsp_entries),
+                               command=lambda: self.connect_and_close(ip_entries, rtsp_entries,
+                                                                      preview_entries, fps_vars,
+                                                                      decoder_vars, limit_entries),
                                bg=self.colors['accent'],
                                fg=self.colors['text_primary'],
                                font=('Segoe UI', 11, 'bold'),
@@ -357,12 +2294,39 @@ class PTZApp:
                              pady=12)
         close_btn.pack(side="left", padx=10)
     
-    def connect_and_close(self, ip_entries, rtsp_entries):
+    def connect_and_close(self, ip_entries, rtsp_entries, preview_entries, fps_vars,
+                          decoder_vars, limit_entries):
         """Save configuration, connect cameras and close configuration window"""
+        for i in range(len(ip_entries)):
+            for name, entry in limit_entries[i].items():
+                try:
+                    parse_limits(entry.get())
+                except ValueError:
+                    messagebox.showerror("Invalid Soft Limit",
+                                         f"CAM {i+1}: {name.split('_')[0]} limits must be min..max "
+                                         f"(e.g. -1200..1200) or blank.",
+                                         parent=self.config_window)
+                    return
+
+        # Cameras added in the dialog join the wall now
+        added = len(ip_entries) - len(self.camera_configs)
+        for _ in range(added):
+            self.camera_configs.append(self.new_camera_config())
+            self.build_tile(f"F{len(self.camera_configs)}")
+        if added:
+            self.apply_layout()
+
         # Save the configuration
-        for i in range(8):
+        for i in range(len(ip_entries)):
             self.camera_configs[i]['ip'] = ip_entries[i].get().strip()
             self.camera_configs[i]['rtsp'] = rtsp_entries[i].get().strip()
+            self.camera_configs[i]['preview'] = preview_entries[i].get().strip()
+            self.camera_configs[i]['max_fps'] = fps_vars[i].get()
+            for name, var in decoder_vars[i].items():
+                self.camera_configs[i][name] = var.get()
+            for name, entry in limit_entries[i].items():
+                self.camera_configs[i][name] = entry.get().strip()
+        self.save_camera_config()
         
         self.connect_cameras()
         if self.config_window:
@@ -377,100 +2341,545 @@ class PTZApp:
             "• + / =: Zoom in\n"
             "• - : Zoom out\n"
             "• Speed Slider: Adjust movement speed\n\n"
+            "Presets:\n"
+            "• 0-9: Recall that preset on the active camera\n"
+            "• Ctrl + 0-9: Store the active camera's position as that preset\n"
+            "• Alt + 0-9: Scene - recall that preset on every camera at once\n"
+            "• Ctrl + Alt + 0-9: Store that preset on every camera\n\n"
             "Camera Selection:\n"
-            "• F1-F8: Control Camera 1-8\n\n"
+            "• F1-F12: Control the 1st-12th camera on the page\n"
+            "• Click a tile: Control that camera\n"
+            "• Ctrl + F-key / Ctrl + click: Add that camera to the group driven\n"
+            "  with the active one, or take it out (F-key / click ends the group)\n"
+            "• Double-click a tile: Enlarge it (full stream) / restore grid\n\n"
+            "Layout:\n"
+            "• View → grid size; PgUp / PgDn: Previous / next page\n"
+            "• Only the cameras on screen are decoded; all stay controllable\n\n"
             "Configuration:\n"
-            "• Settings → Configure Cameras: Set IP and RTSP URLs"
+            "• Settings → Configure Cameras: Set IP, RTSP and preview URLs, add cameras\n"
+            "• Soft limits (pan / tilt min..max): a drive stops at that position\n"
+            "• View → Position Readout: Pan, tilt and zoom on each tile"
         )
         messagebox.showinfo("Controls Help", help_text)
 
     # ================= CONNECT =================
 
     def connect_cameras(self):
+        # Connector and decode threads must find the libraries loaded
+        preload_modules()
 
-        keyboard.unhook_all()
-        self.running = False
-        time.sleep(0.3)
-
-        for cap in self.video_caps.values():
-            cap.release()
+        self.stop_decoder()
+        for dispatcher in self.dispatchers.values():
+            dispatcher.stop()
 
         self.cameras.clear()
-        self.video_caps.clear()
-        self.video_frames.clear()
+        self.dispatchers.clear()
+        self.movement.reset()
+        self.pressed_keys.clear()
+        self.active_cam = None
+        self.active_ptz = None
+        self.group = []
+        self.rendered_seqs.clear()
+        self.latency_totals.clear()
+        self.stream_states.clear()
+        self.blit_ms.clear()
+        self.display_ms.clear()
+        self.render_gaps.clear()
+        for key in self.tile_info_labels:
+            self.set_tile_info(key, "")
+            self.tile_position_labels[key].place_forget()
+        self.position_texts.clear()
+        self.update_active_camera_display()
 
-        for i in range(8):
+        ips = {}
+        streams = {}
 
-            ip = self.camera_configs[i]['ip']
-            rtsp = self.camera_configs[i]['rtsp']
+        for i in range(len(self.camera_configs)):
 
             cam_key = f"F{i+1}"
 
+            ip = self.camera_configs[i]['ip']
+            rtsp = self.stream_url(cam_key)
+
             if ip:
-                try:
-                    self.cameras[cam_key] = Camera(ip)
-                except:
-                    pass
+                ips[cam_key] = ip
 
+            # Streams are opened by the decoder's workers, off the Tk thread
             if rtsp:
-                cap = cv2.VideoCapture(rtsp, cv2.CAP_FFMPEG)
+                streams[cam_key] = dict(self.stream_target(cam_key),
+                                        low_latency=self.low_latency.get(),
+                                        timeout_ms=self.connect_timeout_ms)
 
-                # Force TCP
-                cap.set(cv2.CAP_PROP_BUFFERSIZE, 2)
+        if not ips:
+            messagebox.showwarning("No Cameras", "Please configure at least one camera IP address.\n\nGo to Settings → Configure Cameras to add camera configurations.")
+            return
 
-                if not cap.isOpened():
-                    print(f"{cam_key} failed to open stream")
-                else:
-                    print(f"{cam_key} stream connected")
+        # Connect to every camera at once; each one becomes controllable as soon
+        # as it is ready, so an unreachable address cannot hold up the others
+        self.connect_generation += 1
+        self.connect_pending = len(ips)
+        for cam_key, ip in ips.items():
+            threading.Thread(target=self._connect_camera,
+                             args=(self.connect_generation, cam_key, ip),
+                             daemon=True).start()
 
-                self.video_caps[cam_key] = cap
-                self.video_frames[cam_key] = None
+        self.status_indicator.config(fg=self.colors['warning'])
+        self.status_label.config(text=f"Connecting • 0/{len(ips)} cameras ready",
+                                 fg=self.colors['warning'])
+
+        # Start decoding on threads or in the process pool
+        if self.decode_mode == "process":
+            capacity = (self.root.winfo_screenwidth(), self.root.winfo_screenheight())
+            self.decoder = ProcessDecoder(self.decode_workers, capacity,
+                                          {key: self.frame_capacity(key, capacity) for key in streams})
+        else:
+            self.decoder = ThreadDecoder()
+        self.decoder.start(streams)
+        self.stream_targets = {key: self.stream_target(key) for key in streams}
+
+        # Reconnecting must not stack a second render loop on top of the first
+        if self.video_job is not None:
+            self.root.after_cancel(self.video_job)
+        self.update_video()
 
-        if not self.cameras:
-            messagebox.showwarning("No Cameras", "Please configure at least one camera IP address.\n\nGo to Settings → Configure Cameras to add camera configurations.")
-            return
+    def _connect_camera(self, generation, key, ip):
+        """Create the VISCA connection for one camera (connector thread)"""
+        try:
+            camera = open_camera(ip)
+        except Exception as exc:
+            print(f"{key} failed to connect to {ip}: {exc}")
+            camera = None
+        self.connect_results.put((generation, key, camera))
+
+    def poll_connections(self):
+        """Adopt cameras whose connector threads have finished (called from the render loop)"""
+        while True:
+            try:
+                generation, key, camera = self.connect_results.get_nowait()
+            except queue.Empty:
+                return
+
+            # Result of a connect that has since been replaced
+            if generation != self.connect_generation:
+                if camera is not None:
+                    camera.close_connection()
+                continue
 
-        self.active_name = list(self.cameras.keys())[0]
-        self.active_cam = self.cameras[self.active_name]
-        
+            self.connect_pending -= 1
+            if camera is not None:
+                self.cameras[key] = camera
+                self.dispatchers[key] = CommandDispatcher(key, camera, self.position_poll,
+                                                          self.soft_limits(key))
+                if self.restore_positions.get():
+                    self.return_to_last_position(key)
+                # The first camera to answer takes control
+                if self.active_cam is None:
+                    self.select_camera(key)
+
+            self.update_connection_status()
+
+    def update_connection_status(self):
+        """Show connection progress, or which camera is being controlled"""
+        ready = len(self.cameras)
+        total = ready + self.connect_pending
+
+        if self.connect_pending:
+            color = 'warning'
+            if self.active_cam is not None:
+                text = f"Controlling {' + '.join(self.driven_keys())} • {ready}/{total} cameras ready"
+            else:
+                text = f"Connecting • {ready}/{total} cameras ready"
+        elif self.active_cam is not None:
+            color = 'success'
+            text = f"Connected • Controlling {' + '.join(self.driven_keys())}"
+        else:
+            color = 'accent'
+            text = "No cameras reachable"
+
+        self.status_indicator.config(fg=self.colors[color])
+        self.status_label.config(text=text, fg=self.colors[color])
+
+    def select_camera(self, key):
+        """Make a connected camera the one steered by the keyboard, ending any group"""
+        self.active_cam = self.cameras[key]
+        self.active_ptz = self.dispatchers[key]
+        self.active_name = key
+        self.group = []
         self.update_active_camera_display()
-        self.status_indicator.config(fg=self.colors['success'])
-        self.status_label.config(text=f"Connected • Controlling {self.active_name}",
-                                 fg=self.colors['success'])
-
-        keyboard.hook(self.on_key_event)
+        self.update_connection_status()
+        # Held keys now drive the new camera; the old one is stopped
+        self.update_movement()
+
+    def toggle_group(self, key):
+        """Add a camera to the group driven with the active one, or take it out"""
+        if self.active_cam is None:
+            self.select_camera(key)
+            return
+        if key == self.active_name:
+            return
+        if key in self.group:
+            self.group.remove(key)
+        else:
+            self.group.append(key)
+        self.update_active_camera_display()
+        self.update_connection_status()
+        self.update_movement()
+
+    def driven_keys(self):
+        """The active camera first, then the rest of the group in the order added"""
+        return [self.active_name] + self.group
+
+    # ================= CAPTURE =================
+
+    def run_probe(self, url, target_fps, transport, done):
+        """Run the decoder probe in a process of its own and call done(best) on the Tk thread.
+
+        A separate process keeps the other streams out of the CPU measurement
+        and the UI responsive while the probe runs.
+        """
+        context = multiprocessing.get_context("spawn")
+        results = context.Queue()
+        process = context.Process(target=probe_process_main,
+                                  args=(url, target_fps, transport, results),
+                                  daemon=True)
+        process.start()
+
+        def poll():
+            while True:
+                try:
+                    kind, value = results.get_nowait()
+                except queue.Empty:
+                    break
+                if kind == "done":
+                    process.join(timeout=1)
+                    done(value)
+                    return
+                cpu = f"{value['cpu_pct']:.0f}% CPU" if value['cpu_pct'] is not None else "failed"
+                print(f"probe {describe_decoder_options(value['options'])}: {value['fps']:.1f} fps, {cpu}")
+
+            # The probe process died without a result
+            if process.exitcode is not None and results.empty():
+                done(None)
+                return
+            self.root.after(250, poll)
+
+        self.root.after(250, poll)
+
+    def load_libraries(self, pending, connect):
+        """Import the heavy modules one per idle callback, then connect if asked to.
+
+        The painted window keeps handling events between the imports.
+        """
+        if pending:
+            pending.pop(0).load()
+            self.root.after_idle(self.load_libraries, pending, connect)
+            return
 
-        self.running = True
+        self.startup.mark("libraries")
+        if connect:
+            self.connect_cameras()
 
-        # Start capture threads
-        for key in self.video_caps:
-            threading.Thread(target=self.capture_loop,
-                             args=(key,),
-                             daemon=True).start()
+    def report_startup(self):
+        """Print the startup report once complete (or after STARTUP_REPORT_S, without the missing milestones)"""
+        if not self.startup.complete() and time.perf_counter() - STARTED < STARTUP_REPORT_S:
+            self.root.after(100, self.report_startup)
+            return
 
-        self.update_video()
+        print(f"Startup: {self.startup.text()}")
+        if self.exit_after_startup:
+            self.root.quit()
+
+    def stop_decoder(self):
+        """Stop all capture threads or pool processes"""
+        if self.decoder is not None:
+            self.decoder.stop()
+            self.decoder = None
+        self.budget_caps = {}
+        self.render_budget.reset()
+
+    def apply_low_latency(self):
+        """Switch running streams in or out of low-latency capture"""
+        for key in (self.decoder.keys() if self.decoder else ()):
+            self.decoder.update(key, low_latency=self.low_latency.get())
+
+    # ================= STREAMS =================
+
+    def new_camera_config(self):
+        """Empty configuration entry for one camera"""
+        return {'ip': '', 'rtsp': '', 'preview': '', 'max_fps': 'Source',
+                'threads': 'Auto', 'transport': 'TCP', 'keyframes': 'Never', 'low_delay': False,
+                'pan_limits': '', 'tilt_limits': ''}
+
+    def restore_camera_config(self, saved):
+        """A saved camera config with unknown fields dropped and missing or invalid ones at their defaults"""
+        cfg = self.new_camera_config()
+        if not isinstance(saved, dict):
+            return cfg
+        for name, default in cfg.items():
+            value = saved.get(name, default)
+            choices = self.CONFIG_CHOICES.get(name)
+            if type(value) is type(default) and (choices is None or value in choices):
+                cfg[name] = value
+        return cfg
+
+    def save_camera_config(self):
+        """Save the camera configuration, with the stream info and positions of the
+        URLs and IPs still configured"""
+        if not self.config_path:
+            return
+        urls = {cfg[name] for cfg in self.camera_configs for name in ('rtsp', 'preview')}
+        ips = {cfg['ip'] for cfg in self.camera_configs}
+        data = {
+            'version': CONFIG_VERSION,
+            'cameras': self.camera_configs,
+            'streams': {url: info for url, info in self.stream_info.items() if url in urls},
+            'positions': {ip: list(position) for ip, position in self.positions.items() if ip in ips}
+        }
+        try:
+            save_config(self.config_path, data)
+        except OSError as e:
+            print(f"Could not save the camera configuration to {self.config_path}: {e}")
+
+    def update_stream_info(self):
+        """Pick up the capture_info() of newly opened streams.
+
+        Saved when it changed, so the next start knows each stream before it opens.
+        """
+        changed = False
+        for key in self.decoder.keys():
+            source = dict(self.decoder.stats(key).get('source') or {})
+            url = source.pop('url', None)
+            if url and self.stream_info.get(url) != source:
+                self.stream_info[url] = source
+                changed = True
+        if changed:
+            self.save_camera_config()
+
+    def stream_info_text(self, key):
+        """'1920×1080 • H264 • 25 fps' as last seen on the stream the tile decodes ('' if unknown)"""
+        info = self.stream_info.get(self.stream_url(key))
+        if not info or not info.get('width'):
+            return ""
+        parts = [f"{info['width']}×{info['height']}", info.get('codec')]
+        if info.get('fps'):
+            parts.append(f"{info['fps']:g} fps")
+        return " • ".join(part for part in parts if part)
+
+    def frame_capacity(self, key, screen):
+        """Largest picture a stream can deliver on a screen.
+
+        The cached resolution of each URL the camera may decode, fitted to the
+        screen; the screen itself while any of them is unknown.
+        """
+        cfg = self.config_for(key)
+        sizes = []
+        for url in {cfg['rtsp'], cfg['preview']} - {""}:
+            info = self.stream_info.get(url) or {}
+            if not info.get('width') or not info.get('height'):
+                return screen
+            sizes.append(fit_size(info['width'], info['height'], *screen))
+        return (max(w for w, _ in sizes), max(h for _, h in sizes)) if sizes else screen
+
+    def config_for(self, key):
+        """Return the configuration entry for a camera key such as 'F3'"""
+        return self.camera_configs[int(key[1:]) - 1]
+
+    def camera_keys(self):
+        """Keys of all configured camera slots, in order"""
+        return [f"F{i+1}" for i in range(len(self.camera_configs))]
+
+    def page_keys(self):
+        """Keys of the cameras on the current page, in grid order"""
+        keys = self.camera_keys()
+        return [keys[index] for index, _, _ in self.layout.cells(len(keys), self.page)]
+
+    def stream_url(self, key):
+        """Preview substream for grid tiles, full stream only while the tile is enlarged or focused"""
+        cfg = self.config_for(key)
+        if key in (self.enlarged_key, self.focused_key()) and cfg['rtsp']:
+            return cfg['rtsp']
+        return cfg['preview'] or cfg['rtsp']
+
+    def is_thumbnail(self, key):
+        """Whether the tile is shown as a focus-mode thumbnail"""
+        return (self.enlarged_key is None and key in self.visible_keys
+                and self.focused_key() not in (None, key))
+
+    def fps_ceiling(self, key):
+        """Frame-rate cap of a stream before the render budget (0: none).
+
+        The camera's own cap and, for focus-mode thumbnails, thumbnail_fps.
+        """
+        caps = [FPS_CAPS[self.config_for(key)['max_fps']]]
+        if self.is_thumbnail(key):
+            caps.append(self.thumbnail_fps)
+        caps = [cap for cap in caps if cap]
+        return min(caps) if caps else 0
+
+    def decoder_options(self, key):
+        """open_capture keyword arguments for the camera's stream as it is shown now"""
+        cfg = self.config_for(key)
+        return {
+            'threads': DECODER_THREADS[cfg['threads']],
+            'transport': TRANSPORTS[cfg['transport']],
+            'low_delay': cfg['low_delay'],
+            'keyframes_only': (cfg['keyframes'] == "Always" or
+                               (cfg['keyframes'] == "Thumbnails" and self.is_thumbnail(key)))
+        }
 
-    # ================= CAPTURE THREAD =================
+    def stream_target(self, key):
+        """What a stream should deliver; these decoder spec fields are also sent as updates"""
+        caps = [cap for cap in (self.fps_ceiling(key), self.budget_caps.get(key)) if cap]
+        return {
+            'visible': key in self.visible_keys,
+            'url': self.stream_url(key),
+            'size': self.tile_sizes[key],
+            'max_fps': min(caps) if caps else 0,
+            'decoder_options': self.decoder_options(key)
+        }
 
-    def capture_loop(self, key):
+    def update_stream_targets(self):
+        """Tell the decoder what each stream should deliver, sending only what changed"""
+        for key in (self.decoder.keys() if self.decoder else ()):
+            target = self.stream_target(key)
+            sent = self.stream_targets.get(key, {})
+            changes = {name: value for name, value in target.items() if sent.get(name) != value}
+            if changes:
+                self.decoder.update(key, **changes)
+                self.stream_targets[key] = dict(sent, **changes)
+
+    def toggle_enlarged(self, key):
+        """Enlarge a tile to fill the whole grid, or restore the grid"""
+        self.enlarged_key = None if self.enlarged_key == key else key
+        self.apply_layout()
+
+    def on_tile_click(self, key, add=False):
+        """Take control of the camera whose tile was clicked, or with Ctrl add it to the group"""
+        if key in self.cameras:
+            if add:
+                self.toggle_group(key)
+            else:
+                self.select_camera(key)
 
-        cap = self.video_caps[key]
+    # ================= LAYOUT =================
 
-        while self.running:
+    RESIZE_SETTLE_MS = 150
 
-            if not cap.isOpened():
-                time.sleep(1)
+    def on_grid_resize(self, event):
+        """Re-layout for the grid area the window actually has, once a resize settles"""
+        area = (event.width, event.height)
+        if area == self.grid_area:
+            return
+        self.grid_area = area
+
+        # A window drag sends a stream of these events
+        if self.resize_job is not None:
+            self.root.after_cancel(self.resize_job)
+        self.resize_job = self.root.after(self.RESIZE_SETTLE_MS, self._apply_resize)
+
+    def _apply_resize(self):
+        self.resize_job = None
+        self.apply_layout()
+
+    def picture_size(self, cell):
+        """Picture size for a tile: the inside of its border"""
+        return cell[0] - 2 * TILE_BORDER, cell[1] - 2 * TILE_BORDER
+
+    def apply_layout_choice(self):
+        """Switch to the grid size picked in the View menu"""
+        # Stay on the page that holds the first camera shown so far
+        first = self.page * self.layout.per_page
+        self.layout = GridLayout.parse(self.layout_var.get())
+        self.page = self.layout.page_of(first)
+        self.apply_layout()
+
+    def show_page(self, page):
+        """Show another page of the grid (ignored past the first or last page)"""
+        pages = self.layout.page_count(len(self.camera_configs))
+        if not 0 <= page < pages:
+            return
+        self.page = page
+        self.enlarged_key = None
+        self.apply_layout()
+
+    def focused_key(self):
+        """The tile shown large in focus mode: the steered camera, else the first on the page"""
+        if not self.focus_mode.get():
+            return None
+        if self.active_name in self.video_labels:
+            return self.active_name
+        page_keys = self.page_keys()
+        return page_keys[0] if page_keys else None
+
+    def tile_frames(self):
+        """(x, y, width, height) of every tile on screen, in drawing order"""
+        width, height = self.grid_area
+        if self.enlarged_key is not None:
+            return {self.enlarged_key: (0, 0, width, height)}
+
+        focus = self.focused_key()
+        if focus is not None:
+            others = [key for key in self.page_keys() if key != focus]
+            main, thumbs = focus_frames(width, height, len(others))
+            return dict([(focus, main)] + list(zip(others, thumbs)))
+
+        keys = self.camera_keys()
+        return {keys[index]: frame
+                for index, frame in self.layout.frames(len(keys), self.page, width, height)}
+
+    def apply_layout(self):
+        """Place the tiles of the current page (or the enlarged tile) and hide the rest.
+
+        Hidden tiles keep their widgets but drop their surface, and their streams
+        are paused, so a page of a large installation costs the same as a small
+        one. PTZ control does not depend on the page.
+
+        Tiles split the grid area the window actually has and pictures are sized
+        to the inside of the tile border, so decoders resize to exactly the
+        pixels that end up on screen.
+
+        In focus mode the active camera takes most of the area, from its full
+        stream, and the rest of the page become thumbnails capped at
+        thumbnail_fps. The focused tile comes first in visible_keys, so the
+        render loop also draws it first.
+        """
+        keys = self.camera_keys()
+        self.page = min(self.page, self.layout.page_count(len(keys)) - 1)
+        frames = self.tile_frames()
+        cell = self.picture_size(self.layout.tile_size(*self.grid_area))
+
+        for key in keys:
+            container = self.video_labels[key].master
+
+            if key not in frames:
+                container.place_forget()
+                self.tile_stats_labels[key].place_forget()
+                self.tile_surfaces.pop(key, None)
+                self.rendered_seqs.pop(key, None)
+                self.tile_sizes[key] = cell
                 continue
 
-            ret, frame = cap.read()
+            x, y, width, height = frames[key]
+            container.place(x=x, y=y, width=width, height=height)
 
-            if not ret:
-                time.sleep(0.2)
-                continue
+            # Capture workers scale to the new size from their next frame on
+            size = self.picture_size((width, height))
+            if self.tile_sizes.get(key) != size or key not in self.tile_surfaces:
+                self.tile_sizes[key] = size
+                self.tile_surfaces[key] = TileSurface(self.video_labels[key], *size)
+                self.rendered_seqs.pop(key, None)
+                # Show the stream state until the first frame at this size
+                self.video_labels[key].config(image="")
+                self.stream_states.pop(key, None)
 
-            self.video_frames[key] = frame
+        # Pause the streams that went off screen, resume the ones that came on
+        self.visible_keys = list(frames)
+        self.update_stream_targets()
 
-            time.sleep(0.01)
+        pages = self.layout.page_count(len(keys))
+        focus = " • focus" if self.focus_mode.get() else ""
+        self.page_label.config(
+            text=f"Page {self.page + 1}/{pages} • {str(self.layout).replace('x', '×')} • {len(keys)} cameras{focus}")
 
     # ================= SPEED CONTROL =================
     
@@ -478,6 +2887,10 @@ class PTZApp:
         """Update movement speed from slider"""
         self.move_speed = int(float(value))
         self.speed_value_label.config(text=f"{self.move_speed}")
+        
+        # Apply the new speed to a move already in progress
+        if self.pressed_keys:
+            self.update_movement()
     
     # ================= UI UPDATE =================
     
@@ -487,55 +2900,364 @@ class PTZApp:
             if key == self.active_name:
                 # Add a subtle border to indicate active camera
                 label.master.config(highlightbackground="#00ff00", highlightthickness=2)
+            elif key in self.group:
+                # Driven along with the active camera
+                label.master.config(highlightbackground=self.colors['warning'], highlightthickness=2)
             else:
                 # Regular white border
                 label.master.config(highlightbackground="#ffffff", highlightthickness=1)
 
+        # The focused tile follows the active camera
+        if self.focus_mode.get():
+            self.apply_layout()
+
     def update_video(self):
+        """Redraw only the tiles whose capture thread delivered a new frame"""
 
-        for key, frame in self.video_frames.items():
+        self.poll_connections()
 
-            if frame is None:
+        decoded = self.decoder.keys() if self.decoder else ()
+
+        # Off-page tiles are paused and not drawn
+        for key in self.visible_keys:
+            if key not in decoded:
                 continue
 
-            label = self.video_labels[key]
+            state = self.decoder.state(key)
+            if state != self.stream_states.get(key):
+                self.stream_states[key] = state
+                self.show_stream_state(key, state)
 
-            # Fixed container size
-            width = 465
-            height = 430
+            seq, frame, captured_ns = self.decoder.latest(key)
+            previous = self.rendered_seqs.get(key)
 
-            h, w = frame.shape[:2]
+            # Nothing new since the last tick - keep the current image
+            if frame is None or seq == previous:
+                self.render_skipped += 1
+                continue
 
-            # Calculate scale to fit within fixed container
-            scale = min(width / w, height / h)
+            # Frames arrive tile-sized and RGBA from capture_loop
+            started = time.perf_counter()
+            self.tile_surfaces[key].blit(frame)
+            blit_ms = (time.perf_counter() - started) * 1000
 
-            new_w = int(w * scale)
-            new_h = int(h * scale)
-            
-            # Ensure dimensions are valid
-            if new_w <= 0 or new_h <= 0:
+            # Overwritten mid-copy by a pool process - redraw it next tick
+            if not self.decoder.intact(key, seq):
                 continue
 
-            resized = cv2.resize(frame, (new_w, new_h))
+            self.rendered_seqs[key] = seq
+            self.render_drawn += 1
+            if "first_frame" not in self.startup.marks:
+                self.startup.mark("first_frame")
+
+            # Decoded frames that were replaced before the renderer got to them
+            if previous is not None and seq > previous + 1:
+                self.render_gaps[key] = self.render_gaps.get(key, 0) + seq - previous - 1
+
+            # Capture-to-display: from the frame leaving the network to its pixels reaching Tk
+            latency = (time.monotonic_ns() - captured_ns) / 1e6
+            totals = self.latency_totals.setdefault(key, [0.0, 0])
+            totals[0] += latency
+            totals[1] += 1
+
+            self.blit_ms.setdefault(key, RollingHistogram()).add(blit_ms)
+            self.display_ms.setdefault(key, RollingHistogram()).add(latency)
+
+        self.update_positions()
+        self.update_render_stats()
+        self.video_job = self.root.after(30, self.update_video)
+
+    def update_render_stats(self):
+        """Show redraws and skipped redraws per second, once per second"""
+        now = time.monotonic()
+        elapsed = now - self.render_window_start
+        if elapsed < 1.0:
+            return
 
-            frame_rgb = cv2.cvtColor(resized, cv2.COLOR_BGR2RGB)
-            img = Image.fromarray(frame_rgb)
-            imgtk = ImageTk.PhotoImage(image=img)
+        drawn = self.render_drawn / elapsed
+        skipped = self.render_skipped / elapsed
+        if self.decoder:
+            self.update_stream_info()
+        budget = self.apply_render_budget()
+        self.render_stats_label.config(text=f"Render: {drawn:.0f} redraws/s • {skipped:.0f} skipped/s{budget}")
+
+        self.render_drawn = 0
+        self.render_skipped = 0
+        self.render_window_start = now
+
+        # Average capture-to-display latency per tile over the last second
+        for key, totals in self.latency_totals.items():
+            if totals[1]:
+                self.set_tile_info(key, f"{key} • {totals[0] / totals[1]:.0f} ms")
+            totals[0], totals[1] = 0.0, 0
+
+        # Queue depth and average VISCA round trip of the camera being steered
+        if self.active_ptz is not None:
+            rtt = self.active_ptz.take_rtt()
+            rtt = f"{rtt:.0f} ms" if rtt is not None else "—"
+            self.ptz_stats_label.config(text=f"PTZ {self.active_name}: queue {self.active_ptz.depth()} • "
+                                             f"rtt {rtt} • {self.active_ptz.coalesced} coalesced • "
+                                             f"{self.movement.suppressed} repeats suppressed")
+
+        if self.show_stats.get() or self.stats_file:
+            snapshot = self.stats_snapshot()
+            if self.show_stats.get():
+                self.update_stats_overlay(snapshot)
+            if self.stats_file:
+                self.write_stats_file(snapshot)
+
+    # At most one save of settled positions per this interval, off the video tick
+    POSITION_SAVE_MS = 5000
+
+    def update_positions(self):
+        """Show the position readouts of the tiles on screen, and remember each
+        camera's position whenever it settles (saved within POSITION_SAVE_MS)"""
+        changed = False
+        for key, dispatcher in self.dispatchers.items():
+            position = dispatcher.position
+            if position is None:
+                continue
+            ip = self.config_for(key)['ip']
+            if dispatcher.settled and self.positions.get(ip) != position:
+                self.positions[ip] = position
+                changed = True
+
+            text = ""
+            if key in self.visible_keys and self.show_positions.get():
+                pan, tilt, zoom = position
+                text = f"P {pan} T {tilt} Z {zoom * 100 // ZOOM_RANGE}%"
+            if self.position_texts.get(key) != text:
+                self.position_texts[key] = text
+                label = self.tile_position_labels[key]
+                if text:
+                    label.config(text=text)
+                    label.place(relx=1.0, x=-4, y=4, anchor="ne")
+                else:
+                    label.place_forget()
+        if changed and self.position_save_job is None:
+            self.position_save_job = self.root.after(self.POSITION_SAVE_MS, self.save_positions)
+
+    def save_positions(self):
+        """Save the camera configuration with the positions remembered since the last save"""
+        self.position_save_job = None
+        self.save_camera_config()
+
+    def flush_positions(self):
+        """Save positions still waiting on POSITION_SAVE_MS (at exit)"""
+        if self.position_save_job is not None:
+            self.save_positions()
+
+    def return_to_last_position(self, *keys):
+        """Send cameras back to where they last settled - known from the cache,
+        so nothing waits on an inquiry"""
+        for key in keys:
+            position = self.positions.get(self.config_for(key)['ip'])
+            if position is None:
+                continue
+            pan, tilt, zoom = position
+            self.dispatchers[key].send("pantilt", PAN_SPEED_MAX, TILT_SPEED_MAX, pan, tilt)
+            self.dispatchers[key].send("zoom_to", zoom / ZOOM_RANGE, channel="zoom")
+
+    def soft_limits(self, key):
+        """The camera's soft limits as (pan, tilt), each (min, max) or None"""
+        limits = []
+        for name in ('pan_limits', 'tilt_limits'):
+            try:
+                limits.append(parse_limits(self.config_for(key)[name]))
+            except ValueError:
+                limits.append(None)
+        return tuple(limits)
+
+    def apply_render_budget(self):
+        """Re-plan the render budget from the streams' measured source rates.
+
+        Also measures the CPU used since the last call. Returns a suffix for
+        the render stats in the status bar.
+        """
+        if not self.decoder:
+            return ""
+        self.render_budget.measure(self.decoder.cpu_seconds())
+        cpu = self.render_budget.cpu_pct
+        cpu = f" • CPU {cpu:.0f}%" if cpu is not None else ""
+        if not self.render_budget.enabled():
+            return cpu
+
+        # Active camera first, then the other tiles on screen
+        decoded = self.decoder.keys()
+        order = sorted((key for key in self.visible_keys if key in decoded),
+                       key=lambda key: key != self.active_name)
+        demands = []
+        for key in order:
+            # Until a stream has delivered frames, its cached frame rate
+            fps = (self.decoder.stats(key).get('source_fps') or
+                   (self.stream_info.get(self.stream_url(key)) or {}).get('fps', 0))
+            ceiling = self.fps_ceiling(key)
+            if fps:
+                demands.append((key, min(fps, ceiling) if ceiling else fps))
+
+        self.budget_caps = self.render_budget.caps(demands)
+        self.update_stream_targets()
+        return f"{cpu} • {len(self.budget_caps)}/{len(demands)} tiles capped by budget"
+
+    def stats_snapshot(self):
+        """Machine-readable stats for every camera and pipeline stage.
+
+        Combines the decode side (reported by the capture workers), the render
+        side and the PTZ command latency. Timings are RollingHistogram
+        snapshots over the last 10 seconds.
+        """
+        decoded = self.decoder.keys() if self.decoder else []
+        cameras = {}
+
+        for key in sorted(set(decoded) | set(self.dispatchers), key=lambda k: int(k[1:])):
+            entry = {}
+
+            if key in decoded:
+                blit = self.blit_ms.get(key)
+                display = self.display_ms.get(key)
+                entry.update(self.decoder.stats(key))
+                # The URL may carry credentials; the stats file is not private
+                if entry.get('source'):
+                    entry['source'] = {name: value for name, value in entry['source'].items()
+                                       if name != 'url'}
+                entry['render_fps'] = round(blit.rate(), 2) if blit else 0.0
+                entry['render_dropped'] = self.render_gaps.get(key, 0)
+                entry['blit_ms'] = blit.snapshot() if blit else {'count': 0}
+                entry['display_latency_ms'] = display.snapshot() if display else {'count': 0}
+
+            if key in self.budget_caps:
+                entry['budget_fps'] = self.budget_caps[key]
+
+            if key in self.dispatchers:
+                entry['ptz'] = self.dispatchers[key].stats()
+
+            cameras[key] = entry
+
+        return {'time': round(time.time(), 3), 'decode_mode': self.decode_mode,
+                'cpu_pct': self.render_budget.cpu_pct, 'startup_ms': dict(self.startup.marks),
+                'cameras': cameras}
+
+    def update_stats_overlay(self, snapshot):
+        """Show FPS, drops and p95 stage timings in the corner of each visible tile"""
+        for key, label in self.tile_stats_labels.items():
+            entry = snapshot['cameras'].get(key)
+            if not entry or not label.master.winfo_ismapped():
+                label.place_forget()
+                continue
 
-            label.imgtk = imgtk
-            label.configure(image=imgtk, text="")
+            p95 = {name: entry.get(name, {}).get('p95', 0) for name in ('read_ms', 'convert_ms', 'blit_ms')}
+            lines = []
+
+            if 'render_fps' in entry:
+                lines.append(f"{entry.get('decode_fps', 0):.0f}/{entry['render_fps']:.0f} fps dec/draw • "
+                             f"drop {entry.get('dropped', 0) + entry['render_dropped']}")
+                lines.append(f"p95 read {p95['read_ms']:.0f} • cvt {p95['convert_ms']:.1f} • "
+                             f"blit {p95['blit_ms']:.1f} ms")
+
+            if 'ptz' in entry:
+                lines.append(f"p95 ptz {entry['ptz']['rtt_ms'].get('p95', 0):.0f} ms • "
+                             f"{entry['ptz']['failed']} failed")
+
+            label.config(text="\n".join(lines))
+            label.place(x=4, rely=1.0, y=-4, anchor='sw')
+
+    def apply_stats_overlay(self):
+        """Hide the stats overlay when it is switched off (it is redrawn every second when on)"""
+        if not self.show_stats.get():
+            for label in self.tile_stats_labels.values():
+                label.place_forget()
+
+    def write_stats_file(self, snapshot):
+        """Write the snapshot as JSON, atomically so a reader never sees a half-written file"""
+        partial = f"{self.stats_file}.tmp"
+        try:
+            with open(partial, 'w') as f:
+                json.dump(snapshot, f, indent=1)
+            os.replace(partial, self.stats_file)
+        except OSError as exc:
+            print(f"Could not write stats to {self.stats_file}: {exc}")
+            self.stats_file = None
+
+    def show_stream_state(self, key, state):
+        """Show a stream's connection state on its tile.
+
+        Before the first frame the state replaces the tile's placeholder text;
+        afterwards it goes in the overlay so the last (frozen) frame stays
+        visible under a stale / reconnecting notice.
+        """
+        surface = self.tile_surfaces[key]
+        if not surface.shown:
+            info = self.stream_info_text(key)
+            surface.label.config(text=f"{key}\n{self.STREAM_STATE_TEXT[state]}"
+                                      + (f"\n{info}" if info else ""))
+        elif state == "live":
+            self.set_tile_info(key, f"{key} • live")
+        else:
+            self.set_tile_info(key, f"{key} • {self.STREAM_STATE_TEXT[state]}")
+
+    def set_tile_info(self, key, text):
+        """Show text in the tile's corner overlay, or hide the overlay if text is empty"""
+        info = self.tile_info_labels[key]
+        if not text:
+            info.place_forget()
+            return
+        info.config(text=text)
+        info.place(x=4, y=4)
+
+    # ================= PRESETS =================
+
+    def preset(self, number, save=False, scene=False):
+        """Recall (or store) VISCA preset number on the active camera and its group, or with
+        scene=True on every connected camera. Each camera's dispatcher sends on
+        its own thread, so a scene starts all cameras moving at once instead of
+        one round trip after another."""
+
+        keys = sorted(self.dispatchers, key=lambda k: int(k[1:])) if scene else self.driven_keys()
+        method = "save_preset" if save else "recall_preset"
+        for key in keys:
+            dispatcher = self.dispatchers[key]
+            if not save:
+                # A drive still waiting to go out would cut the move short
+                dispatcher.cancel('pantilt', 'zoom')
+            dispatcher.send(method, number)
+            # Cameras on other pages have no tile to show it on
+            if key in self.tile_info_labels:
+                self.set_tile_info(key, f"{key} • {'stored as' if save else 'to'} preset {number}")
+
+    def preset_key(self, number, save, scene):
+        """Run a preset key on the Tk thread, unless the app is not focused or
+        the digit is being typed into an entry field"""
 
-        self.root.after(30, self.update_video)
+        try:
+            focus = self.root.focus_get()
+        except KeyError:  # focus is in a widget Tk created itself, e.g. a menu
+            return
+        if focus is None or focus.winfo_class() in ('Entry', 'Spinbox'):
+            return
+        self.preset(number, save=save, scene=scene)
 
     # ================= MOVEMENT =================
 
+    def movement_key(self, name, pressed):
+        """Track a movement key going down or up (on the Tk thread) and update the movement"""
+        if pressed:
+            # OS auto-repeat sends more 'down' events for a key already held - ignore them
+            if name in self.pressed_keys:
+                return
+            self.pressed_keys.add(name)
+        else:
+            self.pressed_keys.discard(name)
+        self.update_movement()
+
     def update_movement(self):
+        """Hand the pan/tilt/zoom vector of the held keys to the movement controller"""
 
         if not self.active_cam:
             return
 
         pan = 0
         tilt = 0
+        zoom = 0
 
         if 'left' in self.pressed_keys:
             pan -= self.move_speed
@@ -545,57 +3267,201 @@ class PTZApp:
             tilt -= self.move_speed
         if 'down' in self.pressed_keys:
             tilt += self.move_speed
+        if 'zoom_in' in self.pressed_keys:
+            zoom += self.ZOOM_SPEED
+        if 'zoom_out' in self.pressed_keys:
+            zoom -= self.ZOOM_SPEED
 
-        self.active_cam.pantilt(pan, tilt)
+        # Pan/tilt ramp towards this; only changes are sent, at most command_rate times per second
+        self.movement.set_target([self.dispatchers[key] for key in self.driven_keys()], pan, tilt, zoom)
 
     # ================= KEYBOARD =================
 
+    ZOOM_SPEED = 4
+    CONTROL_MASK = 0x0004  # Ctrl in a Tk event's state, for Ctrl+click
+
+    # keyboard-lib key name -> normalised name used by movement logic (same names as the Linux build)
+    _KEY_NAMES = {
+        'up': 'up',
+        'down': 'down',
+        'left': 'left',
+        'right': 'right',
+        '+': 'zoom_in',
+        '=': 'zoom_in',
+        'add': 'zoom_in',
+        '-': 'zoom_out',
+        'subtract': 'zoom_out',
+    }
+    # Presets 0-9, from the main row or the keypad
+    _DIGITS = tuple(str(n) for n in range(10))
+
     def on_key_event(self, e):
 
+        # Paging only changes what is shown, so it works before any camera is
+        # controllable. The hook runs on the keyboard thread; the Tk loop does the work.
+        if e.event_type == 'down' and e.name in ('page up', 'page down'):
+            step = 1 if e.name == 'page down' else -1
+            self.root.after(0, lambda: self.show_page(self.page + step))
+            return
+
         if not self.active_cam:
             return
 
+        name = self._KEY_NAMES.get(e.name)
+
         if e.event_type == 'down':
 
-            if e.name in ['up', 'down', 'left', 'right']:
-                self.pressed_keys.add(e.name)
-                self.update_movement()
-
-            # Zoom controls
-            elif e.name in ['+', '=', 'add']:
-                self.active_cam.zoom(4)  # Zoom in
-            elif e.name in ['-', 'subtract']:
-                self.active_cam.zoom(-4)  # Zoom out
-
-            elif e.name in ['f1', 'f2', 'f3', 'f4', 'f5', 'f6', 'f7', 'f8']:
-                # Extract camera number from f-key name
-                cam_num = e.name[1:]  # Get the number part (could be 1 or 2 digits)
-                key = f"F{cam_num}"
-                if key in self.cameras:
-                    self.active_cam = self.cameras[key]
-                    self.active_name = key
-                    self.update_active_camera_display()
-                    self.status_label.config(text=f"Connected • Controlling {key}")
+            if name is not None:
+                # Movement reads the dispatchers and group: Tk state, so on the Tk thread
+                self.root.after(0, self.movement_key, name, True)
+
+            elif e.name in self._DIGITS:
+                # The keyboard hook is global and repeats while held; act once per press
+                if f'preset{e.name}' not in self.pressed_keys:
+                    self.pressed_keys.add(f'preset{e.name}')
+                    self.root.after(0, self.preset_key, int(e.name),
+                                    keyboard.is_pressed('ctrl'), keyboard.is_pressed('alt'))
+
+            elif e.name in [f'f{n}' for n in range(1, 13)]:
+                # F-keys address the tiles of the current page in order
+                index = int(e.name[1:]) - 1  # The number part (could be 1 or 2 digits)
+                page_keys = self.page_keys()
+                if index < len(page_keys) and page_keys[index] in self.cameras:
+                    # Switching relays out tiles in focus mode: Tk work, so on the Tk thread
+                    if keyboard.is_pressed('ctrl'):
+                        self.root.after(0, self.toggle_group, page_keys[index])
+                    else:
+                        self.root.after(0, self.select_camera, page_keys[index])
 
         elif e.event_type == 'up':
 
-            if e.name in ['up', 'down', 'left', 'right']:
-                if e.name in self.pressed_keys:
-                    self.pressed_keys.remove(e.name)
-
-                if self.pressed_keys:
-                    self.update_movement()
-                else:
-                    self.active_cam.pantilt(0, 0)
-
-            # Stop zoom when key is released
-            elif e.name in ['+', '=', 'add', '-', 'subtract']:
-                self.active_cam.zoom(0)
+            if name is not None:
+                self.root.after(0, self.movement_key, name, False)
+            elif e.name in self._DIGITS:
+                self.pressed_keys.discard(f'preset{e.name}')
 
 
 # ================= MAIN =================
 
 if __name__ == "__main__":
+    # Required for the process decode pool in PyInstaller builds
+    multiprocessing.freeze_support()
+
+    parser = argparse.ArgumentParser(description="PTZ Camera Controller")
+    parser.add_argument("--decode-mode",
+                        choices=("thread", "process"),
+                        default="thread",
+                        help="decode streams on threads (default) or in a process pool with shared-memory frame rings")
+    parser.add_argument("--decode-workers",
+                        type=int,
+                        default=max(1, min(4, (os.cpu_count() or 2) // 2)),
+                        help="number of decode processes in process mode")
+    parser.add_argument("--low-latency",
+                        action="store_true",
+                        help="start with low-latency capture (drop stale frames)")
+    parser.add_argument("--command-rate",
+                        type=int,
+                        default=10,
+                        help="maximum pan/tilt/zoom updates per second (default 10)")
+    parser.add_argument("--ramp-ms",
+                        type=float,
+                        default=RAMP_S * 1000,
+                        help=f"time for pan/tilt to speed up to a new speed, 0 to step "
+                             f"(default {RAMP_S * 1000:g})")
+    parser.add_argument("--stop-ramp-ms",
+                        type=float,
+                        default=STOP_RAMP_S * 1000,
+                        help=f"time for pan/tilt to slow down or stop, 0 at once "
+                             f"(default {STOP_RAMP_S * 1000:g})")
+    parser.add_argument("--connect-timeout",
+                        type=float,
+                        default=CONNECT_TIMEOUT_MS / 1000,
+                        help="seconds to wait for a stream to open or deliver a frame (default 5)")
+    parser.add_argument("--stats-overlay",
+                        action="store_true",
+                        help="start with the per-tile pipeline stats overlay shown")
+    parser.add_argument("--stats-file",
+                        metavar="PATH",
+                        help="write a JSON stats snapshot to PATH once a second")
+    parser.add_argument("--layout",
+                        type=GridLayout.parse,
+                        default=GridLayout(4, 2),
+                        metavar="COLSxROWS",
+                        help="tiles per page, e.g. 4x4 (default 4x2); further cameras go on more pages")
+    parser.add_argument("--cameras",
+                        type=int,
+                        default=8,
+                        help="number of camera slots (default 8; more can be added in Configure Cameras)")
+    parser.add_argument("--focus",
+                        action="store_true",
+                        help="start in focus mode: the active camera large, the rest of the page as thumbnails")
+    parser.add_argument("--thumbnail-fps",
+                        type=float,
+                        default=2,
+                        help="frame rate of the thumbnails in focus mode (default 2)")
+    parser.add_argument("--frame-budget",
+                        type=float,
+                        default=0,
+                        metavar="FPS",
+                        help="frames per second decoded and drawn across all tiles; background tiles are "
+                             "slowed first (default: no limit)")
+    parser.add_argument("--probe",
+                        metavar="URL",
+                        help="benchmark the decoder options on a stream, print the cheapest that reaches "
+                             "--target-fps and exit")
+    parser.add_argument("--target-fps",
+                        type=float,
+                        default=PROBE_TARGET_FPS,
+                        help=f"frame rate --probe must reach (default {PROBE_TARGET_FPS})")
+    parser.add_argument("--cpu-budget",
+                        type=float,
+                        default=0,
+                        metavar="PERCENT",
+                        help="CPU use to stay under, in %% of one core; tile frame rates back off while "
+                             "it is exceeded (default: no limit)")
+    parser.add_argument("--config",
+                        metavar="PATH",
+                        default=CONFIG_PATH,
+                        help=f"camera configuration file, loaded at startup and saved on connect "
+                             f"(default {CONFIG_PATH})")
+    parser.add_argument("--no-connect",
+                        action="store_true",
+                        help="do not connect to the saved cameras on startup")
+    parser.add_argument("--position-poll",
+                        type=float,
+                        default=POSITION_POLL_S,
+                        metavar="SECONDS",
+                        help=f"ask each still camera for its position this often, 0 never "
+                             f"(default {POSITION_POLL_S:g}; faster while it moves)")
+    parser.add_argument("--restore-positions",
+                        action="store_true",
+                        help="send each camera back to its last saved position on connect")
+    parser.add_argument("--startup-report",
+                        action="store_true",
+                        help="exit once the startup report is printed (window, interface, libraries "
+                             "and, if connecting, first frame)")
+    args = parser.parse_args()
+
+    if args.probe:
+        print(f"Probing {args.probe} for {args.target_fps:g} fps, {PROBE_SECONDS:g} s per candidate\n")
+        best, _ = probe_decoder_options(
+            args.probe, args.target_fps,
+            report=lambda r: print(f"  {describe_decoder_options(r['options']):34}"
+                                   f"{r['fps']:6.1f} fps  {r['cpu_pct'] or 0:5.1f}% CPU"))
+        if best is None:
+            raise SystemExit("No candidate delivered any frames")
+        print(f"\nCheapest reaching {args.target_fps:g} fps (or fastest): "
+              f"{describe_decoder_options(best['options'])}")
+        raise SystemExit(0)
+
     root = tk.Tk()
-    app = PTZApp(root)
+    app = PTZApp(root, args.decode_mode, args.decode_workers, args.low_latency, args.command_rate,
+                 args.connect_timeout, args.stats_overlay, args.stats_file, args.layout,
+                 max(1, args.cameras), args.focus, max(0.1, args.thumbnail_fps),
+                 max(0, args.frame_budget), max(0, args.cpu_budget), args.config,
+                 not args.no_connect, exit_after_startup=args.startup_report,
+                 position_poll=max(0, args.position_poll), restore_positions=args.restore_positions,
+                 ramp=max(0, args.ramp_ms) / 1000, stop_ramp=max(0, args.stop_ramp_ms) / 1000)
     root.mainloop()
+    app.flush_positions()
+    app.stop_decoder()